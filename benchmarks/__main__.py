@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""Run que's micro-benchmarks and compare them against a baseline.
+
+Examples::
+
+    $ python -m benchmarks                        # run and print everything
+    $ python -m benchmarks -k "insert*" --save    # save into benchmarks/.results/
+    $ python -m benchmarks --compare latest       # fail on a >10% regression
+    $ python -m benchmarks --compare base.json --threshold 0.25 --output new.json
+"""
+
+import argparse
+import pathlib
+import sys
+
+from . import harness, suite  # noqa: F401 - registers the benchmarks
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description=__doc__.splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="\n".join(__doc__.splitlines()[2:]),
+    )
+    parser.add_argument(
+        "-k",
+        "--filter",
+        action="append",
+        dest="patterns",
+        help="Only run benchmarks matching this glob. May be repeated.",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--save", action="store_true", help="Save the results to the history."
+    )
+    parser.add_argument("--output", type=pathlib.Path, help="Save the results here.")
+    parser.add_argument(
+        "--compare",
+        metavar="BASELINE",
+        help="A saved result to compare against, or 'latest' for the last saved.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="The relative slow-down which counts as a regression (default: 0.1).",
+    )
+    parser.add_argument("--list", action="store_true", help="List the benchmarks.")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(harness.BENCHMARKS))
+        return 0
+
+    baseline = None
+    if args.compare:
+        path = harness.latest() if args.compare == "latest" else args.compare
+        if path is None:
+            parser.error("There are no saved results to compare against.")
+        baseline = harness.load(path)
+
+    results = harness.run(args.patterns or ("*",), repeat=args.repeat)
+    width = max((len(x.name) for x in results), default=0)
+    for result in results:
+        line = f"{result.name:<{width}} {result.best * 1e6:>10.3f} usec"
+        if baseline and result.name in baseline:
+            base = baseline[result.name].best
+            line += f" {(result.best - base) / base:>+8.1%}"
+        print(line)
+
+    if args.save:
+        print(f"Saved to {harness.save(results)}", file=sys.stderr)
+    if args.output:
+        print(f"Saved to {harness.save(results, args.output)}", file=sys.stderr)
+
+    if baseline:
+        regressions = harness.compare(baseline, results, args.threshold)
+        for regression in regressions:
+            print(
+                f"REGRESSION {regression.name}: {regression.baseline * 1e6:.3f} -> "
+                f"{regression.current * 1e6:.3f} usec ({regression.change:+.1%})",
+                file=sys.stderr,
+            )
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""Benchmark the throughput of SQL dumps for an increasing number of worker processes.
+
+Rendering is CPU-bound, so throughput should scale with the number of workers, up to
+the number of cores. Every run is checked against the single-process output::
+
+    $ python -m benchmarks.dump --rows 200000 --workers 1 2 4 8
+"""
+
+import argparse
+import datetime
+import io
+import os
+import time
+from typing import Dict, List, Sequence, Tuple
+
+import que
+from que.dump import Dump
+
+COLUMNS = ("id", "name", "value", "created", "payload")
+
+
+def make_rows(count: int) -> List[Tuple]:
+    """Build ``count`` rows of typical values: ints, strings, floats, dates & bytes."""
+    created = datetime.datetime(2020, 1, 1)
+    return [
+        (x, f"name's {x}", x * 1.5, created, x.to_bytes(4, "big")) for x in range(count)
+    ]
+
+
+def time_dump(rows: Sequence[Tuple], workers: int) -> Tuple[float, bytes]:
+    """The time (in seconds) to dump ``rows`` with ``workers`` processes, and the output."""
+    dump = Dump(que.InsertMany("events", columns=COLUMNS), workers=workers)
+    out = io.BytesIO()
+    start = time.perf_counter()
+    dump.write_rows(rows, out)
+    return time.perf_counter() - start, out.getvalue()
+
+
+def run(count: int, workers: Sequence[int]) -> Dict[int, float]:
+    """Time a dump of ``count`` rows for each number of workers."""
+    rows = make_rows(count)
+    _, expected = time_dump(rows, 0)
+    results = {}
+    for n in workers:
+        seconds, output = time_dump(rows, n)
+        if output != expected:
+            raise AssertionError(f"The output with {n} workers isn't byte-identical.")
+        results[n] = seconds
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=sorted({1, 2, 4, os.cpu_count() or 1}),
+    )
+    args = parser.parse_args()
+    results = run(args.rows, args.workers)
+    base = results[min(results)]
+    print(f"{'workers':>8} {'seconds':>10} {'rows/sec':>12} {'speedup':>8}")
+    for workers, seconds in results.items():
+        print(
+            f"{workers:>8} {seconds:>10.3f} {args.rows / seconds:>12,.0f} {base / seconds:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
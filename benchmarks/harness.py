@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""A small, dependency-free harness for timing and comparing micro-benchmarks."""
+
+import dataclasses
+import datetime
+import fnmatch
+import json
+import pathlib
+import platform
+import statistics
+import subprocess
+import timeit
+from typing import Callable, Dict, Iterable, List, Optional
+
+import que
+
+HOME = pathlib.Path(__file__).resolve().parent
+HISTORY = HOME / ".results"
+
+#: All registered benchmarks, by name.
+BENCHMARKS: Dict[str, Callable[[], Callable[[], object]]] = {}
+
+
+def benchmark(name: str):
+    """Register a benchmark.
+
+    The decorated function is a *setup* function: it is called once and must return
+    the zero-argument callable which will be timed.
+    """
+
+    def register(setup: Callable[[], Callable[[], object]]):
+        if name in BENCHMARKS:
+            raise TypeError(f"A benchmark named {name!r} is already registered.")
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+@dataclasses.dataclass
+class Result:
+    """The timing of a single benchmark, in seconds per call."""
+
+    name: str
+    best: float
+    median: float
+    stdev: float
+    number: int
+    repeat: int
+
+
+@dataclasses.dataclass
+class Regression:
+    """A benchmark which got slower than its baseline by more than the threshold."""
+
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        return (self.current - self.baseline) / self.baseline
+
+
+def time_one(
+    name: str, func: Callable[[], object], repeat: int = 5, min_time: float = 0.05
+) -> Result:
+    """Time a callable, automatically choosing the number of loops per repeat."""
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    if elapsed < min_time:
+        number = max(int(number * min_time / max(elapsed, 1e-9)), 1)
+    times = [x / number for x in timer.repeat(repeat=repeat, number=number)]
+    return Result(
+        name=name,
+        best=min(times),
+        median=statistics.median(times),
+        stdev=statistics.stdev(times) if len(times) > 1 else 0.0,
+        number=number,
+        repeat=repeat,
+    )
+
+
+def run(patterns: Iterable[str] = ("*",), repeat: int = 5) -> List[Result]:
+    """Run all registered benchmarks whose name matches any of the glob patterns."""
+    patterns = tuple(patterns)
+    results = []
+    for name, setup in BENCHMARKS.items():
+        if any(fnmatch.fnmatchcase(name, x) for x in patterns):
+            results.append(time_one(name, setup(), repeat=repeat))
+    return results
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return (
+            subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                cwd=HOME,
+                capture_output=True,
+                check=True,
+                text=True,
+            ).stdout.strip()
+            or None
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def to_json(results: List[Result]) -> Dict:
+    """Serialize results, with enough context to interpret them later."""
+    return {
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "revision": _git_revision(),
+        "que": que.__version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "results": {x.name: dataclasses.asdict(x) for x in results},
+    }
+
+
+def save(results: List[Result], path: pathlib.Path = None) -> pathlib.Path:
+    """Save results as JSON. By default, into the history directory."""
+    if path is None:
+        HISTORY.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = HISTORY / f"{stamp}.json"
+    path.write_text(json.dumps(to_json(results), indent=2, sort_keys=True))
+    return path
+
+
+def load(path: pathlib.Path) -> Dict[str, Result]:
+    """Load saved results, by name."""
+    data = json.loads(pathlib.Path(path).read_text())
+    return {x: Result(**y) for x, y in data["results"].items()}
+
+
+def latest(history: pathlib.Path = HISTORY) -> Optional[pathlib.Path]:
+    """Get the most recently saved results, if any."""
+    paths = sorted(history.glob("*.json")) if history.exists() else []
+    return paths[-1] if paths else None
+
+
+def compare(
+    baseline: Dict[str, Result], current: Iterable[Result], threshold: float = 0.1
+) -> List[Regression]:
+    """Find the benchmarks which are slower than the baseline by more than ``threshold``.
+
+    The best time of each benchmark is compared, since it's the least noisy.
+    Benchmarks which aren't in the baseline are ignored.
+    """
+    regressions = []
+    for result in current:
+        base = baseline.get(result.name)
+        if base and (result.best - base.best) / base.best > threshold:
+            regressions.append(Regression(result.name, base.best, result.best))
+    return regressions
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""Measure the memory allocated per row by ``data_to_fields`` and ``Insert``.
+
+The rows are held in memory (as a bulk-load would) and the peak allocation is
+measured with :mod:`tracemalloc`. The peak allocation of rendering a single, wide
+statement with the single-pass compiler is compared with a frozen copy of the
+original, ``ArgList``-based builders::
+
+    $ python -m benchmarks.memory
+"""
+
+import argparse
+import dataclasses
+import json
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+import que
+
+ROWS = 100_000
+WIDTH = 1_000
+
+
+@dataclasses.dataclass
+class Event:
+    id: int
+    name: str
+    kind: str
+    value: float
+    source: str
+
+
+def dataclass_rows(n: int) -> List[Event]:
+    return [Event(x, f"event-{x}", "click", x / 2, "web") for x in range(n)]
+
+
+def mapping_rows(n: int) -> List[Dict]:
+    # Decode each row on its own, so every row has its own copy of the keys.
+    return [json.loads(json.dumps(dataclasses.asdict(x))) for x in dataclass_rows(n)]
+
+
+def measure(func: Callable[[], List], rows: int) -> float:
+    """The peak number of bytes allocated per row by ``func``."""
+    tracemalloc.start()
+    try:
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak / rows
+
+
+def run(rows: int = ROWS) -> Dict[str, float]:
+    """Measure the bytes per row for each kind of input."""
+    results = {}
+    for kind, factory in (("dataclass", dataclass_rows), ("mapping", mapping_rows)):
+        data = factory(rows)
+        results[f"data_to_fields[{kind}]"] = measure(
+            lambda: [que.data_to_fields(x) for x in data], rows
+        )
+        results[f"data_to_fields+Insert[{kind}]"] = measure(
+            lambda: [que.Insert("events", fields=que.data_to_fields(x)) for x in data],
+            rows,
+        )
+    return results
+
+
+def _legacy_params(fields: que.FieldList, style, start: int = 1) -> str:
+    names = [x.name for x in fields]
+    if style in que.NumParamStyle:
+        params = [style.format(x) for x in range(start, start + len(names))]
+    elif style in que.NameParamStyle:
+        params = [style.format(x) for x in names]
+    else:
+        params = [f"{style}"] * len(names)
+    return "(" + ",\n  ".join(params) + ")" if params else ""
+
+
+def build_render(statement: que.query.BaseSQLStatement, style) -> Tuple[str, Any]:
+    """Render a statement as the original ``build_*`` and ``ArgList`` helpers did.
+
+    This is a frozen copy of the renderer which predates the single-pass compiler,
+    kept as the reference for its allocations.
+    """
+    if isinstance(statement, que.Insert):
+        columns = que.FieldList(
+            [que.Field(f"col{x.name}", x.name) for x in statement.fields]
+        )
+        values = que.FieldList(
+            [que.Field(f"val{x.name}", x.value) for x in statement.fields]
+        )
+        args = que.ArgList(columns + values)
+        sql = (
+            f"INSERT INTO\n  {statement.table_name} {_legacy_params(columns, style)}\n"
+            f"VALUES\n  {_legacy_params(values, style, len(columns) + 1)}\n"
+            f"{statement.get_returning()}"
+        )
+    elif isinstance(statement, que.Update):
+        updates, args = [], que.ArgList()
+        for field in statement.fields:
+            stmt, args = que.Filter(field, prefix="col").to_sql(args, style)
+            updates.append(stmt)
+        updates = ",\n  ".join(updates)
+        where, args = statement.filters.to_sql(args, style)
+        sql = f"UPDATE\n  {statement.table_name}\nSET\n  {updates}\n{where}\n"
+    else:
+        where, args = statement.filters.to_sql(style=style)
+        sql = f"{statement.build_select()}\n{where}"
+    return sql, args.for_sql(style)
+
+
+def run_render(width: int = WIDTH) -> Dict[str, float]:
+    """Measure the peak bytes per field of rendering a statement ``width`` fields wide."""
+    fields = [que.Field(f"column_{x}", x) for x in range(width)]
+    filters = [que.Filter(x) for x in fields]
+    statements = {
+        "select": que.Select("events", filters=filters),
+        "update": que.Update("events", fields=fields, filters=filters[:1]),
+        "insert": que.Insert("events", fields=fields),
+    }
+    results = {}
+    for style in (que.NumParamStyle.NUM, que.NameParamStyle.NAME):
+        for kind, statement in statements.items():
+            suffix = f"[{kind},{type(style).__name__}.{style.name}]"
+            results[f"build{suffix}"] = measure(
+                lambda: build_render(statement, style), width
+            )
+            results[f"compile{suffix}"] = measure(
+                lambda: statement._render(style), width
+            )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=ROWS)
+    parser.add_argument("--width", type=int, default=WIDTH)
+    args = parser.parse_args()
+    for name, nbytes in run(args.rows).items():
+        print(f"{name:<36} {nbytes:>10.1f} bytes/row")
+    for name, nbytes in run_render(args.width).items():
+        print(f"{name:<36} {nbytes:>10.1f} bytes/field")
+
+
+if __name__ == "__main__":
+    main()
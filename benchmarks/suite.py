@@ -0,0 +1,236 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""The micro-benchmarks for statement rendering and field conversion."""
+
+import dataclasses
+from typing import Callable, List, NamedTuple
+
+import que
+from que import instrument
+from que.dbapi import Runner
+from que.util import DictFactory, Nothing
+
+from .harness import benchmark
+
+STYLES = (*que.BasicParamStyle, *que.NumParamStyle, *que.NameParamStyle)
+WIDTHS = {"narrow": 3, "wide": 100}
+FILTERS = 20
+
+
+def _style_name(style: que.query.ParamStyleType) -> str:
+    return f"{type(style).__name__}.{style.name}"
+
+
+def _fields(width: int) -> List[que.Field]:
+    return [que.Field(f"column_{x}", x) for x in range(width)]
+
+
+def _filters(count: int) -> List[que.Filter]:
+    return [que.Filter(que.Field(f"column_{x}", x)) for x in range(count)]
+
+
+STATEMENTS = {
+    "select": lambda width: que.Select(
+        "foo", fields=[que.Field(x.name) for x in _fields(width)], filters=_filters(1)
+    ),
+    "select_filters": lambda width: que.Select("foo", filters=_filters(FILTERS)),
+    "insert": lambda width: que.Insert("foo", fields=_fields(width)),
+    "update": lambda width: que.Update(
+        "foo", fields=_fields(width), filters=_filters(1)
+    ),
+    "delete": lambda width: que.Delete("foo", filters=_filters(width)),
+}
+
+
+def _register_statement(kind: str, width: str, style) -> None:
+    build = STATEMENTS[kind]
+    suffix = f"[{width},{_style_name(style)}]"
+
+    @benchmark(f"{kind}.to_sql{suffix}")
+    def cached() -> Callable:
+        statement = build(WIDTHS[width])
+        return lambda: statement.to_sql(style)
+
+    @benchmark(f"{kind}.render{suffix}")
+    def uncached() -> Callable:
+        statement = build(WIDTHS[width])
+        return lambda: statement._render(style)
+
+
+for _kind in STATEMENTS:
+    for _width in WIDTHS:
+        for _style in STYLES:
+            _register_statement(_kind, _width, _style)
+
+
+@dataclasses.dataclass
+class Record:
+    id: int
+    name: str
+    kind: str
+    value: float
+    source: str = None
+
+
+class RecordTuple(NamedTuple):
+    id: int
+    name: str
+    kind: str
+    value: float
+    source: str = None
+
+
+_RECORD = Record(1, "name", "kind", 1.5)
+_INPUTS = {
+    "dataclass": _RECORD,
+    "namedtuple": RecordTuple(1, "name", "kind", 1.5),
+    "dict": dataclasses.asdict(_RECORD),
+    "pairs": list(dataclasses.asdict(_RECORD).items()),
+}
+
+for _name, _data in _INPUTS.items():
+    for _exclude, _label in ((Nothing, ""), (None, ",exclude=None")):
+
+        @benchmark(f"data_to_fields[{_name}{_label}]")
+        def _data_to_fields(data=_data, exclude=_exclude) -> Callable:
+            return lambda: que.data_to_fields(data, exclude=exclude)
+
+
+# Decode ROWS result rows, compared with the usual Model(**dict(zip(columns, row))).
+_COLUMNS = ("id", "name", "kind", "value", "source")
+_ROWS = [(x, "name", "kind", 1.5, None) for x in range(100)]
+
+
+@benchmark("decode_many[dict(zip)]")
+def _decode_dict_zip() -> Callable:
+    return lambda: [Record(**dict(zip(_COLUMNS, x))) for x in _ROWS]
+
+
+for _cls in (Record, RecordTuple):
+
+    @benchmark(f"decode_many[{_cls.__name__}]")
+    def _decode_many(cls=_cls) -> Callable:
+        decoder = que.get_decoder(cls, _COLUMNS)
+        return lambda: decoder.decode_many(_ROWS)
+
+
+@benchmark("DictFactory[]")
+def _dict_factory() -> Callable:
+    factory, data = DictFactory(), _INPUTS["dict"]
+    return lambda: factory(data)
+
+
+@benchmark("DictFactory[exclude=None]")
+def _dict_factory_exclude() -> Callable:
+    factory, data = DictFactory(exclude=None), _INPUTS["dict"]
+    return lambda: factory(data)
+
+
+@benchmark("DictFactory[pairs,exclude=int]")
+def _dict_factory_exclude_type() -> Callable:
+    factory, data = DictFactory(exclude=int), _INPUTS["pairs"]
+    return lambda: factory(data)
+
+
+def _instrumented(sinks) -> Callable:
+    statement = STATEMENTS["select"](WIDTHS["narrow"])
+
+    def render():
+        instrument.SINKS = sinks
+        try:
+            return statement.to_sql()
+        finally:
+            instrument.SINKS = ()
+
+    return render
+
+
+# Compare "disabled" with "select.to_sql[narrow,NumParamStyle.NUM]" for the overhead
+# of the disabled hooks; "noop" is the cost of building and dispatching an event.
+@benchmark("instrument[disabled]")
+def _instrument_disabled() -> Callable:
+    return _instrumented(())
+
+
+@benchmark("instrument[noop]")
+def _instrument_noop() -> Callable:
+    return _instrumented((lambda event: None,))
+
+
+@benchmark("instrument[aggregator]")
+def _instrument_aggregator() -> Callable:
+    return _instrumented((instrument.Aggregator(),))
+
+
+def _arg_list() -> que.ArgList:
+    return que.ArgList(_fields(WIDTHS["wide"]))
+
+
+@benchmark("ArgList.for_sql[NumParamStyle.NUM]")
+def _arg_list_for_sql() -> Callable:
+    args = _arg_list()
+    return lambda: args.for_sql(que.NumParamStyle.NUM)
+
+
+@benchmark("ArgList.for_sql[NameParamStyle.NAME]")
+def _arg_list_for_sql_named() -> Callable:
+    args = _arg_list()
+    return lambda: args.for_sql(que.NameParamStyle.NAME)
+
+
+@benchmark("ArgList.view[NameParamStyle.NAME]")
+def _arg_list_view() -> Callable:
+    args = _arg_list()
+    return lambda: args.view(que.NameParamStyle.NAME)
+
+
+ROWS = 100
+
+
+def _sqlite_inserts() -> tuple:
+    import sqlite3
+
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE foo (id INTEGER, name TEXT, value REAL)")
+    inserts = [
+        que.Insert(
+            "foo",
+            fields=[
+                que.Field("id", x),
+                que.Field("name", str(x)),
+                que.Field("value", x),
+            ],
+        )
+        for x in range(ROWS)
+    ]
+    return connection, inserts
+
+
+# Insert ROWS records into an in-memory sqlite3 table, one statement at a time vs. with
+# the Runner's executemany batching. The transaction is rolled back after each call.
+@benchmark("Runner[sqlite3,statements]")
+def _runner_statements() -> Callable:
+    connection, inserts = _sqlite_inserts()
+    style = que.BasicParamStyle.QM
+
+    def run():
+        cursor = connection.cursor()
+        for insert in inserts:
+            cursor.execute(*insert.to_sql(style, inject_columns=True))
+        connection.rollback()
+
+    return run
+
+
+@benchmark("Runner[sqlite3,batched]")
+def _runner_batched() -> Callable:
+    connection, inserts = _sqlite_inserts()
+    runner = Runner(connection)
+
+    def run():
+        for insert in inserts:
+            runner.execute(insert, inject_columns=True)
+        runner.flush()
+        runner.rollback()
+
+    return run
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""Benchmark the rendering of INSERT statements for increasingly wide tables.
+
+Rendering should grow linearly with the number of columns, so the time per column
+should stay (roughly) flat from 10 to 2,000 columns::
+
+    $ python -m benchmarks.wide_insert
+"""
+
+import argparse
+import timeit
+from typing import Dict, Sequence
+
+import que
+
+WIDTHS = (10, 50, 100, 250, 500, 1000, 2000)
+
+
+def wide_insert(width: int) -> que.Insert:
+    """Build an INSERT for a table with ``width`` columns."""
+    fields = que.FieldList([que.Field(f"column_{x}", x) for x in range(width)])
+    return que.Insert("events", fields=fields)
+
+
+def time_insert(
+    width: int,
+    style: que.query.ParamStyleType = que.DEFAULT_PARAM_STYLE,
+    number: int = 10,
+    repeat: int = 5,
+) -> float:
+    """The best time (in seconds) to render an INSERT of ``width`` columns, bypassing the cache."""
+    insert = wide_insert(width)
+    timer = timeit.Timer(lambda: insert._render(style))
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run(
+    widths: Sequence[int] = WIDTHS,
+    style: que.query.ParamStyleType = que.DEFAULT_PARAM_STYLE,
+) -> Dict[int, float]:
+    """Time the rendering of an INSERT for each of the given widths."""
+    return {width: time_insert(width, style) for width in widths}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--widths", type=int, nargs="+", default=WIDTHS)
+    parser.add_argument(
+        "--style",
+        choices=[x.name for x in que.NumParamStyle],
+        default=que.DEFAULT_PARAM_STYLE.name,
+    )
+    args = parser.parse_args()
+    results = run(args.widths, que.NumParamStyle[args.style])
+    base = min(results)
+    print(f"{'columns':>8} {'usec':>12} {'usec/column':>12} {'scale':>8}")
+    for width, seconds in results.items():
+        scale = (seconds / results[base]) / (width / base)
+        print(
+            f"{width:>8} {seconds * 1e6:>12.1f} {seconds * 1e6 / width:>12.3f} {scale:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
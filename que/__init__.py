@@ -7,15 +7,63 @@ from .query import (  # noqa: F401 - we're defining the public package
     NumParamStyle,
     NameParamStyle,
     DEFAULT_PARAM_STYLE,
+    Dialect,
+    DEFAULT_DIALECT,
+    PARAM_LIMITS,
     Field,
     Filter,
     FieldList,
     FilterList,
     ArgList,
     Select,
+    Keyset,
     Insert,
+    InsertMany,
+    Upsert,
+    UpdatePolicy,
+    BulkUpdate,
     Update,
     Delete,
     data_to_fields,
+    Decoder,
+    get_decoder,
 )
+from .cache import STATEMENT_CACHE, StatementCache, CacheInfo  # noqa: F401
 from .__about__ import __version__  # noqa: F401
+
+# Optional features are only imported on first access, so they don't add to the
+# cost of ``import que`` (see ``tests/test_import.py`` for the budget).
+_LAZY = {
+    "InsertColumns": "columnar",
+    "to_columns": "columnar",
+    "StreamWriter": "stream",
+    "Batch": "stream",
+    "Copy": "pgcopy",
+    "CopyFormat": "pgcopy",
+    "PreparedRegistry": "prepared",
+    "PreparedSet": "prepared",
+    "statement_name": "prepared",
+    "ThreadedExecutor": "aio",
+    "NativeExecutor": "aio",
+    "SelectLoader": "aio",
+    "Runner": "dbapi",
+    "Dump": "dump",
+    "Router": "routing",
+    "RoundRobin": "routing",
+    "LeastOutstanding": "routing",
+    "ReadYourWrites": "routing",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY:
+        import importlib
+
+        value = getattr(importlib.import_module(f".{_LAZY[name]}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted({*globals(), *_LAZY})
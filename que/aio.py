@@ -0,0 +1,451 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+import asyncio
+import concurrent.futures
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set, TypeVar
+
+from .dbapi import StatementType, paramstyle, render, render_many
+from .query import (
+    CmpOps,
+    Field,
+    Filter,
+    LogOps,
+    NameParamStyle,
+    NumParamStyle,
+    ParamStyleType,
+    Select,
+    _BaseWriteStatement,
+)
+
+_T = TypeVar("_T")
+
+
+class AsyncExecutor:
+    """Render que statements and run them on a database, with a concurrency limit.
+
+    Every method accepts a que statement, raw SQL, or a tuple of raw SQL and its
+    arguments (see :func:`que.dbapi.render`). Cancelling the calling task cancels
+    the query.
+    """
+
+    style: Optional[ParamStyleType]
+    max_concurrency: int
+
+    async def execute(self, statement: StatementType, **options) -> None:
+        """Run a statement (or each statement of an :class:`que.InsertMany`)."""
+        raise NotImplementedError
+
+    async def fetch(self, statement: StatementType, **options) -> List[Any]:
+        """Run a statement and get all of the rows it returns."""
+        raise NotImplementedError
+
+    async def executemany(
+        self, statement: _BaseWriteStatement, records: Iterable[Any], **options
+    ) -> None:
+        """Run a single-row write statement for each of many records.
+
+        See Also
+        --------
+        :meth:`que.Insert.to_sql_many`
+        """
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """Release the resources held by this executor."""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+class ThreadedExecutor(AsyncExecutor):
+    """Run que statements on blocking DBAPI 2.0 connections in a thread pool.
+
+    Up to ``max_concurrency`` connections are opened on demand by calling
+    ``connect`` in a worker thread. Each call checks out an idle connection, so no
+    connection is ever used by two threads at once, though one may be used by
+    different threads over its lifetime (for :mod:`sqlite3`, connect with
+    ``check_same_thread=False``). Statements are rendered in the worker thread, too.
+
+    If the calling task is cancelled before the query starts, it never runs. If it
+    has already started, the connection is interrupted (with ``interrupt()`` or
+    ``cancel()``, if the driver has either) and isn't reused until the worker is
+    done with it.
+
+    Parameters
+    ----------
+    connect
+        A callable which opens a new DBAPI 2.0 connection.
+    style : optional
+        The param-style of the driver. By default, it's determined by the first
+        connection (see :func:`que.dbapi.paramstyle`).
+    max_concurrency : defaults 4
+        The maximum number of connections, and threads, to run queries on.
+    commit : defaults True
+        Commit after each call, or roll back if it fails. Each call may run on a
+        different connection, so a transaction can't span calls.
+
+    Examples
+    --------
+    >>> import asyncio, sqlite3
+    >>> import que
+    >>> from que.aio import ThreadedExecutor
+    >>>
+    >>> async def main():
+    ...     connect = lambda: sqlite3.connect(":memory:", check_same_thread=False)
+    ...     async with ThreadedExecutor(connect, max_concurrency=1) as executor:
+    ...         await executor.execute("CREATE TABLE foo (id INTEGER)")
+    ...         insert = que.Insert("foo", fields=[que.Field("id", 0)])
+    ...         records = [{"id": 1}, {"id": 2}]
+    ...         await executor.executemany(insert, records, inject_columns=True)
+    ...         return await executor.fetch(que.Select("foo"))
+    ...
+    >>> asyncio.run(main())
+    [(1,), (2,)]
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        *,
+        style: Optional[ParamStyleType] = None,
+        max_concurrency: int = 4,
+        commit: bool = True,
+    ):
+        if max_concurrency < 1:
+            raise TypeError(
+                "ThreadedExecutor.max_concurrency must be at least 1. "
+                f"Provided {max_concurrency}."
+            )
+        self.connect = connect
+        self.style = style
+        self.max_concurrency = max_concurrency
+        self.commit = commit
+        self._pool = concurrent.futures.ThreadPoolExecutor(
+            max_concurrency, thread_name_prefix="que"
+        )
+        self._idle: List[Any] = []
+        self._connections: List[Any] = []
+        # Created on first use, so it's bound to the running event loop.
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _open(self) -> Any:
+        connection = self.connect()
+        if self.style is None:
+            self.style = paramstyle(connection)
+        self._connections.append(connection)
+        return connection
+
+    def _release(self, holder: List[Any]):
+        if holder[0] is not None:
+            self._idle.append(holder[0])
+        self._semaphore.release()
+
+    async def _run(self, work: Callable[[Any], _T]) -> _T:
+        """Run ``work`` with a connection in the thread pool."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        await self._semaphore.acquire()
+        loop = asyncio.get_running_loop()
+        # The connection is opened in the worker if there isn't an idle one.
+        holder = [self._idle.pop() if self._idle else None]
+
+        def job():
+            if holder[0] is None:
+                holder[0] = self._open()
+            connection = holder[0]
+            try:
+                result = work(connection)
+                if self.commit:
+                    connection.commit()
+                return result
+            except BaseException:
+                if self.commit:
+                    connection.rollback()
+                raise
+
+        def done(_):
+            try:
+                loop.call_soon_threadsafe(self._release, holder)
+            except RuntimeError:  # The event loop is already closed.
+                pass
+
+        future = self._pool.submit(job)
+        future.add_done_callback(done)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # A job which hasn't started is cancelled along with the task.
+            if future.running() and holder[0] is not None:
+                interrupt = getattr(holder[0], "interrupt", None) or getattr(
+                    holder[0], "cancel", None
+                )
+                if interrupt is not None:
+                    interrupt()
+            raise
+
+    async def execute(self, statement: StatementType, **options) -> None:
+        def work(connection):
+            cursor = connection.cursor()
+            try:
+                for sql, args in render(statement, self.style, **options):
+                    cursor.execute(sql, args)
+            finally:
+                cursor.close()
+
+        await self._run(work)
+
+    async def fetch(self, statement: StatementType, **options) -> List[Any]:
+        def work(connection):
+            cursor, rows = connection.cursor(), []
+            try:
+                for sql, args in render(statement, self.style, **options):
+                    cursor.execute(sql, args)
+                    rows.extend(cursor.fetchall())
+            finally:
+                cursor.close()
+            return rows
+
+        return await self._run(work)
+
+    async def executemany(
+        self, statement: _BaseWriteStatement, records: Iterable[Any], **options
+    ) -> None:
+        def work(connection):
+            cursor = connection.cursor()
+            try:
+                cursor.executemany(
+                    *render_many(statement, records, self.style, **options)
+                )
+            finally:
+                cursor.close()
+
+        await self._run(work)
+
+    async def close(self) -> None:
+        """Wait for any running queries, then close every connection."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._pool.shutdown)
+        for connection in self._connections:
+            connection.close()
+        self._idle.clear()
+        self._connections.clear()
+
+
+class NativeExecutor(AsyncExecutor):
+    """Run que statements on a native asyncio driver's connection (or pool).
+
+    The connection must have ``asyncpg``'s interface: ``execute(sql, *args)``,
+    ``fetch(sql, *args)`` and ``executemany(sql, args)`` coroutines. Cancellation is
+    left to the driver.
+
+    Parameters
+    ----------
+    connection
+        The connection, or connection pool, to run queries on.
+    style : defaults :class:`NumParamStyle.DOL`
+        The param-style of the driver. It must be positional.
+    max_concurrency : defaults 1
+        The maximum number of queries to run at once. A single connection can only
+        run one query at a time, but a pool may run as many as it has connections.
+    """
+
+    def __init__(
+        self,
+        connection: Any,
+        *,
+        style: ParamStyleType = NumParamStyle.DOL,
+        max_concurrency: int = 1,
+    ):
+        if style in NameParamStyle or max_concurrency < 1:
+            raise TypeError(
+                "NativeExecutor requires a positional style and a max_concurrency of "
+                f"at least 1. Provided {style!r} and {max_concurrency}."
+            )
+        self.connection = connection
+        self.style = style
+        self.max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _limit(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def execute(self, statement: StatementType, **options) -> None:
+        async with self._limit():
+            for sql, args in render(statement, self.style, **options):
+                await self.connection.execute(sql, *args)
+
+    async def fetch(self, statement: StatementType, **options) -> List[Any]:
+        rows = []
+        async with self._limit():
+            for sql, args in render(statement, self.style, **options):
+                rows.extend(await self.connection.fetch(sql, *args))
+        return rows
+
+    async def executemany(
+        self, statement: _BaseWriteStatement, records: Iterable[Any], **options
+    ) -> None:
+        sql, args = render_many(statement, records, self.style, **options)
+        async with self._limit():
+            await self.connection.executemany(sql, list(args))
+
+
+class _Pending:
+    """The callers waiting on a single, coalesced Select."""
+
+    __slots__ = ("select", "options", "waiters", "handle")
+
+    def __init__(self, select: Select, options: Dict[str, Any]):
+        self.select = select
+        self.options = options
+        self.waiters: Dict[Hashable, asyncio.Future] = {}
+        self.handle: Optional[asyncio.Handle] = None
+
+
+class SelectLoader:
+    """Coalesce concurrent point lookups into a single Select.
+
+    A point lookup is a :class:`que.Select` with a single equality filter, e.g.
+    ``Select("foo", filters=[Filter(Field("id", 1))])``. Lookups of the same shape
+    (table, fields and filter column) made within one event-loop tick, or within
+    ``window`` seconds of the first, are merged into one Select on all of their keys,
+    which is run once. Each caller gets only the rows for its own key, in a new list.
+    Duplicate keys are only queried once. Any other statement is run as-is.
+
+    The key column is selected first by the merged Select, so the rows can be matched
+    to each caller, and is sliced off of each row before it is returned.
+
+    Parameters
+    ----------
+    executor
+        The executor to run the merged Selects on.
+    window : defaults 0
+        How long to collect lookups for, in seconds. By default, lookups are
+        collected until the next iteration of the event loop.
+    max_batch : defaults 1024
+        The maximum number of keys per Select. A full batch is run immediately.
+    opcode : defaults :class:`LogOps.IN`
+        How the keys are bound: :attr:`LogOps.IN` works with any database, while
+        :attr:`LogOps.ANY` binds a single array (e.g., for Postgres).
+
+    Examples
+    --------
+    >>> import asyncio, sqlite3
+    >>> import que
+    >>> from que.aio import SelectLoader, ThreadedExecutor
+    >>>
+    >>> async def main():
+    ...     connect = lambda: sqlite3.connect(":memory:", check_same_thread=False)
+    ...     async with ThreadedExecutor(connect, max_concurrency=1) as executor:
+    ...         await executor.execute("CREATE TABLE foo (id INTEGER, name TEXT)")
+    ...         await executor.execute("INSERT INTO foo VALUES (1, 'a'), (2, 'b')")
+    ...         loader = SelectLoader(executor)
+    ...         lookups = (
+    ...             que.Select("foo", filters=[que.Filter(que.Field("id", x))])
+    ...             for x in (1, 2, 1, 3)
+    ...         )
+    ...         return await asyncio.gather(*(loader.fetch(x) for x in lookups))
+    ...
+    >>> asyncio.run(main())
+    [[(1, 'a')], [(2, 'b')], [(1, 'a')], []]
+    """
+
+    def __init__(
+        self,
+        executor: AsyncExecutor,
+        *,
+        window: float = 0,
+        max_batch: int = 1024,
+        opcode: LogOps = LogOps.IN,
+    ):
+        if opcode not in (LogOps.IN, LogOps.ANY) or max_batch < 1:
+            raise TypeError(
+                "SelectLoader requires an opcode of LogOps.IN or LogOps.ANY and a "
+                f"max_batch of at least 1. Provided {opcode!r} and {max_batch}."
+            )
+        self.executor = executor
+        self.window = window
+        self.max_batch = max_batch
+        self.opcode = opcode
+        self._pending: Dict[Hashable, _Pending] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    @staticmethod
+    def _key(statement: Any, options: Dict[str, Any]) -> Optional[Hashable]:
+        """The shape of a point lookup, or ``None`` if it can't be coalesced."""
+        if type(statement) is not Select or len(statement.filters) != 1:
+            return None
+        fylter = statement.filters[0]
+        if fylter.opcode is not CmpOps.EQ:
+            return None
+        try:
+            hash(fylter.field.value)
+            return (
+                statement.table_name,
+                tuple(statement.fields),
+                fylter.field.name,
+                tuple(sorted(options.items())),
+            )
+        except TypeError:  # An unhashable key or option.
+            return None
+
+    async def fetch(self, statement: StatementType, **options) -> List[Any]:
+        """Get the rows for a point lookup, which may be coalesced with others."""
+        key = self._key(statement, options)
+        if key is None:
+            return await self.executor.fetch(statement, **options)
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = _Pending(statement, options)
+            loop = asyncio.get_running_loop()
+            if self.window:
+                pending.handle = loop.call_later(self.window, self._dispatch, key)
+            else:
+                pending.handle = loop.call_soon(self._dispatch, key)
+        value = statement.filters[0].field.value
+        future = pending.waiters.get(value)
+        if future is None:
+            future = pending.waiters[value] = asyncio.get_running_loop().create_future()
+            if len(pending.waiters) >= self.max_batch:
+                pending.handle.cancel()
+                self._dispatch(key)
+        # Shielded, so a cancelled caller doesn't cancel the others with its key.
+        return list(await asyncio.shield(future))
+
+    def _dispatch(self, key: Hashable):
+        pending = self._pending.pop(key)
+        task = asyncio.ensure_future(self._run(pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, pending: _Pending):
+        select, waiters = pending.select, pending.waiters
+        name = select.filters[0].field.name
+        fields = [Field(name), *(select.fields or [Field("*")])]
+        merged = Select(
+            select.table,
+            schema=select.schema,
+            fields=fields,
+            filters=[Filter(Field(name, list(waiters)), self.opcode)],
+        )
+        try:
+            rows = await self.executor.fetch(merged, **pending.options)
+        except asyncio.CancelledError:
+            for future in waiters.values():
+                future.cancel()
+            raise
+        except Exception as err:
+            for future in waiters.values():
+                if not future.done():
+                    future.set_exception(err)
+            return
+        found: Dict[Hashable, List[Any]] = {}
+        for row in rows:
+            found.setdefault(row[0], []).append(row[1:])
+        for value, future in waiters.items():
+            if not future.done():
+                future.set_result(found.get(value, ()))
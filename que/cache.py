@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, NamedTuple, Optional, Tuple
+
+
+class CacheInfo(NamedTuple):
+    """A snapshot of the counters for a :class:`StatementCache`."""
+
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class CompiledSQL(NamedTuple):
+    """The re-usable output of rendering a statement.
+
+    ``sql`` is the rendered SQL text and ``names`` the ordered parameter names which
+    will be bound to the values for that text.
+    """
+
+    sql: str
+    names: Tuple[str, ...]
+
+
+class StatementCache:
+    """A bounded, thread-safe LRU cache of compiled SQL keyed by statement shape.
+
+    The "shape" of a statement is everything which influences the generated SQL text
+    (the table, the column names, the filter operations, the param-style, ...) - but
+    not the values which will be bound to it. Statements of the same shape share the
+    same SQL text, so only their arguments must be collected on a cache hit.
+
+    Examples
+    --------
+    >>> cache = StatementCache(maxsize=1)
+    >>> cache.put("a", CompiledSQL("SELECT 1", ()))
+    >>> cache.get("a")
+    CompiledSQL(sql='SELECT 1', names=())
+    >>> cache.put("b", CompiledSQL("SELECT 2", ()))
+    >>> cache.get("a") is None
+    True
+    >>> cache.info()
+    CacheInfo(hits=1, misses=1, evictions=1, maxsize=1, currsize=1)
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        """The Constructor.
+
+        Parameters
+        ----------
+        maxsize : defaults 1024
+            The maximum number of statement shapes to hold. ``0`` disables caching.
+        """
+        if maxsize < 0:
+            raise TypeError(f"{type(self).__name__}.maxsize must be >= 0.")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"{type(self).__name__}(maxsize={self.maxsize})"
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key: Hashable):
+        return key in self._data
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get the entry for a statement shape, if any, and mark it as recently used."""
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        """Store the entry for a statement shape, evicting the least-recently used."""
+        if self.maxsize == 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._evict()
+
+    def resize(self, maxsize: int):
+        """Change the maximum size of the cache, evicting entries if necessary."""
+        if maxsize < 0:
+            raise TypeError(f"{type(self).__name__}.maxsize must be >= 0.")
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def clear(self):
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self) -> CacheInfo:
+        """Report the hit, miss, and eviction counters for this cache."""
+        return CacheInfo(
+            self.hits, self.misses, self.evictions, self.maxsize, len(self._data)
+        )
+
+    def _evict(self):
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+
+STATEMENT_CACHE = StatementCache()
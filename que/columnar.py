@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+import dataclasses
+from typing import Any, Dict, Iterator, List, Mapping, Sequence, Tuple, Union
+
+from .query import (
+    DEFAULT_PARAM_STYLE,
+    InsertMany,
+    NameParamStyle,
+    ParamStyleType,
+)
+
+ColumnarDataType = Union[Mapping[str, Sequence], Any]
+
+
+def to_columns(data: ColumnarDataType) -> Tuple[Tuple[str, ...], List[Sequence]]:
+    """Normalize column-oriented data into column names and a sequence per column.
+
+    Columns which support it (e.g. :class:`array.array` or a NumPy array) are converted
+    to Python objects in a single, vectorized call to ``tolist()``. Any other sequence
+    is used as-is, without copying. NumPy is never imported; structured arrays are
+    detected by their ``dtype``.
+
+    Examples
+    --------
+    >>> import array
+    >>> to_columns({"id": array.array("q", [1, 2]), "name": ["a", "b"]})
+    (('id', 'name'), [[1, 2], ['a', 'b']])
+
+    Raises
+    ------
+    TypeError
+        If the data isn't column-oriented or the columns aren't all the same length.
+    """
+    names = getattr(getattr(data, "dtype", None), "names", None)
+    if names:
+        # A NumPy structured (or record) array.
+        columns = [data[x] for x in names]
+    elif isinstance(data, Mapping):
+        names, columns = tuple(data.keys()), list(data.values())
+    else:
+        raise TypeError(
+            "Columnar data must be a mapping of column name to sequence or a "
+            f"structured array. Provided {type(data)}."
+        )
+    columns = [x.tolist() if hasattr(x, "tolist") else x for x in columns]
+    if len({len(x) for x in columns}) > 1:
+        raise TypeError("Columnar data must have columns of the same length.")
+    return tuple(names), columns
+
+
+@dataclasses.dataclass
+class InsertColumns(InsertMany):
+    """A multi-row, single-table SQL INSERT Statement from column-oriented data.
+
+    This works just like :class:`que.InsertMany`, but the values are held as one
+    sequence per column, rather than one tuple per row. The arguments for each chunk
+    are interleaved from the columns directly, so no per-row objects are created.
+
+    Examples
+    --------
+    >>> insert = InsertColumns.from_columns("foo", {"bar": [1, 2], "baz": [3, 4]})
+    >>> [(sql, args)] = insert.to_sql(inject_columns=True)
+    >>> print(sql)
+    INSERT INTO
+      foo (bar, baz)
+    VALUES
+      (:1, :2),
+      (:3, :4)
+    <BLANKLINE>
+    >>> args
+    [1, 3, 2, 4]
+    """
+
+    data: List[Sequence] = dataclasses.field(default_factory=list)
+
+    def __post_init__(self):
+        super().__post_init__()
+        try:
+            assert len(self.data) == len(
+                self.columns
+            ), f"{type(self).__name__}.data must have one sequence per column."
+            assert (
+                len({len(x) for x in self.data}) <= 1
+            ), f"{type(self).__name__}.data must have columns of the same length."
+            assert (
+                not self.rows
+            ), f"{type(self).__name__} doesn't accept rows, use InsertMany."
+        except AssertionError as err:
+            raise TypeError(err)
+
+    @classmethod
+    def from_columns(
+        cls, table: str, data: ColumnarDataType, **kwargs
+    ) -> "InsertColumns":
+        """Build an :class:`InsertColumns` from column-oriented data.
+
+        Parameters
+        ----------
+        table
+            The name of the table to insert into.
+        data
+            A mapping of column name to sequence (e.g. a ``list`` or ``array.array``)
+            or a NumPy structured array.
+        **kwargs
+            Any other attributes of :class:`InsertColumns`, e.g. ``schema``, ``dialect``.
+
+        See Also
+        --------
+        :func:`to_columns`
+        """
+        columns, data = to_columns(data)
+        return cls(table, columns=columns, data=data, **kwargs)
+
+    def _nrows(self) -> int:
+        return len(self.data[0]) if self.data else 0
+
+    def _chunk_values(self, start: int, stop: int) -> List[Any]:
+        width = len(self.columns)
+        values = [None] * ((stop - start) * width)
+        # Interleave each column with a single slice-assignment.
+        for offset, column in enumerate(self.data):
+            values[offset::width] = column[start:stop]
+        return values
+
+    def to_sql_many(
+        self, style: ParamStyleType = DEFAULT_PARAM_STYLE, inject_columns: bool = False
+    ) -> Tuple[str, Iterator[Union[Tuple, Dict]]]:
+        """Render a single-row INSERT and lazily generate the arguments for every row.
+
+        The output is suitable for ``cursor.executemany`` or ``asyncpg``'s
+        ``executemany``: a tuple per row for positional param-styles or a dict per
+        row for named param-styles.
+        """
+        compiled = self._compile_chunk(style, 1, inject_columns)
+        rows = zip(*self.data)
+        if not inject_columns:
+            head = self.columns
+            rows = (head + x for x in rows)
+        if style in NameParamStyle:
+            names = compiled.names
+            return compiled.sql, (dict(zip(names, x)) for x in rows)
+        return compiled.sql, rows
@@ -0,0 +1,254 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .query import (
+    BaseSQLStatement,
+    BasicParamStyle,
+    BulkUpdate,
+    InsertMany,
+    NameParamStyle,
+    NumParamStyle,
+    ParamStyleType,
+    _BaseWriteStatement,
+)
+
+#: The DBAPI 2.0 ``paramstyle`` names and their matching param-style.
+PARAM_STYLES: Dict[str, ParamStyleType] = {
+    "qmark": BasicParamStyle.QM,
+    "format": BasicParamStyle.FM,
+    "numeric": NumParamStyle.NUM,
+    "named": NameParamStyle.NAME,
+    "pyformat": NameParamStyle.PYFM,
+}
+
+#: A statement to run: a que statement, raw SQL, or raw SQL and its arguments.
+StatementType = Union[BaseSQLStatement, str, Tuple[str, Union[List, Tuple, Dict]]]
+
+
+def paramstyle(obj: Any) -> ParamStyleType:
+    """Get the param-style for a DBAPI 2.0 module, or a connection from one.
+
+    The ``paramstyle`` is looked up on the object, then on the module the object's
+    type was defined in and each of its parent packages.
+
+    Examples
+    --------
+    >>> import sqlite3
+    >>> paramstyle(sqlite3)
+    <BasicParamStyle.QM: '?'>
+    >>> paramstyle(sqlite3.connect(":memory:"))
+    <BasicParamStyle.QM: '?'>
+
+    Raises
+    ------
+    TypeError
+        If no DBAPI 2.0 ``paramstyle`` can be found.
+    """
+    name = getattr(obj, "paramstyle", None)
+    module = type(obj).__module__
+    while name is None and module:
+        name = getattr(sys.modules.get(module), "paramstyle", None)
+        module = module.rpartition(".")[0]
+    try:
+        return PARAM_STYLES[name]
+    except KeyError:
+        raise TypeError(f"Couldn't determine the DBAPI 2.0 paramstyle of {obj!r}.")
+
+
+def render(
+    statement: StatementType, style: ParamStyleType, **options
+) -> List[Tuple[str, Union[List, Tuple, Dict]]]:
+    """Render a statement as a list of SQL strings and their arguments.
+
+    A :class:`que.InsertMany` or :class:`que.BulkUpdate` may render more than one
+    statement, everything else renders exactly one. Raw SQL is passed through as-is, so its arguments must
+    already match the param-style of the driver.
+
+    Examples
+    --------
+    >>> import que
+    >>> delete = que.Delete("foo", filters=[que.Filter(que.Field("id", 1))])
+    >>> render(delete, que.BasicParamStyle.QM)
+    [('DELETE FROM\\n  foo\\nWHERE\\n  id = ?\\n', [1])]
+    >>> render("SELECT 1", que.BasicParamStyle.QM)
+    [('SELECT 1', ())]
+    """
+    if isinstance(statement, (InsertMany, BulkUpdate)):
+        return statement.to_sql(style, **options)
+    if isinstance(statement, BaseSQLStatement):
+        return [statement.to_sql(style, **options)]
+    if isinstance(statement, str):
+        return [(statement, ())]
+    sql, args = statement
+    return [(sql, args)]
+
+
+def render_many(
+    statement: _BaseWriteStatement,
+    records: Iterable[Any],
+    style: ParamStyleType,
+    **options,
+) -> Tuple[str, Iterator[Union[Tuple, Dict]]]:
+    """Render a write statement once, with the arguments for many records.
+
+    See Also
+    --------
+    :meth:`que.Insert.to_sql_many`
+
+    Raises
+    ------
+    TypeError
+        If the statement can't be executed for many records.
+    """
+    if not isinstance(statement, _BaseWriteStatement):
+        raise TypeError(
+            "Only Insert and Update statements may be executed for many records. "
+            f"Provided {type(statement).__name__}."
+        )
+    return statement.to_sql_many(records, style, **options)
+
+
+class Runner:
+    """Execute que statements on a DBAPI 2.0 connection, with a single cursor.
+
+    Consecutive :class:`que.Insert` and :class:`que.Update` statements of the same
+    shape (i.e., which render the same SQL) are sent as one ``executemany`` call.
+    Those without ``RETURNING`` are held until ``batch_size`` of them are
+    pending, a statement of another shape is executed, or the transaction ends. So,
+    any error they raise is raised by the call which sends them.
+
+    Parameters
+    ----------
+    connection
+        The DBAPI 2.0 connection.
+    style : optional
+        The param-style of the driver. By default, it's determined by the connection
+        (see :func:`paramstyle`).
+    batch_size : defaults 1000
+        The maximum number of statements to hold before they're sent.
+
+    Examples
+    --------
+    >>> import sqlite3
+    >>> import que
+    >>> runner = Runner(sqlite3.connect(":memory:"))
+    >>> runner.execute("CREATE TABLE foo (id INTEGER)")
+    >>> with runner:
+    ...     for id in range(3):
+    ...         insert = que.Insert("foo", fields=[que.Field("id", id)])
+    ...         runner.execute(insert, inject_columns=True)
+    ...
+    >>> runner.fetch(que.Select("foo"))
+    [(0,), (1,), (2,)]
+    """
+
+    def __init__(
+        self,
+        connection: Any,
+        *,
+        style: Optional[ParamStyleType] = None,
+        batch_size: int = 1000,
+    ):
+        if batch_size < 1:
+            raise TypeError(
+                f"Runner.batch_size must be at least 1. Provided {batch_size}."
+            )
+        self.connection = connection
+        self.style = paramstyle(connection) if style is None else style
+        self.batch_size = batch_size
+        self._cursor = None
+        self._sql: Optional[str] = None
+        self._batch: List[Union[List, Dict]] = []
+
+    @property
+    def cursor(self) -> Any:
+        """The cursor used for every statement, opened on first use."""
+        if self._cursor is None:
+            self._cursor = self.connection.cursor()
+        return self._cursor
+
+    @property
+    def pending(self) -> int:
+        """The number of statements which haven't been sent yet."""
+        return len(self._batch)
+
+    def execute(self, statement: StatementType, **options) -> None:
+        """Execute a statement, or hold it to be sent with others of the same shape."""
+        if isinstance(statement, _BaseWriteStatement) and not statement.returns:
+            sql, args = statement.to_sql(self.style, **options)
+            if sql != self._sql:
+                self.flush()
+                self._sql = sql
+            self._batch.append(args)
+            if len(self._batch) >= self.batch_size:
+                self.flush()
+            return
+        self.flush()
+        cursor = self.cursor
+        for sql, args in render(statement, self.style, **options):
+            cursor.execute(sql, args)
+
+    def fetch(self, statement: StatementType, **options) -> List[Any]:
+        """Execute a statement and get all of the rows it returns."""
+        self.flush()
+        cursor, rows = self.cursor, []
+        for sql, args in render(statement, self.style, **options):
+            cursor.execute(sql, args)
+            rows.extend(cursor.fetchall())
+        return rows
+
+    def executemany(
+        self, statement: _BaseWriteStatement, records: Iterable[Any], **options
+    ) -> None:
+        """Execute a single-row write statement for each of many records.
+
+        See Also
+        --------
+        :meth:`que.Insert.to_sql_many`
+        """
+        self.flush()
+        self.cursor.executemany(*render_many(statement, records, self.style, **options))
+
+    def flush(self) -> None:
+        """Send any pending statements."""
+        sql, batch = self._sql, self._batch
+        self._sql, self._batch = None, []
+        if len(batch) == 1:
+            self.cursor.execute(sql, batch[0])
+        elif batch:
+            self.cursor.executemany(sql, batch)
+
+    def commit(self) -> None:
+        """Send any pending statements, then commit the transaction."""
+        self.flush()
+        self.connection.commit()
+
+    def rollback(self) -> None:
+        """Drop any pending statements, then roll back the transaction."""
+        self._sql, self._batch = None, []
+        self.connection.rollback()
+
+    def close(self) -> None:
+        """Send any pending statements and close the cursor (not the connection)."""
+        try:
+            self.flush()
+        finally:
+            if self._cursor is not None:
+                self._cursor.close()
+                self._cursor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        """Commit the transaction, or roll it back if there was an error."""
+        if exc_type is not None:
+            self.rollback()
+            return
+        try:
+            self.commit()
+        except BaseException:
+            self.rollback()
+            raise
@@ -0,0 +1,347 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+import collections
+import concurrent.futures
+import dataclasses
+import datetime
+import decimal
+import json
+import math
+import os
+import uuid
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from .query import (
+    DEFAULT_DIALECT,
+    DEFAULT_PARAM_STYLE,
+    Dialect,
+    InsertMany,
+    _record_getter,
+)
+
+Sink = Union[bytearray, BinaryIO]
+
+# MySQL processes backslash escapes in strings unless NO_BACKSLASH_ESCAPES is set.
+_MYSQL_ESCAPES = str.maketrans(
+    {
+        "\\": "\\\\",
+        "'": "''",
+        "\x00": "\\0",
+        "\n": "\\n",
+        "\r": "\\r",
+        "\x1a": "\\Z",
+    }
+)
+
+
+def _quote(value: str) -> str:
+    if "\x00" in value:
+        raise TypeError("Strings with NUL characters can't be written as literals.")
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _quote_mysql(value: str) -> str:
+    return "'" + value.translate(_MYSQL_ESCAPES) + "'"
+
+
+def _hex_blob(value: Any) -> str:
+    return "X'" + bytes(value).hex() + "'"
+
+
+def _pg_bytea(value: Any) -> str:
+    return "'\\x" + bytes(value).hex() + "'::bytea"
+
+
+def _number(value: Any, quote: Callable[[str], str], dialect: Dialect) -> str:
+    if isinstance(value, decimal.Decimal):
+        finite, text = value.is_finite(), str(value)
+    else:
+        value = float(value)
+        finite, text = math.isfinite(value), repr(value)
+    if finite:
+        return text
+    if dialect is not Dialect.POSTGRES or (
+        isinstance(value, decimal.Decimal) and value.is_snan()
+    ):
+        raise TypeError(f"{value!r} can't be written as a literal for {dialect!r}.")
+    # PostgreSQL spells these as strings, which are cast to the column's type.
+    text = "NaN" if value != value else ("-Infinity" if value < 0 else "Infinity")
+    return quote(text)
+
+
+def _encoders(dialect: Dialect) -> Dict[type, Callable[[Any], str]]:
+    """The literal encoder for each (exact) type of value, for a dialect."""
+    quote = _quote_mysql if dialect is Dialect.MYSQL else _quote
+    blob = _pg_bytea if dialect is Dialect.POSTGRES else _hex_blob
+    number = lambda x: _number(x, quote, dialect)  # noqa: E731
+    return {
+        type(None): lambda x: "NULL",
+        bool: lambda x: "TRUE" if x else "FALSE",
+        # Not str(), which an int subclass (e.g. an IntEnum) may override.
+        int: int.__repr__,
+        float: lambda x: repr(x) if math.isfinite(x) else number(x),
+        decimal.Decimal: number,
+        str: quote,
+        bytes: blob,
+        bytearray: blob,
+        memoryview: blob,
+        datetime.datetime: lambda x: quote(x.isoformat(" ")),
+        datetime.date: lambda x: quote(x.isoformat()),
+        datetime.time: lambda x: quote(x.isoformat()),
+        uuid.UUID: lambda x: quote(str(x)),
+        dict: lambda x: quote(json.dumps(x)),
+        list: lambda x: quote(json.dumps(x)),
+    }
+
+
+_ENCODERS: Dict[Dialect, Dict[type, Callable[[Any], str]]] = {
+    x: _encoders(x) for x in Dialect
+}
+
+
+def literal(value: Any, dialect: Dialect = DEFAULT_DIALECT) -> str:
+    """Render a Python value as an escaped SQL literal for a dialect.
+
+    Strings are quoted with their quotes doubled (and, for MySQL, backslashes and
+    control characters escaped). Dates and times are written as ISO 8601 strings,
+    dicts and lists as JSON strings, and bytes as hex blobs (``bytea`` for Postgres).
+
+    Examples
+    --------
+    >>> literal("it's")
+    "'it''s'"
+    >>> literal(b"\\x00\\xff", Dialect.SQLITE)
+    "X'00ff'"
+    >>> literal(None), literal(True), literal(1.5)
+    ('NULL', 'TRUE', '1.5')
+
+    Raises
+    ------
+    TypeError
+        If the value can't be safely written as a literal for the dialect.
+    """
+    encoders = _ENCODERS[dialect]
+    encode = encoders.get(type(value))
+    if encode is None:
+        # Subclasses, e.g. an IntEnum or a str-based enum, use their base's encoder.
+        for kind in type(value).__mro__[1:]:
+            encode = encoders.get(kind)
+            if encode is not None:
+                break
+        else:
+            raise TypeError(
+                f"Can't write a value of {type(value)} as a literal for {dialect!r}."
+            )
+    return encode(value)
+
+
+class _Template(NamedTuple):
+    """Everything a worker process needs to render statements."""
+
+    head: str
+    tail: str
+    dialect: Dialect
+    rows_per_statement: int
+
+
+def _render(template: _Template, rows: Sequence[Sequence[Any]]) -> bytes:
+    """Render rows as one or more complete, ``;``-terminated statements."""
+    head, tail, dialect, size = template
+    encoders = _ENCODERS[dialect]
+    get = encoders.get
+
+    def encode(value: Any) -> str:
+        encoder = get(type(value))
+        return literal(value, dialect) if encoder is None else encoder(value)
+
+    statements = []
+    for start in range(0, len(rows), size):
+        values = ",\n  ".join(
+            [
+                "(" + ", ".join([encode(x) for x in row]) + ")"
+                for row in rows[start : start + size]
+            ]
+        )
+        statements.append(f"{head}{values}{tail};\n")
+    return "".join(statements).encode()
+
+
+@dataclasses.dataclass
+class Dump:
+    """Write multi-row INSERT (or Upsert) statements, with inlined literals, to a file.
+
+    This is for offline use, e.g. a ``.sql`` file for a backfill: the values are
+    written into the SQL as escaped literals (see :func:`literal`), rather than
+    bound as parameters. The ``statement`` is a template: its table, columns,
+    dialect and any ``ON CONFLICT`` clause are used, but not its rows.
+
+    Rows are rendered in jobs of ``statements_per_job`` statements. With more than
+    one worker, the jobs are rendered in parallel on a process pool, and written in
+    order. The output is byte-identical however many workers are used.
+
+    Parameters
+    ----------
+    statement
+        The template :class:`que.InsertMany` or :class:`que.Upsert`.
+    rows_per_statement : defaults 1000
+        The number of rows in each statement.
+    workers : optional
+        The number of processes to render on. Defaults to the number of CPUs. With
+        ``0`` or ``1`` (or if there's only a single job), rows are rendered in this
+        process.
+    statements_per_job : defaults 16
+        The number of statements rendered by a worker at a time.
+    buffer_size : defaults 1MiB
+        Rendered statements are written to a file in chunks of at least this many
+        bytes.
+
+    Examples
+    --------
+    >>> from que import Upsert
+    >>> dump = Dump(Upsert("foo", columns=("id", "name"), conflict=("id",)))
+    >>> buffer = bytearray()
+    >>> dump.write_rows([(1, "a"), (2, "it's")], buffer)
+    118
+    >>> print(buffer.decode())
+    INSERT INTO
+      foo (id, name)
+    VALUES
+      (1, 'a'),
+      (2, 'it''s')
+    ON CONFLICT (id) DO UPDATE SET
+      name = EXCLUDED.name;
+    <BLANKLINE>
+    """
+
+    statement: InsertMany
+    rows_per_statement: int = 1000
+    workers: Optional[int] = None
+    statements_per_job: int = 16
+    buffer_size: int = 1 << 20
+
+    def __post_init__(self):
+        name = type(self).__name__
+        try:
+            assert isinstance(
+                self.statement, InsertMany
+            ), f"{name}.statement must be an InsertMany or Upsert."
+            assert not self.statement.returns, f"{name}.statement can't use RETURNING."
+            assert (
+                self.rows_per_statement > 0 and self.statements_per_job > 0
+            ), f"{name}.rows_per_statement and statements_per_job must be positive."
+        except AssertionError as err:
+            raise TypeError(err)
+        if self.workers is None:
+            self.workers = os.cpu_count() or 1
+
+    def _template(self) -> _Template:
+        statement = self.statement
+        head, _ = statement._render_head(DEFAULT_PARAM_STYLE, inject_columns=True)
+        return _Template(
+            head,
+            statement._render_tail(),
+            Dialect(statement.dialect),
+            self.rows_per_statement,
+        )
+
+    def _jobs(self, rows: Iterable[Sequence[Any]]) -> Iterator[List[Sequence[Any]]]:
+        size = self.rows_per_statement * self.statements_per_job
+        width = len(self.statement.columns)
+        job = []
+        for row in rows:
+            if len(row) != width:
+                raise TypeError(
+                    f"Rows must have one value per column. Expected {width}, got {row}."
+                )
+            job.append(row)
+            if len(job) == size:
+                yield job
+                job = []
+        if job:
+            yield job
+
+    def iter_render(self, rows: Iterable[Sequence[Any]]) -> Iterator[bytes]:
+        """Lazily render rows of values as complete statements, in order.
+
+        Each chunk is the encoded output of a single job. Rows are consumed ahead of
+        the output by up to two jobs per worker.
+        """
+        template, jobs = self._template(), self._jobs(rows)
+        first = next(jobs, None)
+        if first is None:
+            return
+        second = next(jobs, None)
+        if second is None or self.workers <= 1:
+            yield _render(template, first)
+            if second is not None:
+                yield _render(template, second)
+                for job in jobs:
+                    yield _render(template, job)
+            return
+        with concurrent.futures.ProcessPoolExecutor(self.workers) as pool:
+            pending = collections.deque(
+                pool.submit(_render, template, x) for x in (first, second)
+            )
+            for job in jobs:
+                pending.append(pool.submit(_render, template, job))
+                if len(pending) >= self.workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def render(self, rows: Iterable[Sequence[Any]]) -> str:
+        """Render rows of values as complete statements."""
+        return b"".join(self.iter_render(rows)).decode()
+
+    def write_rows(self, rows: Iterable[Sequence[Any]], out: Sink) -> int:
+        """Render rows of values into a ``bytearray`` or binary file-like object.
+
+        Values are in the order of the statement's columns.
+
+        Returns
+        -------
+        The number of bytes written.
+        """
+        if isinstance(out, bytearray):
+            start = len(out)
+            for chunk in self.iter_render(rows):
+                out += chunk
+            return len(out) - start
+        written, buffer = 0, []
+        buffered = 0
+        for chunk in self.iter_render(rows):
+            buffer.append(chunk)
+            buffered += len(chunk)
+            if buffered >= self.buffer_size:
+                out.write(b"".join(buffer))
+                written += buffered
+                buffer, buffered = [], 0
+        if buffer:
+            out.write(b"".join(buffer))
+            written += buffered
+        return written
+
+    def write(self, records: Iterable[Any], out: Sink) -> int:
+        """Render records into a ``bytearray`` or binary file-like object.
+
+        Values are looked up by column name, so records may be a mapping, dataclass,
+        NamedTuple or collection of 2-tuples.
+
+        Returns
+        -------
+        The number of bytes written.
+        """
+        getter = _record_getter(self.statement.columns)
+        return self.write_rows(map(getter, records), out)
@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""Opt-in instrumentation of the time que spends rendering SQL.
+
+Instrumentation is disabled by default. While it's disabled, the only cost to
+rendering is a single check of :data:`SINKS`.
+
+Examples
+--------
+>>> import que
+>>> from que import instrument
+>>> aggregator = instrument.Aggregator()
+>>> with instrument.instrumented(aggregator):
+...     sql, args = que.Select("foo").to_sql()
+...
+>>> aggregator.stats()["Select"].count
+1
+"""
+
+import contextlib
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterator, List, NamedTuple, Tuple
+
+
+class RenderEvent(NamedTuple):
+    """A single call to a rendering function."""
+
+    #: The class name of the statement, or the name of the function.
+    kind: str
+    #: The time spent, in seconds.
+    seconds: float
+    #: The number of arguments (or fields) produced.
+    nargs: int
+    #: The size of the generated SQL, in bytes.
+    nbytes: int
+
+
+Sink = Callable[[RenderEvent], None]
+
+#: The active sinks. Empty when instrumentation is disabled.
+SINKS: Tuple[Sink, ...] = ()
+
+clock = time.perf_counter
+
+
+def enable(*sinks: Sink):
+    """Send render events to the given sinks, in addition to any active sinks."""
+    global SINKS
+    SINKS = (*SINKS, *sinks)
+
+
+def disable(*sinks: Sink):
+    """Stop sending render events to the given sinks, or to all sinks if none are given."""
+    global SINKS
+    SINKS = tuple(x for x in SINKS if sinks and x not in sinks)
+
+
+@contextlib.contextmanager
+def instrumented(*sinks: Sink) -> Iterator[Tuple[Sink, ...]]:
+    """Send render events to the given sinks for the duration of the context."""
+    enable(*sinks)
+    try:
+        yield sinks
+    finally:
+        disable(*sinks)
+
+
+def emit(kind: str, start: float, nargs: int, sql: str = ""):
+    """Send a render event which started at ``start`` to all active sinks."""
+    event = RenderEvent(kind, clock() - start, nargs, len(sql.encode()))
+    for sink in SINKS:
+        sink(event)
+
+
+class Stats(NamedTuple):
+    """The aggregated render events of a single kind."""
+
+    count: int
+    total: float
+    mean: float
+    p50: float
+    p90: float
+    p99: float
+    nargs: int
+    nbytes: int
+
+
+def _percentile(ordered: List[float], percent: float) -> float:
+    if not ordered:
+        return 0.0
+    index = min(int(len(ordered) * percent / 100), len(ordered) - 1)
+    return ordered[index]
+
+
+class _Series:
+    __slots__ = ("count", "total", "nargs", "nbytes", "samples")
+
+    def __init__(self, window: int):
+        self.count = 0
+        self.total = 0.0
+        self.nargs = 0
+        self.nbytes = 0
+        self.samples: Deque[float] = deque(maxlen=window)
+
+
+class Aggregator:
+    """An in-memory sink which aggregates render events by kind.
+
+    Counts and totals are kept for every event. Percentiles are computed from the
+    most recent ``window`` events of each kind.
+    """
+
+    def __init__(self, window: int = 1024):
+        self.window = window
+        self._series: Dict[str, _Series] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"{type(self).__name__}(window={self.window})"
+
+    def __call__(self, event: RenderEvent):
+        with self._lock:
+            series = self._series.get(event.kind)
+            if series is None:
+                series = self._series[event.kind] = _Series(self.window)
+            series.count += 1
+            series.total += event.seconds
+            series.nargs += event.nargs
+            series.nbytes += event.nbytes
+            series.samples.append(event.seconds)
+
+    def stats(self) -> Dict[str, Stats]:
+        """Get a snapshot of the aggregated events, by kind."""
+        with self._lock:
+            snapshot = {}
+            for kind, series in self._series.items():
+                ordered = sorted(series.samples)
+                snapshot[kind] = Stats(
+                    count=series.count,
+                    total=series.total,
+                    mean=series.total / series.count,
+                    p50=_percentile(ordered, 50),
+                    p90=_percentile(ordered, 90),
+                    p99=_percentile(ordered, 99),
+                    nargs=series.nargs,
+                    nbytes=series.nbytes,
+                )
+            return snapshot
+
+    def reset(self):
+        """Clear all aggregated events."""
+        with self._lock:
+            self._series.clear()
+
+
+class LoggingSink:
+    """A sink which logs every render event.
+
+    :mod:`logging` is only imported once a ``LoggingSink`` is created.
+    """
+
+    def __init__(self, logger=None, level: int = None):
+        import logging
+
+        self.logger = logger or logging.getLogger("que")
+        self.level = logging.DEBUG if level is None else level
+
+    def __repr__(self):
+        return f"{type(self).__name__}(logger={self.logger!r})"
+
+    def __call__(self, event: RenderEvent):
+        self.logger.log(
+            self.level,
+            "Rendered %s in %.1fus (%d args, %d bytes)",
+            event.kind,
+            event.seconds * 1e6,
+            event.nargs,
+            event.nbytes,
+        )
+
+
+__all__ = (
+    "RenderEvent",
+    "Sink",
+    "Stats",
+    "Aggregator",
+    "LoggingSink",
+    "enable",
+    "disable",
+    "instrumented",
+)
@@ -0,0 +1,282 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+import dataclasses
+import datetime
+import decimal
+import json
+import struct
+import uuid
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from .query import BaseSQLStatement, Insert, _StrEnum, _record_getter
+
+
+class CopyFormat(_StrEnum):
+    """The payload formats of PostgreSQL's ``COPY ... FROM STDIN``."""
+
+    TEXT = "text"
+    CSV = "csv"
+    BINARY = "binary"
+
+
+Sink = Union[bytearray, BinaryIO]
+
+# The text format escapes backslashes and the characters which delimit rows & columns.
+_TEXT_ESCAPES = str.maketrans(
+    {
+        "\\": "\\\\",
+        "\t": "\\t",
+        "\n": "\\n",
+        "\r": "\\r",
+        "\b": "\\b",
+        "\f": "\\f",
+        "\v": "\\v",
+    }
+)
+_CSV_SPECIAL = frozenset(',"\r\n')
+
+_PG_EPOCH = datetime.datetime(2000, 1, 1)
+_PG_EPOCH_TZ = _PG_EPOCH.replace(tzinfo=datetime.timezone.utc)
+_PG_EPOCH_DATE = _PG_EPOCH.date()
+
+_BINARY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+_BINARY_TRAILER = struct.pack(">h", -1)
+_INT16 = struct.Struct(">h")
+_INT32 = struct.Struct(">i")
+_NULL = _INT32.pack(-1)
+
+
+def _text_value(value: Any) -> str:
+    if value is None:
+        return "\\N"
+    if value is True or value is False:
+        return "t" if value else "f"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        # bytea hex format, with the leading backslash escaped.
+        return "\\\\x" + bytes(value).hex()
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    return str(value).translate(_TEXT_ESCAPES)
+
+
+def _csv_value(value: Any) -> str:
+    if value is None:
+        return ""
+    if value is True or value is False:
+        return "t" if value else "f"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return "\\x" + bytes(value).hex()
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    value = str(value)
+    # An empty string must be quoted to distinguish it from NULL.
+    if not value or value == "\\." or not _CSV_SPECIAL.isdisjoint(value):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def _timestamp(value: datetime.datetime) -> bytes:
+    epoch = _PG_EPOCH_TZ if value.tzinfo else _PG_EPOCH
+    delta = value - epoch
+    micros = (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+    return struct.pack(">q", micros)
+
+
+#: Binary encoders for PostgreSQL types, by type name.
+BINARY_ENCODERS: Dict[str, Callable[[Any], bytes]] = {
+    "bool": lambda x: b"\x01" if x else b"\x00",
+    "int2": struct.Struct(">h").pack,
+    "int4": struct.Struct(">i").pack,
+    "int8": struct.Struct(">q").pack,
+    "float4": struct.Struct(">f").pack,
+    "float8": struct.Struct(">d").pack,
+    "text": lambda x: str(x).encode(),
+    "varchar": lambda x: str(x).encode(),
+    "bytea": bytes,
+    "uuid": lambda x: (x if isinstance(x, uuid.UUID) else uuid.UUID(str(x))).bytes,
+    "date": lambda x: _INT32.pack((x - _PG_EPOCH_DATE).days),
+    "timestamp": _timestamp,
+    "timestamptz": _timestamp,
+    "json": lambda x: (x if isinstance(x, str) else json.dumps(x)).encode(),
+    "jsonb": lambda x: b"\x01" + (x if isinstance(x, str) else json.dumps(x)).encode(),
+}
+
+# The PostgreSQL type for a Python type, if a column's type isn't given.
+_DEFAULT_TYPES = {
+    bool: "bool",
+    int: "int8",
+    float: "float8",
+    str: "text",
+    bytes: "bytea",
+    bytearray: "bytea",
+    memoryview: "bytea",
+    uuid.UUID: "uuid",
+    datetime.datetime: "timestamp",
+    datetime.date: "date",
+    dict: "jsonb",
+    list: "jsonb",
+}
+
+
+def _binary_value(value: Any, encoder: Optional[Callable[[Any], bytes]]) -> bytes:
+    if value is None:
+        return _NULL
+    if encoder is None:
+        kind = type(value)
+        if kind is datetime.datetime and value.tzinfo:
+            encoder = BINARY_ENCODERS["timestamptz"]
+        elif kind in _DEFAULT_TYPES:
+            encoder = BINARY_ENCODERS[_DEFAULT_TYPES[kind]]
+        elif isinstance(value, decimal.Decimal):
+            raise TypeError(
+                "Binary COPY of numeric values is not supported. "
+                "Provide a type for the column, e.g. 'float8' or 'text'."
+            )
+        else:
+            raise TypeError(
+                f"Can't infer a PostgreSQL type for {kind}. Provide a type for the column."
+            )
+    data = encoder(value)
+    return _INT32.pack(len(data)) + data
+
+
+@dataclasses.dataclass
+class Copy(BaseSQLStatement):
+    """A PostgreSQL ``COPY ... FROM STDIN`` statement and its payload.
+
+    The payload is encoded incrementally into a file-like object (anything with a
+    ``write`` method) or by extending a ``bytearray``, so it may be handed directly to
+    a client, e.g. psycopg's ``copy.write`` or asyncpg's ``copy_to_table``.
+
+    Examples
+    --------
+    >>> copy = Copy("foo", columns=("id", "name"))
+    >>> print(copy.to_sql())
+    COPY foo (id, name) FROM STDIN WITH (FORMAT text)
+    >>> buffer = bytearray()
+    >>> copy.write_rows([(1, "a\\tb"), (2, None)], buffer)
+    12
+    >>> bytes(buffer)
+    b'1\\ta\\\\tb\\n2\\t\\\\N\\n'
+    """
+
+    table: str
+    schema: str = None
+    columns: Tuple[str, ...] = ()
+    format: CopyFormat = CopyFormat.TEXT
+    #: The PostgreSQL type of a column, for binary encoding. See :data:`BINARY_ENCODERS`.
+    types: Mapping[str, str] = dataclasses.field(default_factory=dict)
+
+    def __post_init__(self):
+        super().__post_init__()
+        self.columns = tuple(self.columns)
+        self.format = CopyFormat(self.format)
+        try:
+            assert self.columns, f"{type(self).__name__}.columns must not be empty."
+            unknown = {*self.types.values()} - BINARY_ENCODERS.keys()
+            assert not unknown, f"Unknown types for binary encoding: {unknown}."
+        except AssertionError as err:
+            raise TypeError(err)
+
+    @classmethod
+    def from_insert(cls, insert: Insert, **kwargs) -> "Copy":
+        """Build a :class:`Copy` for the table and columns of an :class:`que.Insert`."""
+        return cls(
+            insert.table, schema=insert.schema, columns=insert.fields.fields(), **kwargs
+        )
+
+    def to_sql(self) -> str:
+        """Generate the ``COPY`` command for this table and format."""
+        return (
+            f"COPY {self.table_name} ({', '.join(self.columns)}) "
+            f"FROM STDIN WITH (FORMAT {self.format})"
+        )
+
+    def encode_row(self, row: Sequence[Any]) -> bytes:
+        """Encode a single row of values, in the order of :attr:`Copy.columns`."""
+        return self._row_encoder()(row)
+
+    def _row_encoder(self) -> Callable[[Sequence[Any]], bytes]:
+        if self.format is CopyFormat.CSV:
+            return lambda row: (",".join([_csv_value(x) for x in row]) + "\n").encode()
+        if self.format is CopyFormat.TEXT:
+            return lambda row: (
+                "\t".join([_text_value(x) for x in row]) + "\n"
+            ).encode()
+        # Resolve the encoders once, rather than for every row.
+        encoders = tuple(
+            BINARY_ENCODERS[self.types[x]] if x in self.types else None
+            for x in self.columns
+        )
+        return lambda row: _INT16.pack(len(row)) + b"".join(
+            [_binary_value(x, y) for x, y in zip(row, encoders)]
+        )
+
+    def _encode_into(self, rows: Iterable[Sequence[Any]], buffer: bytearray):
+        """Encode the complete payload for ``rows``, yielding whenever a row is added."""
+        binary = self.format is CopyFormat.BINARY
+        if binary:
+            buffer += _BINARY_HEADER
+        encode = self._row_encoder()
+        for row in rows:
+            buffer += encode(row)
+            yield
+        if binary:
+            buffer += _BINARY_TRAILER
+
+    def iter_payload(
+        self, rows: Iterable[Sequence[Any]], chunk_size: int = 65536
+    ) -> Iterator[bytes]:
+        """Lazily encode rows of values as chunks of roughly ``chunk_size`` bytes."""
+        buffer = bytearray()
+        for _ in self._encode_into(rows, buffer):
+            if len(buffer) >= chunk_size:
+                yield bytes(buffer)
+                buffer.clear()
+        if buffer:
+            yield bytes(buffer)
+
+    def write_rows(self, rows: Iterable[Sequence[Any]], out: Sink) -> int:
+        """Encode rows of values into a ``bytearray`` or file-like object.
+
+        A ``bytearray`` is extended in-place. A file-like object is written to in
+        chunks of 64KiB.
+
+        Returns
+        -------
+        The number of bytes written.
+        """
+        if isinstance(out, bytearray):
+            start = len(out)
+            for _ in self._encode_into(rows, out):
+                pass
+            return len(out) - start
+        written = 0
+        for chunk in self.iter_payload(rows):
+            out.write(chunk)
+            written += len(chunk)
+        return written
+
+    def write(self, records: Iterable[Any], out: Sink) -> int:
+        """Encode records into a ``bytearray`` or file-like object.
+
+        Values are looked up by column name, so records may be a mapping, dataclass,
+        NamedTuple or collection of 2-tuples.
+
+        Returns
+        -------
+        The number of bytes written.
+        """
+        return self.write_rows(map(_record_getter(self.columns), records), out)
@@ -0,0 +1,278 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple, Union
+
+from .query import (
+    DEFAULT_DIALECT,
+    DEFAULT_PARAM_STYLE,
+    BaseSQLStatement,
+    BasicParamStyle,
+    BulkUpdate,
+    Dialect,
+    Insert,
+    InsertMany,
+    NameParamStyle,
+    NumParamStyle,
+    ParamStyleType,
+    _placeholders,
+)
+
+Plan = List[Tuple[str, Union[List, Dict]]]
+
+
+def statement_name(sql: str, prefix: str = "que_") -> str:
+    """Get a deterministic name for a SQL statement.
+
+    The name is a hash of the SQL with its whitespace normalized, so it is stable
+    across processes and hosts.
+
+    Examples
+    --------
+    >>> statement_name("SELECT\\n  *\\nFROM\\n  foo")  # doctest: +ELLIPSIS
+    'que_...'
+    >>> statement_name("SELECT * FROM foo") == statement_name("SELECT\\n  *\\nFROM\\n  foo")
+    True
+    """
+    normalized = " ".join(sql.split()).encode()
+    return f"{prefix}{hashlib.blake2b(normalized, digest_size=8).hexdigest()}"
+
+
+class PreparedSet:
+    """The names of the statements which have been prepared on a single connection.
+
+    The set is bounded: when a new statement exceeds ``maxsize``, the least-recently
+    used statement is evicted and should be deallocated on the connection.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._names = OrderedDict()
+
+    def __repr__(self):
+        return f"{type(self).__name__}({list(self._names)})"
+
+    def __contains__(self, name: str):
+        return name in self._names
+
+    def __len__(self):
+        return len(self._names)
+
+    def touch(self, name: str) -> bool:
+        """Mark a statement as recently used. Return whether it was already prepared."""
+        if name in self._names:
+            self._names.move_to_end(name)
+            return True
+        return False
+
+    def add(self, name: str) -> List[str]:
+        """Mark a statement as prepared. Return the names of any evicted statements."""
+        self._names[name] = None
+        self._names.move_to_end(name)
+        evicted = []
+        while len(self._names) > self.maxsize:
+            evicted.append(self._names.popitem(last=False)[0])
+        return evicted
+
+    def discard(self, name: str):
+        self._names.pop(name, None)
+
+
+class PreparedRegistry:
+    """A registry of named, server-side prepared statements for many connections.
+
+    Each rendered statement shape gets a deterministic name (see :func:`statement_name`).
+    The registry tracks which statements have been prepared on each connection and
+    plans the SQL to run: ``PREPARE`` the first time a statement is seen on a
+    connection, ``DEALLOCATE`` for statements evicted from the connection's
+    :class:`PreparedSet`, then ``EXECUTE``.
+
+    For PostgreSQL, the arguments are bound inside ``EXECUTE name(...)``, which is a
+    utility statement. This only works with a client which interpolates arguments
+    into the SQL before sending it, e.g. ``psycopg2``. A client which binds them on
+    the server, e.g. ``asyncpg`` or ``psycopg`` 3, can't bind them there, and
+    should use its own prepared statements instead.
+
+    Examples
+    --------
+    >>> import que
+    >>> registry = PreparedRegistry()
+    >>> select = que.Select("foo", filters=[que.Filter(que.Field("id", 1))])
+    >>> for sql, args in registry.plan("conn", select, style=que.NameParamStyle.PYFM):
+    ...     print(sql, args)  # doctest: +ELLIPSIS
+    PREPARE que_... AS SELECT
+      *
+    FROM
+      foo
+    WHERE
+      id = $1 {}
+    EXECUTE que_...(%(id)s) {'id': 1}
+    >>> [sql for sql, _ in registry.plan("conn", select)]  # doctest: +ELLIPSIS
+    ['EXECUTE que_...(:1)']
+    """
+
+    def __init__(
+        self,
+        dialect: Dialect = DEFAULT_DIALECT,
+        maxsize: int = 256,
+        prefix: str = "que_",
+    ):
+        """The Constructor.
+
+        Parameters
+        ----------
+        dialect : defaults :class:`Dialect.POSTGRES`
+            The dialect to generate ``PREPARE``/``EXECUTE``/``DEALLOCATE`` for.
+        maxsize : defaults 256
+            The maximum number of statements to keep prepared on each connection.
+        prefix : defaults "que_"
+            The prefix for the names of prepared statements.
+        """
+        if dialect not in (Dialect.POSTGRES, Dialect.MYSQL):
+            raise TypeError(
+                f"{type(self).__name__} doesn't support {dialect!r}, "
+                "which has no SQL for prepared statements."
+            )
+        self.dialect = dialect
+        self.maxsize = maxsize
+        self.prefix = prefix
+        self._connections: Dict[Hashable, PreparedSet] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return (
+            f"{type(self).__name__}(dialect={self.dialect!r}, maxsize={self.maxsize})"
+        )
+
+    @property
+    def _param_style(self) -> ParamStyleType:
+        # The param-style of the statement text on the server.
+        if self.dialect is Dialect.MYSQL:
+            return BasicParamStyle.QM
+        return NumParamStyle.DOL
+
+    def prepared(self, connection: Hashable) -> PreparedSet:
+        """Get the set of statements prepared on a connection."""
+        with self._lock:
+            prepared = self._connections.get(connection)
+            if prepared is None:
+                prepared = self._connections[connection] = PreparedSet(self.maxsize)
+            return prepared
+
+    def name(self, sql: str) -> str:
+        """Get the deterministic name of a statement."""
+        return statement_name(sql, self.prefix)
+
+    def prepare_sql(self, name: str, sql: str) -> str:
+        """Generate the SQL which prepares a statement on the server."""
+        if self.dialect is Dialect.MYSQL:
+            escaped = sql.replace("\\", "\\\\").replace("'", "''")
+            return f"PREPARE {name} FROM '{escaped}'"
+        return f"PREPARE {name} AS {sql}"
+
+    def execute_sql(
+        self, name: str, params: Tuple[str, ...], style: ParamStyleType
+    ) -> str:
+        """Generate the SQL which executes a prepared statement, in the given param-style."""
+        if not params:
+            return f"EXECUTE {name}"
+        if self.dialect is Dialect.MYSQL:
+            variables = ", ".join(f"@{name}_{x}" for x in range(len(params)))
+            return f"EXECUTE {name} USING {variables}"
+        return f"EXECUTE {name}({', '.join(_placeholders(style, params))})"
+
+    def deallocate_sql(self, name: str) -> str:
+        """Generate the SQL which removes a prepared statement from the server."""
+        if self.dialect is Dialect.MYSQL:
+            return f"DEALLOCATE PREPARE {name}"
+        return f"DEALLOCATE {name}"
+
+    def plan(
+        self,
+        connection: Hashable,
+        statement: BaseSQLStatement,
+        style: ParamStyleType = DEFAULT_PARAM_STYLE,
+        **options,
+    ) -> Plan:
+        """Plan the SQL to run a statement on a connection as a prepared statement.
+
+        Parameters
+        ----------
+        connection
+            Any hashable key for the connection, e.g. the connection itself.
+        statement
+            The que statement to run.
+        style : defaults :class:`NumParamStyle.NUM`
+            The param-style of the connection's client.
+        **options
+            Any statement-specific options. An :class:`que.Insert` is always planned
+            with ``inject_columns``, since a prepared statement can't bind its
+            column names.
+
+        Returns
+        -------
+        The ``(sql, args)`` pairs to run on the connection, in order.
+
+        Raises
+        ------
+        TypeError
+            If the statement renders to more than one statement (e.g. an
+            :class:`que.InsertMany`), or, for PostgreSQL, if the param-style is
+            ``$1``, which is only bound on the server.
+        """
+        if isinstance(statement, (InsertMany, BulkUpdate)):
+            raise TypeError(
+                f"{type(self).__name__} can't plan a {type(statement).__name__}, "
+                "which may render to many statements. Use to_sql() and plan each "
+                "with a client-side prepared statement instead."
+            )
+        if self.dialect is Dialect.POSTGRES and style is NumParamStyle.DOL:
+            raise TypeError(
+                f"{type(self).__name__} can't bind {style!r} params in an EXECUTE, "
+                "since they are bound on the server."
+            )
+        if isinstance(statement, Insert):
+            options["inject_columns"] = True
+        sql = statement._compile(self._param_style, **options).sql
+        name = self.name(sql)
+        params = statement._compile(style, **options).names
+        values = statement._values(**options)
+        args = dict(zip(params, values)) if style in NameParamStyle else list(values)
+
+        prepared = self.prepared(connection)
+        plan: Plan = []
+        with self._lock:
+            if not prepared.touch(name):
+                plan.extend(
+                    (self.deallocate_sql(x), self._empty(style))
+                    for x in prepared.add(name)
+                )
+                plan.append((self.prepare_sql(name, sql), self._empty(style)))
+        if self.dialect is Dialect.MYSQL and values:
+            # MySQL can only EXECUTE with user-defined variables.
+            variables = ", ".join(
+                f"@{name}_{x} = {y}" for x, y in enumerate(_placeholders(style, params))
+            )
+            plan.append((f"SET {variables}", args))
+            plan.append((self.execute_sql(name, params, style), self._empty(style)))
+        else:
+            plan.append((self.execute_sql(name, params, style), args))
+        return plan
+
+    def invalidate(self, connection: Hashable, name: Optional[str] = None):
+        """Mark one (or every) statement as no longer prepared on a connection.
+
+        This is useful if the server has discarded prepared statements, e.g. after a
+        reconnect or a schema change, or when the connection is closed.
+        """
+        with self._lock:
+            if name is None:
+                self._connections.pop(connection, None)
+            elif connection in self._connections:
+                self._connections[connection].discard(name)
+
+    @staticmethod
+    def _empty(style: ParamStyleType) -> Union[List, Dict[str, Any]]:
+        return {} if style in NameParamStyle else []
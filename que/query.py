@@ -1,7 +1,13 @@
 #!/usr/bin/env python
 # -*- coding: UTF-8 -*-
+from __future__ import annotations
+
 import dataclasses
 import enum
+import functools
+import itertools
+import operator
+import sys
 from typing import (
     List,
     Tuple,
@@ -14,13 +20,29 @@ from typing import (
     Hashable,
     Type,
     NamedTuple,
+    Optional,
+    Iterable,
+    Iterator,
+    Callable,
+    Sequence,
+    ClassVar,
 )
 from collections import UserList
+from types import MappingProxyType
+
+from . import instrument
+from .cache import STATEMENT_CACHE, CompiledSQL
+from .util import isnamedtuple, Nothing, slotted
+
+
+class _StrEnum(str, enum.Enum):
+    """A string enum which formats as its value, regardless of the Python version."""
 
-from .util import DictFactory, isnamedtuple, Nothing
+    __str__ = str.__str__
+    __format__ = str.__format__
 
 
-class MathOps(str, enum.Enum):
+class MathOps(_StrEnum):
     """Common SQL arithmetic operations."""
 
     ADD = "+"
@@ -35,7 +57,7 @@ class MathOps(str, enum.Enum):
     IMOD = "%="
 
 
-class BitOps(str, enum.Enum):
+class BitOps(_StrEnum):
     """SQL Bitwise operations."""
 
     AND = "&"
@@ -46,7 +68,7 @@ class BitOps(str, enum.Enum):
     IXOR = "^-="
 
 
-class LogOps(str, enum.Enum):
+class LogOps(_StrEnum):
     """Common SQL Logical Operations."""
 
     ALL = "ALL"
@@ -62,7 +84,7 @@ class LogOps(str, enum.Enum):
     RE = "REGEXP"
 
 
-class CmpOps(str, enum.Enum):
+class CmpOps(_StrEnum):
     """Common SQL Comparison operations."""
 
     EQ = "="
@@ -73,21 +95,24 @@ class CmpOps(str, enum.Enum):
     NE = "<>"
 
 
-class BasicParamStyle(str, enum.Enum):
+_OPCODES: Dict[str, Union[CmpOps, LogOps]] = {x.value: x for x in (*CmpOps, *LogOps)}
+
+
+class BasicParamStyle(_StrEnum):
     """Simple DBAPI 2.0 compliant param styles."""
 
     QM = "?"
     FM = "%s"
 
 
-class NumParamStyle(str, enum.Enum):
+class NumParamStyle(_StrEnum):
     """Numbered DBAPI 2.0 compliant param styles."""
 
     NUM = ":{}"
     DOL = "${}"
 
 
-class NameParamStyle(str, enum.Enum):
+class NameParamStyle(_StrEnum):
     """Named DBAPI 2.0 compliant param styles"""
 
     NAME = ":{}"
@@ -100,12 +125,37 @@ ParamStyleType = NewType(
 DEFAULT_PARAM_STYLE = NumParamStyle.NUM
 
 
-@dataclasses.dataclass
+class Dialect(_StrEnum):
+    """SQL dialects which have behavior que must account for."""
+
+    POSTGRES = "postgres"
+    MYSQL = "mysql"
+    SQLITE = "sqlite"
+    #: SQLite before 3.32, which limits statements to 999 parameters.
+    SQLITE_LEGACY = "sqlite-legacy"
+
+
+DEFAULT_DIALECT = Dialect.POSTGRES
+
+#: The maximum number of bind-parameters a single statement may have for each dialect.
+PARAM_LIMITS: Dict[Dialect, int] = {
+    Dialect.POSTGRES: 32767,
+    Dialect.MYSQL: 65535,
+    Dialect.SQLITE: 32766,
+    Dialect.SQLITE_LEGACY: 999,
+}
+
+
+@slotted
+@dataclasses.dataclass(frozen=True)
 class Field:
     """A generic Field for a SQL statement.
 
     A ``Field`` represents the most basic component of a SQL statement. It can be used for identifying
     the fields which you plan to select or modify or the fields which you wish to filter by.
+
+    Fields are immutable, and hashable if their value is. Use :func:`dataclasses.replace`
+    to derive a new ``Field``.
     """
 
     name: str = None
@@ -128,7 +178,13 @@ class Field:
         )
 
 
-@dataclasses.dataclass
+def _bucket(size: int) -> int:
+    """The smallest power of two which is at least ``size``."""
+    return 1 << (size - 1).bit_length() if size > 1 else 1
+
+
+@slotted
+@dataclasses.dataclass(frozen=True)
 class Filter:
     """An object representation of a simple SQL filter.
 
@@ -136,20 +192,82 @@ class Filter:
         - The ``Filter.field`` provides the name of the column and the value of the filter.
         - The ``Filter.opcode`` provides the operation (equal-to, less-than, ...).
         - The ``Filter.prefix``  an optional prefix to provide to the parameter naming.
+
+    The value of a filter may be a collection if the opcode is :attr:`LogOps.ANY` or
+    :attr:`LogOps.IN`:
+        - ``ANY`` binds the collection as a single array parameter (``id = ANY($1)``).
+          Arrays are supported by Postgres, but not by MySQL or SQLite.
+        - ``IN`` binds one parameter per value (``id IN ($1, $2)``). The values are
+          padded with the last value to the next power of two, so a statement only
+          has one shape for each bucket of sizes.
+
+    Examples
+    --------
+    >>> fylter = Filter(Field("id", [1, 2, 3]), opcode=LogOps.IN)
+    >>> fylter.bucket
+    4
+    >>> fylter.values()
+    [1, 2, 3, 3]
+    >>> sql, args = FilterList([fylter]).to_sql()
+    >>> print(sql)
+    WHERE
+      id IN (:1, :2, :3, :4)
     """
 
     field: Field
-    opcode: CmpOps = CmpOps.EQ
+    opcode: Union[CmpOps, LogOps] = CmpOps.EQ
     prefix: str = ""
 
     def __post_init__(self):
+        # Opcodes are checked by identity, so a plain string such as "IN" is coerced.
+        opcode = _OPCODES.get(self.opcode)
+        if opcode is not None and opcode is not self.opcode:
+            object.__setattr__(self, "opcode", opcode)
         try:
             assert (
                 self.field.name and self.field.value is not None
             ), f"{type(self).__name__}.field must have name and value."
+            if self.opcode in (LogOps.ANY, LogOps.IN):
+                value = self.field.value
+                assert isinstance(value, Collection) and not isinstance(
+                    value, (str, bytes, Mapping)
+                ), f"{type(self).__name__}.field must have a collection value for {self.opcode!r}."
+                assert (
+                    value or self.opcode is LogOps.ANY
+                ), f"{type(self).__name__}.field must not be empty for {self.opcode!r}."
         except AssertionError as err:
             raise TypeError(err)
 
+    @property
+    def bucket(self) -> Optional[int]:
+        """The number of parameters of an ``IN`` filter, or ``None`` for other filters."""
+        return _bucket(len(self.field.value)) if self.opcode is LogOps.IN else None
+
+    def values(self) -> List[Any]:
+        """The values this filter binds, in order."""
+        value = self.field.value
+        if self.opcode is LogOps.IN:
+            values = list(value)
+            return values + values[-1:] * (self.bucket - len(values))
+        if self.opcode is LogOps.ANY:
+            return [list(value)]
+        return [value]
+
+    def _params(self) -> List[Tuple[str, Any]]:
+        # The name and value of each parameter, before the prefix is added.
+        name = self.field.name
+        if self.opcode is LogOps.IN:
+            return [(f"{name}_{x}", y) for x, y in enumerate(self.values())]
+        return [(name, self.values()[0])]
+
+    def _clause(self, placeholders: List[str]) -> str:
+        name = self.field.name
+        if self.opcode is LogOps.IN:
+            return f"{name} IN ({', '.join(placeholders)})"
+        if self.opcode is LogOps.ANY:
+            return f"{name} = ANY({placeholders[0]})"
+        return f"{name} {self.opcode} {placeholders[0]}"
+
     def to_sql(
         self, args: "ArgList" = None, style: ParamStyleType = DEFAULT_PARAM_STYLE
     ) -> Tuple[str, "ArgList"]:
@@ -168,15 +286,27 @@ class Filter:
         The :class:`ArgList` which will be passed on to the DB client for secure formatting.
         """
         args = args or ArgList()
-        args.append(self.field)
-        fmt = f"{style}"
-        if style in NameParamStyle:
-            name = f"{self.prefix}{self.field.name}"
-            fmt = fmt.format(name)
-            args[-1] = dataclasses.replace(self.field, name=name)
-        elif style in NumParamStyle:
-            fmt = fmt.format(len(args))
-        return f"{self.field.name} {self.opcode} {fmt}", args
+        placeholders = []
+        for name, value in self._params():
+            fmt = f"{style}"
+            if style in NameParamStyle:
+                name = f"{self.prefix}{name}"
+                fmt = fmt.format(name)
+            args.append(Field(name, value))
+            if style in NumParamStyle:
+                fmt = fmt.format(len(args))
+            placeholders.append(fmt)
+        return self._clause(placeholders), args
+
+    def _write(self, compiler: _Compiler):
+        if self.opcode is LogOps.IN or self.opcode is LogOps.ANY:
+            param, prefix = compiler.param, self.prefix
+            placeholders = [param(x, y, prefix) for x, y in self._params()]
+            compiler.write(self._clause(placeholders))
+            return
+        name = self.field.name
+        placeholder = compiler.param(name, self.field.value, self.prefix)
+        compiler.write(f"{name} {self.opcode} {placeholder}")
 
 
 class FieldList(UserList):
@@ -199,6 +329,9 @@ class FieldList(UserList):
     def __repr__(self):
         return f"{type(self).__name__}([{', '.join(str(x) for x in self)}])"
 
+    def __iter__(self) -> Iterator[Field]:
+        return iter(self.data)
+
     def aslist(self) -> List[Any]:
         """Return only a list of ``Field.value``."""
         return list(self.values())
@@ -228,13 +361,224 @@ class FieldList(UserList):
         super().append(item)
 
 
+class _ReadOnlyList(list):
+    """A list which can't be modified in place."""
+
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError(
+            f"{type(self).__name__} is read-only. Modify the ArgList it came from."
+        )
+
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+
+
 class ArgList(FieldList):
-    """An alias for :class:`FieldList` for mental clarity.
+    """A :class:`FieldList` of the arguments for a SQL statement.
 
-    Also provides a convenience method for outputting your args in the appropriate format
-    for the selected style
+    Arguments are stored as parallel arrays of names and values rather than as
+    :class:`Field`, so they can be handed to a DB client without visiting each field.
+    Fields are only created when the list is indexed or iterated.
+
+    Unlike a :class:`FieldList`, :attr:`ArgList.data` is a read-only snapshot of the
+    fields: modify the :class:`ArgList` itself, or assign a new list to ``data``.
+
+    :meth:`ArgList.view` is for callers which build an :class:`ArgList` themselves,
+    e.g. with :meth:`Filter.to_sql`. Statements' ``to_sql`` don't use an
+    :class:`ArgList`, and return a new ``list`` or ``dict`` of arguments.
+
+    Examples
+    --------
+    >>> args = ArgList.from_arrays(["foo", "bar"], [1, 2])
+    >>> args.for_sql()
+    [1, 2]
+    >>> args.view(NameParamStyle.NAME)
+    mappingproxy({'foo': 1, 'bar': 2})
+    >>> args[0]
+    Field(name='foo', value=1)
     """
 
+    def __init__(self, initlist: Collection[Field] = None):
+        self._names: List[str] = []
+        self._values: List[Any] = []
+        self._views: Dict[bool, Union[Tuple, MappingProxyType]] = {}
+        if initlist:
+            self.extend(initlist)
+
+    @classmethod
+    def from_arrays(cls, names: Iterable[str], values: Iterable[Any]) -> ArgList:
+        """Build an :class:`ArgList` from parallel arrays of names and values."""
+        args = cls()
+        args._names, args._values = list(names), list(values)
+        if len(args._names) != len(args._values):
+            raise TypeError(f"{cls.__name__} requires one name per value.")
+        if not all(x or y for x, y in zip(args._names, args._values)):
+            raise TypeError(f"{cls.__name__} requires a name or value for each Field.")
+        return args
+
+    @property
+    def data(self) -> List[Field]:
+        return _ReadOnlyList(map(Field, self._names, self._values))
+
+    @data.setter
+    def data(self, fields: Iterable[Field]):
+        self.clear()
+        self.extend(fields)
+
+    def _check(self, item: Any) -> Field:
+        if not isinstance(item, Field):
+            raise TypeError(f"{type(self).__name__} requires type Field.")
+        return item
+
+    def __len__(self):
+        return len(self._values)
+
+    def __reduce__(self):
+        # Leave out the cached views, which can't be pickled.
+        return type(self).from_arrays, (self._names, self._values)
+
+    def __eq__(self, other):
+        if isinstance(other, ArgList):
+            return self._names == other._names and self._values == other._values
+        if isinstance(other, UserList):
+            other = other.data
+        return (
+            isinstance(other, list)
+            and len(other) == len(self._values)
+            and all(
+                type(x) is Field and x.name == y and x.value == z
+                for x, y, z in zip(other, self._names, self._values)
+            )
+        )
+
+    def __contains__(self, item: Any) -> bool:
+        if type(item) is not Field:
+            return False
+        return (item.name, item.value) in zip(self._names, self._values)
+
+    def count(self, item: Any) -> int:
+        if type(item) is not Field:
+            return 0
+        pair = (item.name, item.value)
+        return sum(1 for x in zip(self._names, self._values) if x == pair)
+
+    def index(self, item: Any, start: int = 0, stop: int = None) -> int:
+        if type(item) is Field:
+            pair, names, values = (item.name, item.value), self._names, self._values
+            for index in range(len(values))[start:stop]:
+                if (names[index], values[index]) == pair:
+                    return index
+        raise ValueError(f"{item!r} is not in {type(self).__name__}")
+
+    def __iter__(self) -> Iterator[Field]:
+        return map(Field, self._names, self._values)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self.from_arrays(self._names[i], self._values[i])
+        return Field(self._names[i], self._values[i])
+
+    def __setitem__(self, i, item):
+        self._views.clear()
+        if isinstance(i, slice):
+            fields = [self._check(x) for x in item]
+            self._names[i] = [x.name for x in fields]
+            self._values[i] = [x.value for x in fields]
+        else:
+            self._check(item)
+            self._names[i], self._values[i] = item.name, item.value
+
+    def __delitem__(self, i):
+        self._views.clear()
+        del self._names[i]
+        del self._values[i]
+
+    def __iadd__(self, other: Iterable[Field]):
+        self.extend(other)
+        return self
+
+    def __imul__(self, n: int):
+        self._views.clear()
+        self._names *= n
+        self._values *= n
+        return self
+
+    def __copy__(self) -> ArgList:
+        return self.copy()
+
+    def append(self, item: Field):
+        """Append a :class:`Field` to the list.
+
+        Raises
+        -----
+        TypeError
+            If the item sent to be appended is not a :class:`Field`
+        """
+        self._check(item)
+        self._views.clear()
+        self._names.append(item.name)
+        self._values.append(item.value)
+
+    def extend(self, other: Iterable[Field]):
+        if isinstance(other, ArgList):
+            self._views.clear()
+            self._names.extend(other._names)
+            self._values.extend(other._values)
+            return
+        for item in other:
+            self.append(item)
+
+    def insert(self, i: int, item: Field):
+        self._check(item)
+        self._views.clear()
+        self._names.insert(i, item.name)
+        self._values.insert(i, item.value)
+
+    def pop(self, i: int = -1) -> Field:
+        self._views.clear()
+        return Field(self._names.pop(i), self._values.pop(i))
+
+    def remove(self, item: Field):
+        del self[self.index(item)]
+
+    def clear(self):
+        self._views.clear()
+        self._names.clear()
+        self._values.clear()
+
+    def copy(self) -> ArgList:
+        return self.from_arrays(self._names, self._values)
+
+    def reverse(self):
+        self._views.clear()
+        self._names.reverse()
+        self._values.reverse()
+
+    def sort(self, *args, **kwargs):
+        self.data = sorted(self.data, *args, **kwargs)
+
+    def aslist(self) -> List[Any]:
+        """Return only a list of ``Field.value``."""
+        return self._values.copy()
+
+    def asdict(self) -> Dict[str, Any]:
+        """Return a mapping of ``Field.name->Field.value``."""
+        mapping = dict(zip(self._names, self._values))
+        mapping.pop(None, None)
+        return mapping
+
+    def fields(self) -> Tuple[str, ...]:
+        """Return a tuple of ``Field.name``."""
+        if None in self._names:
+            return tuple(x for x in self._names if x is not None)
+        return tuple(self._names)
+
+    def values(self) -> Tuple[Any, ...]:
+        """Return a tuple of ``Field.value``."""
+        return tuple(self._values)
+
     def for_sql(
         self, style: ParamStyleType = DEFAULT_PARAM_STYLE
     ) -> Union[Dict[str, Any], List[Any]]:
@@ -249,6 +593,27 @@ class ArgList(FieldList):
             return self.asdict()
         return self.aslist()
 
+    def view(
+        self, style: ParamStyleType = DEFAULT_PARAM_STYLE
+    ) -> Union[MappingProxyType, Tuple[Any, ...]]:
+        """Output the args as a read-only tuple, or mapping for named param-styles.
+
+        The view is built once and re-used until the list is modified, so repeated
+        calls are O(1). Use :meth:`ArgList.for_sql` for clients which require a
+        ``list`` or ``dict``, such as :mod:`sqlite3`.
+
+        Parameters
+        ----------
+        style :
+            The enum selection which matches your param-style.
+        """
+        named = style in NameParamStyle
+        view = self._views.get(named)
+        if view is None:
+            view = MappingProxyType(self.asdict()) if named else self.values()
+            self._views[named] = view
+        return view
+
 
 class FilterList(UserList):
     """A list of SQL Filters which with SQL statement generation.
@@ -263,6 +628,9 @@ class FilterList(UserList):
     def __repr__(self):
         return f"{type(self).__name__}([{', '.join(str(x) for x in self)}])"
 
+    def __iter__(self) -> Iterator[Filter]:
+        return iter(self.data)
+
     def append(self, item: Filter):
         """Append a :class:`Filter` to the list.
 
@@ -296,14 +664,91 @@ class FilterList(UserList):
         for fylter in self:
             sql, args = fylter.to_sql(args, style)
             where.append(sql)
-        where = "AND\n  ".join(where)
+        where = " AND\n  ".join(where)
 
         return f"WHERE\n  {where}" if where else "", args
 
+    def shape(self) -> Tuple[Tuple[str, str, str, Optional[int]], ...]:
+        """The hashable components of the ``WHERE`` clause which influence the SQL text."""
+        return tuple((x.field.name, x.opcode, x.prefix, x.bucket) for x in self)
+
+    def values(self) -> List[Any]:
+        """The values of the filters, in the order they are bound in the ``WHERE`` clause."""
+        values = []
+        for fylter in self.data:
+            if fylter.opcode is LogOps.IN or fylter.opcode is LogOps.ANY:
+                values.extend(fylter.values())
+            else:
+                values.append(fylter.field.value)
+        return values
+
+    def _write(self, compiler: _Compiler):
+        if not self.data:
+            return
+        compiler.write("WHERE\n  ")
+        for index, fylter in enumerate(self.data):
+            if index:
+                compiler.write(" AND\n  ")
+            fylter._write(compiler)
+
+
+class _Compiler:
+    """A single pass over a statement, writing its SQL and binding its arguments.
+
+    SQL fragments are written to one buffer, and values are bound directly into the
+    arguments for the param-style: a dict for named styles or a list otherwise.
+    """
+
+    __slots__ = ("style", "buffer", "names", "args", "_named", "_numbered")
+
+    def __init__(self, style: ParamStyleType):
+        self.style = style
+        self.buffer: List[str] = []
+        self.names: List[str] = []
+        self._named = style in NameParamStyle
+        self._numbered = style in NumParamStyle
+        self.args: Union[List, Dict] = {} if self._named else []
+
+    def write(self, *fragments: str):
+        """Write fragments of SQL to the buffer."""
+        self.buffer.extend(fragments)
+
+    def param(self, name: str, value: Any, prefix: str = "") -> str:
+        """Bind a value to a new parameter and get the placeholder for it.
+
+        The ``prefix`` is only added to the name of the parameter for named styles.
+        """
+        if self._named:
+            name = f"{prefix}{name}" if prefix else name
+            self.names.append(name)
+            self.args[name] = value
+            return self.style.format(name)
+        self.names.append(name)
+        self.args.append(value)
+        if self._numbered:
+            return self.style.format(len(self.args))
+        return f"{self.style}"
+
+    def sql(self) -> str:
+        return "".join(self.buffer)
+
+    def compiled(self) -> CompiledSQL:
+        return CompiledSQL(self.sql(), tuple(self.names))
+
+
+def _returns_shape(returns: Optional[Field]) -> Optional[Tuple[str, Any]]:
+    return (returns.name, returns.value) if returns else None
+
 
 @dataclasses.dataclass
 class BaseSQLStatement:
-    """A Base-class for simple SQL Statements (Select, Update, Insert, etc)"""
+    """A Base-class for simple SQL Statements (Select, Update, Insert, etc)
+
+    Sub-classes render their SQL by implementing :meth:`BaseSQLStatement._write`.
+    Rendered SQL is cached in :data:`que.cache.STATEMENT_CACHE` by the statement's
+    :meth:`BaseSQLStatement._shape`, so statements of the same shape only need to
+    collect their arguments with :meth:`BaseSQLStatement._values`.
+    """
 
     def __post_init__(self):
         if hasattr(self, "fields") and not isinstance(self.fields, FieldList):
@@ -318,6 +763,74 @@ class BaseSQLStatement:
     def to_sql(self) -> Tuple[str, Union[List, Dict]]:
         raise NotImplementedError
 
+    def _shape(self, style: ParamStyleType, **options) -> Hashable:
+        """Get everything which influences the SQL text of this statement."""
+        raise NotImplementedError
+
+    def _values(self, **options) -> List[Any]:
+        """Get the values to bind to the SQL text of this statement, in order."""
+        raise NotImplementedError
+
+    def _write(self, compiler: _Compiler, **options):
+        """Write the SQL text of this statement and bind its arguments, in one pass."""
+        raise NotImplementedError
+
+    def _render(
+        self, style: ParamStyleType = DEFAULT_PARAM_STYLE, **options
+    ) -> Tuple[str, Union[List, Dict]]:
+        """Render the SQL text of this statement and its arguments, bypassing the cache."""
+        compiler = _Compiler(style)
+        self._write(compiler, **options)
+        return compiler.sql(), compiler.args
+
+    def _to_sql(
+        self, style: ParamStyleType = DEFAULT_PARAM_STYLE, **options
+    ) -> Tuple[str, Union[List, Dict]]:
+        """Render this statement, re-using the cached SQL text for its shape if possible.
+
+        Parameters
+        ----------
+        style : defaults :class:`NumParamStyle.NUM`
+            The DBAPI 2.0 param-style.
+        **options
+            Any statement-specific options which are passed on to the renderer.
+
+        Returns
+        -------
+        The generated SQL statement
+        The arguments to pass to the DB client for secure formatting.
+        """
+        start = instrument.clock() if instrument.SINKS else None
+        compiled = self._compile(style, **options)
+        values = self._values(**options)
+        if start is not None:
+            instrument.emit(type(self).__name__, start, len(values), compiled.sql)
+        if style in NameParamStyle:
+            return compiled.sql, dict(zip(compiled.names, values))
+        return compiled.sql, values
+
+    def _compile(
+        self, style: ParamStyleType = DEFAULT_PARAM_STYLE, **options
+    ) -> CompiledSQL:
+        """Get the SQL text and parameter names for this statement's shape.
+
+        The SQL is only rendered if the shape isn't in :data:`que.cache.STATEMENT_CACHE`.
+        """
+        key = self._shape(style, **options)
+        try:
+            compiled = STATEMENT_CACHE.get(key)
+        except TypeError:
+            # An unhashable shape (e.g., a non-string alias) can't be cached.
+            compiler = _Compiler(style)
+            self._write(compiler, **options)
+            return compiler.compiled()
+        if compiled is None:
+            compiler = _Compiler(style)
+            self._write(compiler, **options)
+            compiled = compiler.compiled()
+            STATEMENT_CACHE.put(key, compiled)
+        return compiled
+
 
 @dataclasses.dataclass
 class Select(BaseSQLStatement):
@@ -358,12 +871,303 @@ class Select(BaseSQLStatement):
         The generated SQL SELECT statement
         The arguments to pass to the DB client for secure formatting.
         """
-        select = self.build_select()
-        where, args = self.filters.to_sql(style=style)
-        return f"{select}\n{where}", args.for_sql(style)
+        return self._to_sql(style)
+
+    def _shape(self, style: ParamStyleType, **options) -> Hashable:
+        return (
+            type(self),
+            self.table_name,
+            tuple((x.name, x.value) for x in self.fields),
+            self.filters.shape(),
+            type(style),
+            style,
+        )
+
+    def _values(self, **options) -> List[Any]:
+        return self.filters.values()
+
+    def _write(self, compiler: _Compiler, **options):
+        compiler.write(self.build_select(), "\n")
+        self.filters._write(compiler)
+
+    def decoder(self, cls: Type) -> Decoder:
+        """Get a decoder for the rows of this statement.
+
+        See Also
+        --------
+        :func:`get_decoder`
+        """
+        return get_decoder(cls, self.fields)
+
+    def keyset(
+        self,
+        keys: Sequence[str],
+        size: int = 100,
+        *,
+        descending: bool = False,
+        row_values: bool = True,
+    ) -> Keyset:
+        """Paginate this statement by a unique, ordered key.
+
+        See Also
+        --------
+        :class:`Keyset`
+        """
+        return Keyset(
+            self, keys, size=size, descending=descending, row_values=row_values
+        )
+
+
+@dataclasses.dataclass
+class Keyset(BaseSQLStatement):
+    """Keyset (or "seek") pagination of a :class:`Select`.
+
+    Rows are ordered by ``keys``, which must uniquely identify a row. Each page after
+    the first seeks past the key of the last row of the previous page, rather than
+    using an ``OFFSET``, so every page costs the same regardless of its depth.
+
+    The seek predicate compares row-values, ``(a, b) > ($1, $2)``, which Postgres,
+    MySQL and SQLite (3.15+) support. Set ``row_values=False`` to expand it into
+    ``(a > $1 OR (a = $2 AND b > $3))`` for other databases.
+
+    Examples
+    --------
+    >>> select = Select("foo", filters=[Filter(Field("kind", "bar"))])
+    >>> page = select.keyset(["created", "id"], size=2)
+    >>> sql, args = page.to_sql()
+    >>> print(sql)
+    SELECT
+      *
+    FROM
+      foo
+    WHERE
+      kind = :1
+    ORDER BY
+      created, id
+    LIMIT 2
+    >>> sql, args = page.next_page({"created": 5, "id": 1}).to_sql()
+    >>> print(sql)
+    SELECT
+      *
+    FROM
+      foo
+    WHERE
+      kind = :1 AND
+      (created, id) > (:2, :3)
+    ORDER BY
+      created, id
+    LIMIT 2
+    >>> args
+    ['bar', 5, 1]
+    """
+
+    select: Select
+    keys: Tuple[str, ...]
+    size: int = 100
+    descending: bool = False
+    row_values: bool = True
+    #: The key of the last row of the previous page, or ``None`` for the first page.
+    seek: Tuple[Any, ...] = None
+
+    def __post_init__(self):
+        super().__post_init__()
+        self.keys = tuple(self.keys)
+        if self.seek is not None:
+            self.seek = tuple(self.seek)
+        try:
+            assert self.keys, f"{type(self).__name__}.keys must not be empty."
+            assert self.size > 0, f"{type(self).__name__}.size must be positive."
+            assert self.seek is None or len(self.seek) == len(
+                self.keys
+            ), f"{type(self).__name__}.seek must have one value per key."
+        except AssertionError as err:
+            raise TypeError(err)
+
+    def to_sql(
+        self, style: ParamStyleType = DEFAULT_PARAM_STYLE
+    ) -> Tuple[str, Union[List, Dict]]:
+        """Generate the SQL SELECT statement for this page.
+
+        Parameters
+        --------
+        style : defaults :class:`NumParamStyle.NUM`
+            The DBAPI 2.0 param-style.
+
+        Returns
+        -----
+        The generated SQL SELECT statement
+        The arguments to pass to the DB client for secure formatting.
+        """
+        return self._to_sql(style)
+
+    def first_page(self) -> Keyset:
+        """Get the first page."""
+        return dataclasses.replace(self, seek=None)
+
+    def next_page(self, row: Any) -> Keyset:
+        """Get the page which follows ``row``, the last row of this page."""
+        return dataclasses.replace(self, seek=self.key(row))
+
+    def key(self, row: Any) -> Tuple[Any, ...]:
+        """Get the key of a row.
+
+        A row may be a mapping (or any object with ``keys()``, such as
+        :class:`sqlite3.Row`), a dataclass or NamedTuple, or a plain tuple of the
+        values of :attr:`Select.fields`.
+        """
+        if isinstance(row, (tuple, list)) and not isnamedtuple(row):
+            columns = [
+                x.value if x.name and x.value else x.name for x in self.select.fields
+            ]
+            if not set(self.keys) <= set(columns):
+                raise TypeError(
+                    f"{type(self).__name__} can't find the keys {self.keys} in a "
+                    f"tuple of {tuple(columns) or '*'}. Select the keys explicitly."
+                )
+            return tuple(row[columns.index(x)] for x in self.keys)
+        if hasattr(row, "keys"):
+            return tuple(row[x] for x in self.keys)
+        return tuple(getattr(row, x) for x in self.keys)
+
+    def pages(
+        self,
+        fetch: Callable[[str, Union[List, Dict]], Sequence[Any]],
+        style: ParamStyleType = DEFAULT_PARAM_STYLE,
+    ) -> Iterator[Sequence[Any]]:
+        """Walk every page, starting from this one.
+
+        Parameters
+        ----------
+        fetch
+            A function which runs a statement and returns all of its rows, e.g.
+            ``lambda sql, args: cursor.execute(sql, args).fetchall()``.
+        style : defaults :class:`NumParamStyle.NUM`
+            The DBAPI 2.0 param-style.
+
+        Yields
+        ------
+        The rows of each non-empty page.
+        """
+        page = self
+        while True:
+            rows = fetch(*page.to_sql(style))
+            if rows:
+                yield rows
+            if len(rows) < self.size:
+                return
+            page = page.next_page(rows[-1])
+
+    def _shape(self, style: ParamStyleType, **options) -> Hashable:
+        return (
+            type(self),
+            self.select._shape(style),
+            self.keys,
+            self.size,
+            self.descending,
+            self.row_values,
+            self.seek is None,
+        )
+
+    def _values(self, **options) -> List[Any]:
+        values = self.select._values()
+        if self.seek is None:
+            return values
+        if self.row_values:
+            return values + list(self.seek)
+        for index in range(len(self.keys)):
+            values.extend(self.seek[: index + 1])
+        return values
+
+    def _write(self, compiler: _Compiler, **options):
+        select = self.select
+        select._write(compiler)
+        if self.seek is not None:
+            compiler.write(" AND\n  " if select.filters else "WHERE\n  ")
+            self._write_seek(compiler)
+        direction = " DESC" if self.descending else ""
+        order = ", ".join([f"{x}{direction}" for x in self.keys])
+        compiler.write(f"\nORDER BY\n  {order}\nLIMIT {int(self.size)}")
+
+    def _write_seek(self, compiler: _Compiler):
+        param, op = compiler.param, "<" if self.descending else ">"
+        pairs = list(zip(self.keys, self.seek))
+        if self.row_values:
+            placeholders = ", ".join([param(x, y, "after_") for x, y in pairs])
+            compiler.write(f"({', '.join(self.keys)}) {op} ({placeholders})")
+            return
+        clauses = []
+        for index, (key, value) in enumerate(pairs):
+            terms = [f"{x} = {param(x, y, 'after_')}" for x, y in pairs[:index]]
+            terms.append(f"{key} {op} {param(key, value, 'after_')}")
+            clauses.append(f"({' AND '.join(terms)})" if index else terms[0])
+        compiler.write(f"({' OR '.join(clauses)})")
+
+
+def _record_getter(
+    keys: Sequence[str], head: Tuple[Any, ...] = ()
+) -> Callable[[Any], Tuple[Any, ...]]:
+    """Build a function which gets the values for ``keys`` from a single record.
+
+    Records may be a mapping, dataclass, NamedTuple or a collection of 2-tuples.
+    The returned values are prefixed with ``head``.
+    """
+    keys = tuple(keys)
+    if len(keys) == 1:
+        (key,) = keys
+        items = lambda x: (x[key],)  # noqa: E731
+        attrs = lambda x: (getattr(x, key),)  # noqa: E731
+    else:
+        items, attrs = operator.itemgetter(*keys), operator.attrgetter(*keys)
+
+    def getter(record: Any) -> Tuple[Any, ...]:
+        if isinstance(record, Mapping):
+            values = items(record)
+        elif dataclasses.is_dataclass(record) or isnamedtuple(record):
+            values = attrs(record)
+        else:
+            values = items(dict(record))
+        return head + values
+
+    return getter
 
 
 class _BaseWriteStatement(BaseSQLStatement):
+    #: Whether a subclass overrides the statement's ``build_*`` method.
+    _custom_builder: ClassVar[bool] = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name in ("build_update", "build_insert"):
+            if name in vars(cls) and any(name in vars(x) for x in cls.__mro__[1:]):
+                cls._custom_builder = True
+                # Bind the builder's values, rather than the statement's own.
+                cls._values = _BaseWriteStatement._values
+
+    def _build(self, style: ParamStyleType, **options) -> Tuple[str, ArgList]:
+        """Render this statement with its ``build_*`` method."""
+        raise NotImplementedError
+
+    def _to_sql(
+        self, style: ParamStyleType = DEFAULT_PARAM_STYLE, **options
+    ) -> Tuple[str, Union[List, Dict]]:
+        if self._custom_builder:
+            # An overridden builder may render anything, so it can't be cached.
+            sql, args = self._build(style, **options)
+            return sql, args.for_sql(style)
+        return super()._to_sql(style, **options)
+
+    def _compile(
+        self, style: ParamStyleType = DEFAULT_PARAM_STYLE, **options
+    ) -> CompiledSQL:
+        if self._custom_builder:
+            sql, args = self._build(style, **options)
+            return CompiledSQL(sql, tuple(args._names))
+        return super()._compile(style, **options)
+
+    def _values(self, **options) -> List[Any]:
+        # Only used by subclasses which override a builder (see __init_subclass__).
+        return self._build(DEFAULT_PARAM_STYLE, **options)[1].aslist()
+
     def get_returning(self) -> str:
         """Get the RETURNING clause of write statement, if any is specified.
 
@@ -375,6 +1179,45 @@ class _BaseWriteStatement(BaseSQLStatement):
         """
         return f"RETURNING {self.returns.for_fetch()}" if self.returns else ""
 
+    def _record_getter(self, **options) -> Callable[[Any], Tuple[Any, ...]]:
+        """Get a function which pulls the values of a record in the order of the params."""
+        raise NotImplementedError
+
+    def to_sql_many(
+        self,
+        records: Iterable["FieldDataType"],
+        style: ParamStyleType = DEFAULT_PARAM_STYLE,
+        **options,
+    ) -> Tuple[str, Iterator[Union[Tuple, Dict]]]:
+        """Render this statement once and lazily generate the arguments for many records.
+
+        The SQL is generated for the shape of this statement. The arguments for each
+        record are looked up by the name of the column they are bound to, so records
+        may be a mapping, dataclass, NamedTuple or collection of 2-tuples. The output
+        is suitable for ``cursor.executemany`` or ``asyncpg``'s ``executemany``.
+
+        Parameters
+        ----------
+        records
+            An iterable of records. This is not consumed until the arguments are.
+        style : defaults :class:`NumParamStyle.NUM`
+            The DBAPI 2.0 param-style.
+        **options
+            Any statement-specific options, e.g. ``inject_columns`` for :class:`Insert`.
+
+        Returns
+        -------
+        The generated SQL statement
+        An iterator of the arguments for each record: a tuple for positional
+        param-styles or a dict for named param-styles.
+        """
+        compiled = self._compile(style, **options)
+        getter = self._record_getter(**options)
+        if style in NameParamStyle:
+            names = compiled.names
+            return compiled.sql, (dict(zip(names, getter(x))) for x in records)
+        return compiled.sql, map(getter, records)
+
     def __post_init__(self):
         super().__post_init__()
         try:
@@ -387,6 +1230,17 @@ class _BaseWriteStatement(BaseSQLStatement):
             raise TypeError(err)
 
 
+def _placeholders(
+    style: ParamStyleType, names: Collection[str], start: int = 1
+) -> List[str]:
+    """Generate the parameter placeholders for a sequence of parameter names."""
+    if style in NumParamStyle:
+        return [style.format(x) for x in range(start, start + len(names))]
+    if style in NameParamStyle:
+        return [style.format(x) for x in names]
+    return [f"{style}"] * len(names)
+
+
 @dataclasses.dataclass
 class Update(_BaseWriteStatement):
     """A simple, single-table SQL UPDATE Statement."""
@@ -402,6 +1256,9 @@ class Update(_BaseWriteStatement):
     ) -> Tuple[str, ArgList]:
         """Build the SQL UPDATE clause.
 
+        This is rendered by the same compiler as :meth:`Update.to_sql`. If a subclass
+        overrides it, :meth:`Update.to_sql` renders with it instead, uncached.
+
         Parameters
         --------
         style : defaults :class:`NumParamStyle.NUM`
@@ -412,13 +1269,15 @@ class Update(_BaseWriteStatement):
         The generated UPDATE clause of a SQL statement
         The arguments to pass to the DB client for secure formatting.
         """
-        updates = []
-        args = ArgList()
-        for field in self.fields:
-            stmt, args = Filter(field, prefix="col").to_sql(args, style)
-            updates.append(stmt)
-        updates = ",\n  ".join(updates)
-        return f"UPDATE\n  {self.table_name}\nSET\n  {updates}", args
+        compiler = _Compiler(style)
+        self._write_set(compiler)
+        values = [x.value for x in self.fields]
+        return compiler.sql(), ArgList.from_arrays(compiler.names, values)
+
+    def _build(self, style: ParamStyleType, **options) -> Tuple[str, ArgList]:
+        update, args = self.build_update(style)
+        where, args = self.filters.to_sql(args, style)
+        return f"{update}\n{where}\n{self.get_returning()}", args
 
     def to_sql(
         self, style: ParamStyleType = DEFAULT_PARAM_STYLE
@@ -435,10 +1294,52 @@ class Update(_BaseWriteStatement):
         The generated SQL UPDATE statement
         The arguments to pass to the DB client for secure formatting.
         """
-        update, args = self.build_update(style)
-        where, args = self.filters.to_sql(args, style)
-        returning = self.get_returning()
-        return f"{update}\n{where}\n{returning}", args.for_sql(style)
+        return self._to_sql(style)
+
+    def _shape(self, style: ParamStyleType, **options) -> Hashable:
+        return (
+            type(self),
+            self.table_name,
+            tuple(x.name for x in self.fields),
+            self.filters.shape(),
+            _returns_shape(self.returns),
+            type(style),
+            style,
+        )
+
+    def _values(self, **options) -> List[Any]:
+        return [x.value for x in self.fields] + self.filters.values()
+
+    def _record_getter(self, **options) -> Callable[[Any], Tuple[Any, ...]]:
+        if any(x.opcode is LogOps.IN for x in self.filters):
+            raise TypeError(
+                f"{type(self).__name__}.to_sql_many doesn't support IN filters, "
+                "since each record could need a different number of parameters."
+            )
+        columns = [x.name for x in self.fields]
+        filters = [x.field.name for x in self.filters]
+        overlap = set(columns).intersection(filters)
+        if overlap:
+            raise TypeError(
+                f"{type(self).__name__}.to_sql_many doesn't support filtering on a "
+                f"column which is also updated ({', '.join(sorted(overlap))}), "
+                "since each record only has one value for it."
+            )
+        return _record_getter(columns + filters)
+
+    def _write_set(self, compiler: _Compiler):
+        compiler.write("UPDATE\n  ", self.table_name, "\nSET\n  ")
+        for index, field in enumerate(self.fields):
+            if index:
+                compiler.write(",\n  ")
+            placeholder = compiler.param(field.name, field.value, "col")
+            compiler.write(f"{field.name} = {placeholder}")
+
+    def _write(self, compiler: _Compiler, **options):
+        self._write_set(compiler)
+        compiler.write("\n")
+        self.filters._write(compiler)
+        compiler.write("\n", self.get_returning())
 
 
 @dataclasses.dataclass
@@ -455,30 +1356,6 @@ class Insert(_BaseWriteStatement):
     fields: FieldList = dataclasses.field(default_factory=FieldList)
     returns: Field = None
 
-    @staticmethod
-    def _fields_to_sql(
-        fields: FieldList, style: ParamStyleType, args: ArgList, inject: bool = False
-    ) -> str:
-        # Override DBAPI formatting. This is dangerous, but required for columns on insert statements in some clients.
-        if inject:
-            return f"({', '.join(fields.values())})"
-
-        stmnts = []
-        for field in fields:
-            # convert the enum to str
-            fmt = f"{style}"
-            # name the parameter according to the style
-            if style in NumParamStyle:
-                fmt = fmt.format(args.index(field) + 1)
-            elif style in NameParamStyle:
-                fmt = fmt.format(field.name)
-            # append the parameter to the list
-            stmnts.append(fmt)
-        # join the parameters
-        stmnts = ",\n  ".join(stmnts)
-        # return them as a single, SQL-compliant fragment
-        return f"({stmnts})" if stmnts else ""
-
     def build_insert(
         self,
         style: ParamStyleType = DEFAULT_PARAM_STYLE,
@@ -487,11 +1364,10 @@ class Insert(_BaseWriteStatement):
     ) -> Tuple[str, ArgList]:
         """Build a SQL INSERT statement.
 
-        We create two new :class:`FieldList` - one for column declaration and one for values declaration.
-        We combine them as a single :class:`ArgList` (order is important!).
-        We generate the SQL fragments for the INSERT INTO clause and the VALUES clause.
-        We check for a RETURNING clause.
-        Finally, we join it all together into one SQL statement.
+        This is rendered by the same compiler as :meth:`Insert.to_sql`. If a subclass
+        overrides it, :meth:`Insert.to_sql` renders with it instead, uncached. The
+        arguments are named ``col<name>`` for each column and ``val<name>`` for each
+        value, whatever the param-style.
 
         Parameters
         --------
@@ -506,20 +1382,18 @@ class Insert(_BaseWriteStatement):
         The generated SQL INSERT statement
         The arguments to pass to the DB client for secure formatting.
         """
-        columns = FieldList([Field(f"col{x.name}", x.name) for x in self.fields])
-        values = FieldList([Field(f"val{x.name}", x.value) for x in self.fields])
-        args = ArgList(values) if inject_columns else ArgList(columns + values)
-        insert_sql = self._fields_to_sql(columns, style, args, inject=inject_columns)
-        values_sql = self._fields_to_sql(values, style, args)
-        returning = self.get_returning()
-        return (
-            (
-                f"INSERT INTO\n  {self.table_name} {insert_sql}\n"
-                f"VALUES\n  {values_sql}\n"
-                f"{returning}"
-            ),
-            args,
-        )
+        compiler = _Compiler(style)
+        self._write(compiler, inject_columns=inject_columns)
+        names = [f"val{x.name}" for x in self.fields]
+        if not inject_columns:
+            names = [f"col{x.name}" for x in self.fields] + names
+        values = Insert._values(self, inject_columns=inject_columns)
+        return compiler.sql(), ArgList.from_arrays(names, values)
+
+    def _build(
+        self, style: ParamStyleType, *, inject_columns: bool = False, **options
+    ) -> Tuple[str, ArgList]:
+        return self.build_insert(style, inject_columns=inject_columns)
 
     def to_sql(
         self, style: ParamStyleType = DEFAULT_PARAM_STYLE, inject_columns: bool = False
@@ -539,8 +1413,677 @@ class Insert(_BaseWriteStatement):
         The generated SQL INSERT statement
         The arguments to pass to the DB client for secure formatting.
         """
-        query, args = self.build_insert(style, inject_columns=inject_columns)
-        return query, args.for_sql(style)
+        return self._to_sql(style, inject_columns=inject_columns)
+
+    def _shape(
+        self, style: ParamStyleType, *, inject_columns: bool = False, **options
+    ) -> Hashable:
+        return (
+            type(self),
+            self.table_name,
+            tuple(x.name for x in self.fields),
+            _returns_shape(self.returns),
+            inject_columns,
+            type(style),
+            style,
+        )
+
+    def _values(self, *, inject_columns: bool = False, **options) -> List[Any]:
+        values = [x.value for x in self.fields]
+        return values if inject_columns else [x.name for x in self.fields] + values
+
+    def _record_getter(
+        self, *, inject_columns: bool = False, **options
+    ) -> Callable[[Any], Tuple[Any, ...]]:
+        keys = self.fields.fields()
+        return _record_getter(keys, head=() if inject_columns else keys)
+
+    def _write(self, compiler: _Compiler, *, inject_columns: bool = False, **options):
+        param, fields = compiler.param, self.fields
+        if inject_columns:
+            columns = ", ".join([x.name for x in fields])
+        else:
+            columns = ",\n  ".join([param(x.name, x.name, "col") for x in fields])
+        values = ",\n  ".join([param(x.name, x.value, "val") for x in fields])
+        compiler.write(
+            "INSERT INTO\n  ",
+            self.table_name,
+            f" ({columns})\nVALUES\n  ({values})\n",
+            self.get_returning(),
+        )
+
+
+@dataclasses.dataclass
+class InsertMany(BaseSQLStatement):
+    """A multi-row, single-table SQL INSERT Statement.
+
+    Rows are rendered as ``VALUES (...), (...), ...`` and automatically split into as
+    many statements as necessary to stay under the bind-parameter limit of the
+    :class:`Dialect` (or ``max_params``) and, optionally, under ``max_bytes`` of SQL.
+
+    Examples
+    --------
+    >>> insert = InsertMany.from_records("foo", [{"bar": 1}, {"bar": 2}])
+    >>> [(sql, args)] = insert.to_sql()
+    >>> print(sql)
+    INSERT INTO
+      foo (:1)
+    VALUES
+      (:2),
+      (:3)
+    <BLANKLINE>
+    >>> args
+    ['bar', 1, 2]
+    """
+
+    table: str
+    schema: str = None
+    columns: Tuple[str, ...] = ()
+    rows: List[Tuple[Any, ...]] = dataclasses.field(default_factory=list)
+    returns: Field = None
+    dialect: Dialect = DEFAULT_DIALECT
+    max_params: int = None
+    max_bytes: int = None
+
+    def __post_init__(self):
+        super().__post_init__()
+        self.columns = tuple(self.columns)
+        if self.max_params is None:
+            self.max_params = PARAM_LIMITS[self.dialect]
+        try:
+            assert self.columns, f"{type(self).__name__}.columns must not be empty."
+            assert all(
+                len(x) == len(self.columns) for x in self.rows
+            ), f"{type(self).__name__}.rows must all have one value per column."
+        except AssertionError as err:
+            raise TypeError(err)
+
+    @classmethod
+    def from_records(
+        cls,
+        table: str,
+        records: Iterable["FieldDataType"],
+        *,
+        exclude: Any = Nothing,
+        **kwargs,
+    ) -> "InsertMany":
+        """Build an :class:`InsertMany` from any records accepted by :func:`data_to_fields`.
+
+        Parameters
+        ----------
+        table
+            The name of the table to insert into.
+        records
+            An iterable of dataclasses, NamedTuples, mappings, or :class:`FieldList`.
+        exclude
+            Any value or type which you wish to exclude. Every record must still
+            produce the same columns.
+        **kwargs
+            Any other attributes of :class:`InsertMany`, e.g. ``schema``, ``dialect``.
+
+        Raises
+        ------
+        TypeError
+            If the records are empty or don't all produce the same columns.
+        """
+        columns, rows = None, []
+        for record in records:
+            fields = (
+                record
+                if isinstance(record, FieldList)
+                else data_to_fields(record, exclude=exclude)
+            )
+            names = tuple(x.name for x in fields)
+            if columns is None:
+                columns = names
+            elif names != columns:
+                raise TypeError(
+                    f"{cls.__name__} records must all have the same fields. "
+                    f"Expected {columns}, got {names}."
+                )
+            rows.append(tuple(x.value for x in fields))
+        return cls(table, columns=columns or (), rows=rows, **kwargs)
+
+    def get_returning(self) -> str:
+        return f"RETURNING {self.returns.for_fetch()}" if self.returns else ""
+
+    def _nrows(self) -> int:
+        return len(self.rows)
+
+    def _chunk_values(self, start: int, stop: int) -> List[Any]:
+        """The values of the rows ``start`` to ``stop``, flattened in row-major order."""
+        return [x for row in self.rows[start:stop] for x in row]
+
+    def chunk_size(
+        self,
+        style: ParamStyleType = DEFAULT_PARAM_STYLE,
+        *,
+        inject_columns: bool = False,
+    ) -> int:
+        """The maximum number of rows which may be rendered in a single statement."""
+        key = self._shape(style, inject_columns=inject_columns) + ("chunk_size",)
+        size = STATEMENT_CACHE.get(key)
+        if size is None:
+            size = self._chunk_size(style, inject_columns)
+            STATEMENT_CACHE.put(key, size)
+        return size
+
+    def _chunk_size(self, style: ParamStyleType, inject_columns: bool) -> int:
+        width = len(self.columns)
+        offset = 0 if inject_columns else width
+        size = (self.max_params - offset) // width
+        if size < 1:
+            raise TypeError(
+                f"A single row of {type(self).__name__} exceeds {self.max_params} parameters."
+            )
+        if self.max_bytes is None:
+            return size
+        # Measure the rendered rows until we run out of our budget.
+        head, _ = self._render_head(style, inject_columns)
+        tail = f"{self._render_tail()}\n{self.get_returning()}"
+        nbytes = len(head.encode()) + len(tail.encode())
+        for n in range(size):
+            row, _ = self._render_row(style, n, offset)
+            nbytes += len(row.encode()) + 4
+            if nbytes > self.max_bytes:
+                return max(n, 1)
+        return size
+
+    def _render_head(
+        self, style: ParamStyleType, inject_columns: bool
+    ) -> Tuple[str, List[str]]:
+        if inject_columns:
+            names, columns = [], ", ".join(self.columns)
+        else:
+            names = [f"col{x}" for x in self.columns]
+            columns = ", ".join(_placeholders(style, names))
+        return f"INSERT INTO\n  {self.table_name} ({columns})\nVALUES\n  ", names
+
+    def _render_row(
+        self, style: ParamStyleType, index: int, offset: int
+    ) -> Tuple[str, List[str]]:
+        width = len(self.columns)
+        names = [f"val{x}_{index}" for x in self.columns]
+        params = _placeholders(style, names, start=offset + (index * width) + 1)
+        return f"({', '.join(params)})", names
+
+    def _render_tail(self) -> str:
+        """Render any clause which follows the rows, before ``RETURNING``."""
+        return ""
+
+    def _shape(self, style: ParamStyleType, **options) -> Hashable:
+        return (
+            type(self),
+            self.table_name,
+            self.columns,
+            _returns_shape(self.returns),
+            self.max_params,
+            self.max_bytes,
+            options.get("inject_columns", False),
+            type(style),
+            style,
+        )
+
+    def _compile_chunk(
+        self, style: ParamStyleType, nrows: int, inject_columns: bool
+    ) -> CompiledSQL:
+        key = self._shape(style, inject_columns=inject_columns) + (nrows,)
+        compiled = STATEMENT_CACHE.get(key)
+        if compiled is None:
+            offset = 0 if inject_columns else len(self.columns)
+            head, names = self._render_head(style, inject_columns)
+            rows = []
+            for index in range(nrows):
+                row, row_names = self._render_row(style, index, offset)
+                rows.append(row)
+                names.extend(row_names)
+            rows = ",\n  ".join(rows)
+            compiled = CompiledSQL(
+                f"{head}{rows}{self._render_tail()}\n{self.get_returning()}",
+                tuple(names),
+            )
+            STATEMENT_CACHE.put(key, compiled)
+        return compiled
+
+    def iter_sql(
+        self, style: ParamStyleType = DEFAULT_PARAM_STYLE, inject_columns: bool = False
+    ) -> Iterator[Tuple[str, Union[List, Dict]]]:
+        """Lazily generate the SQL INSERT statements and the arguments for each.
+
+        Parameters
+        --------
+        style : defaults :class:`NumParamStyle.NUM`
+            The DBAPI 2.0 param-style.
+        inject_columns: defaults False
+            Inject the column names directly, rather than rely on DBAPI formatting.
+            This is necessary for some client, such as ``asyncpg``.
+
+        Yields
+        ------
+        The generated SQL INSERT statement for a chunk of rows
+        The arguments to pass to the DB client for secure formatting.
+        """
+        size = self.chunk_size(style, inject_columns=inject_columns)
+        head = [] if inject_columns else list(self.columns)
+        nrows = self._nrows()
+        for start in range(0, nrows, size):
+            began = instrument.clock() if instrument.SINKS else None
+            stop = min(start + size, nrows)
+            compiled = self._compile_chunk(style, stop - start, inject_columns)
+            args = head + self._chunk_values(start, stop)
+            if began is not None:
+                instrument.emit(type(self).__name__, began, len(args), compiled.sql)
+            if style in NameParamStyle:
+                args = dict(zip(compiled.names, args))
+            yield compiled.sql, args
+
+    def to_sql(
+        self, style: ParamStyleType = DEFAULT_PARAM_STYLE, inject_columns: bool = False
+    ) -> List[Tuple[str, Union[List, Dict]]]:
+        """Build the SQL INSERT statements and format the arguments for each.
+
+        See Also
+        --------
+        :meth:`InsertMany.iter_sql`
+        """
+        return list(self.iter_sql(style, inject_columns))
+
+
+class UpdatePolicy(_StrEnum):
+    """What an :class:`Upsert` does with the columns of a row which already exists."""
+
+    #: Update every column which isn't part of the conflict target.
+    ALL = "all"
+    #: Leave the existing row as-is.
+    NOTHING = "nothing"
+
+
+@dataclasses.dataclass
+class Upsert(InsertMany):
+    """A multi-row SQL INSERT which updates the rows which already exist.
+
+    Postgres and SQLite (3.24+) get ``ON CONFLICT (...) DO UPDATE``/``DO NOTHING``;
+    MySQL gets ``ON DUPLICATE KEY UPDATE``, which ignores ``conflict`` and uses
+    whichever unique key is violated. ``update`` may be an :class:`UpdatePolicy` or
+    the names of the columns to update.
+
+    Rows are chunked like :class:`InsertMany`. Postgres can't update the same row
+    twice in one statement, so a chunk mustn't contain duplicate conflict keys.
+
+    Examples
+    --------
+    >>> upsert = Upsert.from_records(
+    ...     "foo", [{"id": 1, "bar": "a"}, {"id": 2, "bar": "b"}], conflict=["id"]
+    ... )
+    >>> [(sql, args)] = upsert.to_sql(inject_columns=True)
+    >>> print(sql)
+    INSERT INTO
+      foo (id, bar)
+    VALUES
+      (:1, :2),
+      (:3, :4)
+    ON CONFLICT (id) DO UPDATE SET
+      bar = EXCLUDED.bar
+    <BLANKLINE>
+    """
+
+    conflict: Tuple[str, ...] = ()
+    update: Union[UpdatePolicy, Tuple[str, ...]] = UpdatePolicy.ALL
+
+    def __post_init__(self):
+        super().__post_init__()
+        self.conflict = tuple(self.conflict)
+        if not isinstance(self.update, UpdatePolicy):
+            update = self.update
+            self.update = (update,) if isinstance(update, str) else tuple(update)
+        name = type(self).__name__
+        try:
+            assert set(self.conflict) <= set(
+                self.columns
+            ), f"{name}.conflict must only name inserted columns."
+            if self.update is UpdatePolicy.ALL:
+                assert (
+                    self.update_columns()
+                ), f"{name} has no columns to update outside of the conflict target."
+            elif self.update is not UpdatePolicy.NOTHING:
+                assert self.update and set(self.update) <= set(
+                    self.columns
+                ), f"{name}.update must only name inserted columns."
+            if self.dialect is Dialect.MYSQL:
+                assert not self.returns, f"{name} can't use RETURNING with MySQL."
+            elif self.update is not UpdatePolicy.NOTHING:
+                assert (
+                    self.conflict
+                ), f"{name}.conflict is required to update on {self.dialect!r}."
+        except AssertionError as err:
+            raise TypeError(err)
+
+    @classmethod
+    def from_insert(cls, insert: Insert, **kwargs) -> Upsert:
+        """Build a single-row :class:`Upsert` from an :class:`Insert`.
+
+        Parameters
+        ----------
+        insert
+            The statement to convert.
+        **kwargs
+            Any other attributes of :class:`Upsert`, e.g. ``conflict``, ``dialect``.
+        """
+        return cls(
+            insert.table,
+            schema=insert.schema,
+            columns=insert.fields.fields(),
+            rows=[insert.fields.values()],
+            returns=insert.returns,
+            **kwargs,
+        )
+
+    def update_columns(self) -> Tuple[str, ...]:
+        """The columns to update when a row already exists."""
+        if self.update is UpdatePolicy.NOTHING:
+            return ()
+        if self.update is UpdatePolicy.ALL:
+            return tuple(x for x in self.columns if x not in self.conflict)
+        return self.update
+
+    def _render_tail(self) -> str:
+        columns = self.update_columns()
+        if self.dialect is Dialect.MYSQL:
+            if not columns:
+                # Assigning a key to itself is a no-op which keeps the existing row.
+                key = (self.conflict or self.columns)[0]
+                return f"\nON DUPLICATE KEY UPDATE\n  {key} = {key}"
+            updates = ",\n  ".join([f"{x} = VALUES({x})" for x in columns])
+            return f"\nON DUPLICATE KEY UPDATE\n  {updates}"
+        target = f" ({', '.join(self.conflict)})" if self.conflict else ""
+        if not columns:
+            return f"\nON CONFLICT{target} DO NOTHING"
+        updates = ",\n  ".join([f"{x} = EXCLUDED.{x}" for x in columns])
+        return f"\nON CONFLICT{target} DO UPDATE SET\n  {updates}"
+
+    def _shape(self, style: ParamStyleType, **options) -> Hashable:
+        return super()._shape(style, **options) + (
+            self.dialect,
+            self.conflict,
+            self.update,
+        )
+
+
+@dataclasses.dataclass
+class BulkUpdate(BaseSQLStatement):
+    """A single-table SQL UPDATE of many rows, each with its own values.
+
+    Each row is matched by its ``keys`` and its other columns are set. Postgres and
+    SQLite (3.33+) join the table to the rows with ``UPDATE ... FROM (VALUES ...)``.
+    MySQL and legacy SQLite, which can't, set each column with a ``CASE`` of the keys.
+    Like :class:`InsertMany`, the rows are split into as few statements as the
+    parameter limit allows.
+
+    For Postgres, the values of a ``VALUES`` list are untyped, so a client which
+    sends parameters separately (e.g. ``asyncpg``) needs the ``types`` of any column
+    which isn't text. The first row is cast to them, which types the whole list.
+    Both the table and ``v`` have the key columns, so qualify a ``returns`` field
+    which names one, e.g. ``Field("foo.id")``.
+
+    Examples
+    --------
+    >>> update = BulkUpdate(
+    ...     "foo", columns=("id", "bar"), rows=[(1, "a"), (2, "b")], keys=("id",)
+    ... )
+    >>> [(sql, args)] = update.to_sql()
+    >>> print(sql)
+    UPDATE
+      foo
+    SET
+      bar = v.bar
+    FROM (VALUES
+      (:1, :2),
+      (:3, :4)
+    ) AS v (id, bar)
+    WHERE
+      foo.id = v.id
+    <BLANKLINE>
+    >>> args
+    [1, 'a', 2, 'b']
+    >>> update.dialect = Dialect.MYSQL
+    >>> [(sql, args)] = update.to_sql(BasicParamStyle.FM)
+    >>> print(sql)
+    UPDATE
+      foo
+    SET
+      bar = CASE
+        WHEN id = %s THEN %s
+        WHEN id = %s THEN %s
+        ELSE bar
+      END
+    WHERE
+      id IN (%s, %s)
+    <BLANKLINE>
+    >>> args
+    [1, 'a', 2, 'b', 1, 2]
+    """
+
+    table: str
+    schema: str = None
+    columns: Tuple[str, ...] = ()
+    rows: List[Tuple[Any, ...]] = dataclasses.field(default_factory=list)
+    keys: Tuple[str, ...] = ()
+    returns: Field = None
+    dialect: Dialect = DEFAULT_DIALECT
+    max_params: int = None
+    #: The Postgres type of a column, e.g. ``{"id": "int"}``. See above.
+    types: Mapping[str, str] = dataclasses.field(default_factory=dict)
+
+    def __post_init__(self):
+        super().__post_init__()
+        self.columns, self.keys = tuple(self.columns), tuple(self.keys)
+        if self.max_params is None:
+            self.max_params = PARAM_LIMITS[self.dialect]
+        name = type(self).__name__
+        try:
+            assert self.columns, f"{name}.columns must not be empty."
+            assert all(
+                len(x) == len(self.columns) for x in self.rows
+            ), f"{name}.rows must all have one value per column."
+            assert self.keys and set(self.keys) <= set(
+                self.columns
+            ), f"{name}.keys must name at least one of its columns."
+            assert self.update_columns(), f"{name} has no columns to update."
+            assert set(self.types) <= set(
+                self.columns
+            ), f"{name}.types must only name its columns."
+            assert not (
+                self.returns and self.dialect is Dialect.MYSQL
+            ), f"{name} can't use RETURNING with MySQL."
+        except AssertionError as err:
+            raise TypeError(err)
+
+    @classmethod
+    def from_records(
+        cls,
+        table: str,
+        records: Iterable["FieldDataType"],
+        *,
+        keys: Sequence[str],
+        exclude: Any = Nothing,
+        **kwargs,
+    ) -> BulkUpdate:
+        """Build a :class:`BulkUpdate` from any records accepted by :func:`data_to_fields`.
+
+        See Also
+        --------
+        :meth:`InsertMany.from_records`
+        """
+        insert = InsertMany.from_records(table, records, exclude=exclude)
+        return cls(table, columns=insert.columns, rows=insert.rows, keys=keys, **kwargs)
+
+    def update_columns(self) -> Tuple[str, ...]:
+        """The columns which are set, i.e. every column which isn't a key."""
+        return tuple(x for x in self.columns if x not in self.keys)
+
+    def get_returning(self) -> str:
+        return f"RETURNING {self.returns.for_fetch()}" if self.returns else ""
+
+    @property
+    def from_values(self) -> bool:
+        """Whether this dialect supports ``UPDATE ... FROM (VALUES ...)``."""
+        return self.dialect in (Dialect.POSTGRES, Dialect.SQLITE)
+
+    def chunk_size(self, style: ParamStyleType = DEFAULT_PARAM_STYLE) -> int:
+        """The maximum number of rows which may be rendered in a single statement."""
+        width = len(self.columns)
+        if not self.from_values and style in BasicParamStyle:
+            # The keys of a row are bound once per CASE, and again in the WHERE.
+            nkeys = len(self.keys)
+            width = (width - nkeys) * (nkeys + 1) + nkeys
+        size = self.max_params // width
+        if size < 1:
+            raise TypeError(
+                f"A single row of {type(self).__name__} exceeds {self.max_params} parameters."
+            )
+        return size
+
+    def _shape(self, style: ParamStyleType, **options) -> Hashable:
+        return (
+            type(self),
+            self.table_name,
+            self.columns,
+            self.keys,
+            self.dialect,
+            tuple(sorted(self.types.items())),
+            _returns_shape(self.returns),
+            self.max_params,
+            type(style),
+            style,
+        )
+
+    def _compile_chunk(
+        self, style: ParamStyleType, nrows: int
+    ) -> Tuple[CompiledSQL, Tuple[Tuple[int, int], ...]]:
+        """Get the SQL for ``nrows`` rows, and the (row, column) bound to each param."""
+        key = self._shape(style) + (nrows,)
+        compiled = STATEMENT_CACHE.get(key)
+        if compiled is None:
+            compiled = self._render_chunk(style, nrows)
+            STATEMENT_CACHE.put(key, compiled)
+        return compiled
+
+    def _render_chunk(
+        self, style: ParamStyleType, nrows: int
+    ) -> Tuple[CompiledSQL, Tuple[Tuple[int, int], ...]]:
+        names: List[str] = []
+        slots: List[Tuple[int, int]] = []
+        placeholders: Dict[Tuple[int, int], str] = {}
+        # Only ``?`` and ``%s`` can't refer to the same param more than once.
+        reuse = style not in BasicParamStyle
+        columns = self.columns
+
+        def param(row: int, column: int) -> str:
+            slot = (row, column)
+            if reuse and slot in placeholders:
+                return placeholders[slot]
+            name = f"{columns[column]}_{row}"
+            names.append(name)
+            slots.append(slot)
+            if style in NameParamStyle:
+                placeholder = style.format(name)
+            elif style in NumParamStyle:
+                placeholder = style.format(len(names))
+            else:
+                placeholder = f"{style}"
+            placeholders[slot] = placeholder
+            return placeholder
+
+        table = self.table_name
+        keys = [columns.index(x) for x in self.keys]
+        updates = [columns.index(x) for x in self.update_columns()]
+        if self.from_values:
+            # SQLite can't name the columns of a sub-query, which are column1, ...
+            postgres = self.dialect is Dialect.POSTGRES
+            refs = [x if postgres else f"column{i + 1}" for i, x in enumerate(columns)]
+            sets = ",\n  ".join([f"{columns[x]} = v.{refs[x]}" for x in updates])
+            types = [self.types.get(x) for x in columns]
+            rows = []
+            for row in range(nrows):
+                values = []
+                for column, kind in enumerate(types):
+                    placeholder = param(row, column)
+                    if kind and row == 0:
+                        placeholder = f"CAST({placeholder} AS {kind})"
+                    values.append(placeholder)
+                rows.append(f"({', '.join(values)})")
+            rows = ",\n  ".join(rows)
+            alias = f" ({', '.join(columns)})" if postgres else ""
+            where = " AND\n  ".join(
+                [f"{table}.{columns[x]} = v.{refs[x]}" for x in keys]
+            )
+            sql = (
+                f"UPDATE\n  {table}\nSET\n  {sets}\n"
+                f"FROM (VALUES\n  {rows}\n) AS v{alias}\nWHERE\n  {where}"
+            )
+        else:
+
+            def match(row: int) -> str:
+                return " AND ".join([f"{columns[x]} = {param(row, x)}" for x in keys])
+
+            sets = []
+            for column in updates:
+                whens = [
+                    f"WHEN {match(row)} THEN {param(row, column)}"
+                    for row in range(nrows)
+                ]
+                whens = "\n    ".join(whens)
+                name = columns[column]
+                sets.append(f"{name} = CASE\n    {whens}\n    ELSE {name}\n  END")
+            sets = ",\n  ".join(sets)
+            if len(keys) == 1:
+                (key,) = keys
+                matches = ", ".join([param(x, key) for x in range(nrows)])
+                where = f"{columns[key]} IN ({matches})"
+            else:
+                where = " OR\n  ".join([f"({match(x)})" for x in range(nrows)])
+            sql = f"UPDATE\n  {table}\nSET\n  {sets}\nWHERE\n  {where}"
+        sql = f"{sql}\n{self.get_returning()}"
+        return CompiledSQL(sql, tuple(names)), tuple(slots)
+
+    def iter_sql(
+        self, style: ParamStyleType = DEFAULT_PARAM_STYLE
+    ) -> Iterator[Tuple[str, Union[List, Dict]]]:
+        """Lazily generate the SQL UPDATE statements and the arguments for each.
+
+        Parameters
+        --------
+        style : defaults :class:`NumParamStyle.NUM`
+            The DBAPI 2.0 param-style.
+
+        Yields
+        ------
+        The generated SQL UPDATE statement for a chunk of rows
+        The arguments to pass to the DB client for secure formatting.
+        """
+        size = self.chunk_size(style)
+        nrows = len(self.rows)
+        for start in range(0, nrows, size):
+            began = instrument.clock() if instrument.SINKS else None
+            rows = self.rows[start : start + size]
+            compiled, slots = self._compile_chunk(style, len(rows))
+            args = [rows[x][y] for x, y in slots]
+            if began is not None:
+                instrument.emit(type(self).__name__, began, len(args), compiled.sql)
+            if style in NameParamStyle:
+                args = dict(zip(compiled.names, args))
+            yield compiled.sql, args
+
+    def to_sql(
+        self, style: ParamStyleType = DEFAULT_PARAM_STYLE
+    ) -> List[Tuple[str, Union[List, Dict]]]:
+        """Build the SQL UPDATE statements and format the arguments for each.
+
+        See Also
+        --------
+        :meth:`BulkUpdate.iter_sql`
+        """
+        return list(self.iter_sql(style))
 
 
 @dataclasses.dataclass
@@ -570,22 +2113,103 @@ class Delete(BaseSQLStatement):
         The generated SQL DELETE statement
         The arguments to pass to the DB client for secure formatting.
         """
-        where, args = self.filters.to_sql(style=style)
-        returning = self.get_returning()
+        return self._to_sql(style)
+
+    def _shape(self, style: ParamStyleType, **options) -> Hashable:
         return (
-            f"DELETE FROM\n  {self.table_name}\n{where}\n{returning}",
-            args.for_sql(style),
+            type(self),
+            self.table_name,
+            self.filters.shape(),
+            _returns_shape(self.returns),
+            type(style),
+            style,
         )
 
+    def _values(self, **options) -> List[Any]:
+        return self.filters.values()
+
+    def _write(self, compiler: _Compiler, **options):
+        compiler.write("DELETE FROM\n  ", self.table_name, "\n")
+        self.filters._write(compiler)
+        compiler.write("\n", self.get_returning())
+
 
 FieldDataType = NewType(
     "FieldDataType", Union[Dict, Collection[Tuple[Hashable, Any]], NamedTuple, Type]
 )
 
 
+def _intern(name: Any) -> Any:
+    # Rows share their column names, so don't keep a copy of each name per row.
+    return sys.intern(name) if type(name) is str else name
+
+
+def _pairs_to_fields(pairs: Iterable[Tuple[Any, Any]], exclude: Any) -> FieldList:
+    """Build a :class:`FieldList`, dropping any values which match ``exclude``."""
+    if exclude is Nothing:
+        return FieldList([Field(x, y) for x, y in pairs])
+    if isinstance(exclude, type):
+        return FieldList([Field(x, y) for x, y in pairs if not isinstance(y, exclude)])
+    return FieldList([Field(x, y) for x, y in pairs if (y == exclude) is False])
+
+
+Extractor = Callable[[Any, Any], FieldList]
+
+#: The cache of compiled extractors for dataclass and NamedTuple types.
+_EXTRACTORS: Dict[Type, Extractor] = {}
+
+
+def _build_extractor(cls: Type) -> Extractor:
+    """Build a function which reads the fields of an instance of ``cls`` directly."""
+    if issubclass(cls, tuple):
+        # A NamedTuple is already an ordered tuple of its values.
+        names = tuple(_intern(x) for x in cls._fields)
+
+        def extract(data: Any, exclude: Any) -> FieldList:
+            return _pairs_to_fields(zip(names, data), exclude)
+
+    else:
+        names = tuple(_intern(x.name) for x in dataclasses.fields(cls))
+        getter = operator.attrgetter(*names)
+        if len(names) == 1:
+
+            def extract(data: Any, exclude: Any) -> FieldList:
+                return _pairs_to_fields(((names[0], getter(data)),), exclude)
+
+        else:
+
+            def extract(data: Any, exclude: Any) -> FieldList:
+                return _pairs_to_fields(zip(names, getter(data)), exclude)
+
+    return extract
+
+
+def get_extractor(cls: Type) -> Optional[Extractor]:
+    """Get the cached extractor for a dataclass or NamedTuple type, building it if necessary.
+
+    The extractor reads the attributes of an instance directly - nested values are
+    neither copied nor converted.
+
+    Returns
+    -------
+    A function which accepts an instance of ``cls`` and an ``exclude`` rule and returns a
+    :class:`FieldList`, or ``None`` if ``cls`` isn't a dataclass or NamedTuple.
+    """
+    extractor = _EXTRACTORS.get(cls)
+    if extractor is None:
+        is_namedtuple = issubclass(cls, tuple) and hasattr(cls, "_fields")
+        if not (is_namedtuple or dataclasses.is_dataclass(cls)):
+            return None
+        extractor = _EXTRACTORS.setdefault(cls, _build_extractor(cls))
+    return extractor
+
+
 def data_to_fields(data: FieldDataType, exclude: Any = Nothing) -> FieldList:
     """Convert a dataclass, NamedTuple, dict, or array of tuples to a FieldList.
 
+    Dataclasses and NamedTuples are read with an extractor which is compiled once
+    for each type (see :func:`get_extractor`). Nested values are used as-is.
+
     Parameters
     --------
     data
@@ -593,21 +2217,183 @@ def data_to_fields(data: FieldDataType, exclude: Any = Nothing) -> FieldList:
     exclude
         Any value or type which you wish to exclude
     """
+    if instrument.SINKS:
+        start = instrument.clock()
+        fields = _data_to_fields(data, exclude)
+        instrument.emit(data_to_fields.__name__, start, len(fields))
+        return fields
+    return _data_to_fields(data, exclude)
+
+
+def _data_to_fields(data: FieldDataType, exclude: Any) -> FieldList:
     if data:
-        dict_factory = DictFactory(exclude=exclude)
-        if dataclasses.is_dataclass(data):
-            data = dataclasses.asdict(data, dict_factory=dict_factory)
-        elif isnamedtuple(data):
-            data = dict_factory(data._asdict())
-        elif isinstance(data, Mapping) or (
+        extractor = _EXTRACTORS.get(type(data))
+        if extractor is None and not isinstance(data, type):
+            extractor = get_extractor(type(data))
+        if extractor is not None:
+            return extractor(data, exclude)
+        if not isinstance(data, Mapping) and (
             isinstance(data, Collection)
             and all((isinstance(x, Tuple) and len(x) == 2) for x in data)
         ):
-            data = dict_factory(data)
-        if isinstance(data, dict):
-            return FieldList([Field(x, y) for x, y in data.items()])
+            data = dict(data)
+        if isinstance(data, Mapping):
+            return _pairs_to_fields(
+                zip(map(_intern, data.keys()), data.values()), exclude
+            )
 
     raise TypeError(
         "Data must not be empty and be of type dataclass, namedtuple, mapping, "
         f"or collection of tuples whose len is 2. Provided {type(data)}: {data}"
     )
+
+
+class Decoder(NamedTuple):
+    """Decode result rows into instances of a dataclass or NamedTuple.
+
+    See Also
+    --------
+    :func:`get_decoder`
+    """
+
+    cls: Type
+    columns: Tuple[str, ...]
+    decode: Callable[[Sequence], Any]
+    decode_many: Callable[[Iterable[Sequence]], List[Any]]
+
+
+#: The cache of compiled decoders, by type and result columns.
+_DECODERS: Dict[Tuple[Type, Tuple[str, ...]], Decoder] = {}
+
+
+def _label(field: Union[Field, str]) -> str:
+    """The name of the result column for a field (see :meth:`Field.for_fetch`)."""
+    if isinstance(field, Field):
+        field = (
+            field.value if (field.value and field.name) else (field.name or field.value)
+        )
+    # A qualified column (``table.column``) is labeled by the column name alone.
+    return str(field).rpartition(".")[2]
+
+
+def _parameters(cls: Type) -> List[Tuple[str, bool]]:
+    """The name of each constructor parameter of ``cls``, and whether it's optional."""
+    if issubclass(cls, tuple):
+        defaults = cls._field_defaults
+        return [(x, x in defaults) for x in cls._fields]
+    missing = dataclasses.MISSING
+    return [
+        (x.name, x.default is not missing or x.default_factory is not missing)
+        for x in dataclasses.fields(cls)
+        if x.init
+    ]
+
+
+def _build_decoder(cls: Type, columns: Tuple[str, ...]) -> Decoder:
+    """Build the functions which construct an instance of ``cls`` from a row."""
+    index: Dict[str, int] = {}
+    for position, column in enumerate(columns):
+        index.setdefault(column, position)
+    parameters = _parameters(cls)
+    missing = [x for x, optional in parameters if x not in index and not optional]
+    if missing:
+        raise TypeError(
+            f"Can't decode rows into {cls.__name__}: the columns {columns} are "
+            f"missing required attributes {missing}."
+        )
+    names = tuple(x for x, _ in parameters if x in index)
+    indices = [index[x] for x in names]
+    # Positional arguments work if every parameter before the last one we have is
+    # in the row. Any others are left to their defaults.
+    positional = names == tuple(x for x, _ in parameters[: len(names)])
+
+    if positional and indices == list(range(len(columns))):
+        # The row is already the arguments, in order.
+        if issubclass(cls, tuple) and len(columns) == len(parameters):
+            # Skip the length check of ``cls._make``, the columns have been checked.
+            make = functools.partial(tuple.__new__, cls)
+            return Decoder(cls, columns, make, lambda rows: list(map(make, rows)))
+        return Decoder(
+            cls,
+            columns,
+            lambda row: cls(*row),
+            lambda rows: list(itertools.starmap(cls, rows)),
+        )
+
+    if len(indices) == 1:
+        position = indices[0]
+
+        def getter(row: Sequence) -> Tuple:
+            return (row[position],)
+
+    else:
+        getter = operator.itemgetter(*indices) if indices else lambda row: ()
+
+    if positional:
+        return Decoder(
+            cls,
+            columns,
+            lambda row: cls(*getter(row)),
+            lambda rows: list(itertools.starmap(cls, map(getter, rows))),
+        )
+
+    def decode(row: Sequence) -> Any:
+        return cls(**dict(zip(names, getter(row))))
+
+    return Decoder(cls, columns, decode, lambda rows: list(map(decode, rows)))
+
+
+def get_decoder(cls: Type, fields: Iterable[Union[Field, str]]) -> Decoder:
+    """Get the cached decoder from result rows to a dataclass or NamedTuple type.
+
+    The columns of each row are mapped to the attributes of ``cls`` by name once, when
+    the decoder is built. Each row is then passed straight to the constructor, without
+    building an intermediate dict, unless an attribute with a default falls between
+    those in the row (e.g. the columns are ``a`` and ``c`` for attributes ``a``, ``b=1``
+    and ``c``). Columns without a matching attribute are ignored.
+
+    Parameters
+    ----------
+    cls
+        A dataclass or NamedTuple type.
+    fields
+        The fields of the :class:`Select` (or ``RETURNING`` clause) which produced
+        the rows. An alias (``Field("name", "alias")``) names its column by the alias.
+        The column names may also be given directly, e.g. from ``cursor.description``.
+
+    Examples
+    --------
+    >>> @dataclasses.dataclass
+    ... class Foo:
+    ...     id: int
+    ...     name: str
+    ...
+    >>> decoder = get_decoder(Foo, [Field("name"), Field("foo_id", "id")])
+    >>> decoder.decode(("bar", 1))
+    Foo(id=1, name='bar')
+    >>> decoder.decode_many([("bar", 1), ("baz", 2)])
+    [Foo(id=1, name='bar'), Foo(id=2, name='baz')]
+
+    Raises
+    ------
+    TypeError
+        If ``cls`` isn't a dataclass or NamedTuple, ``fields`` is empty (e.g. for
+        ``SELECT *``) or the rows are missing a required attribute.
+    """
+    columns = tuple(_label(x) for x in fields)
+    key = (cls, columns)
+    decoder = _DECODERS.get(key)
+    if decoder is None:
+        try:
+            assert isinstance(cls, type) and (
+                (issubclass(cls, tuple) and hasattr(cls, "_fields"))
+                or dataclasses.is_dataclass(cls)
+            ), f"Rows may only be decoded into a dataclass or NamedTuple. Provided {cls}."
+            assert columns, (
+                "The result columns must be known to decode rows. "
+                "Provide the column names for a SELECT *."
+            )
+        except AssertionError as err:
+            raise TypeError(err)
+        decoder = _DECODERS.setdefault(key, _build_decoder(cls, columns))
+    return decoder
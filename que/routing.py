@@ -0,0 +1,270 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+import contextlib
+import itertools
+import threading
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from .query import BaseSQLStatement, Keyset, Select, _StrEnum
+
+
+class Access(_StrEnum):
+    """Whether a statement only reads, or may write."""
+
+    READ = "read"
+    WRITE = "write"
+
+
+class Route(NamedTuple):
+    """The classification of a statement, for routing.
+
+    ``table`` is ``None`` if it isn't known, e.g. for raw SQL.
+    """
+
+    access: Access
+    table: Optional[str]
+    returns: bool
+    session: Hashable = None
+
+
+def classify(statement: Any, session: Hashable = None) -> Route:
+    """Classify a statement as a read or a write, without parsing any SQL.
+
+    A :class:`que.Select` or :class:`que.Keyset` is a read. Every other statement
+    (``Insert``, ``Update``, ``Delete``, ``Copy``, ...) is a write, as is raw SQL,
+    since it can't be known to be safe for a replica.
+
+    Examples
+    --------
+    >>> import que
+    >>> classify(que.Select("foo"))
+    Route(access=<Access.READ: 'read'>, table='foo', returns=True, session=None)
+    >>> classify(que.Delete("foo", schema="bar", returns=que.Field("id")))
+    Route(access=<Access.WRITE: 'write'>, table='bar.foo', returns=True, session=None)
+    >>> classify("VACUUM").access
+    <Access.WRITE: 'write'>
+    """
+    if isinstance(statement, Keyset):
+        statement = statement.select
+    if isinstance(statement, Select):
+        return Route(Access.READ, statement.table_name, True, session)
+    if isinstance(statement, BaseSQLStatement):
+        returns = bool(getattr(statement, "returns", None))
+        return Route(Access.WRITE, statement.table_name, returns, session)
+    return Route(Access.WRITE, None, False, session)
+
+
+class Policy:
+    """Choose which replica serves a read.
+
+    :meth:`Policy.observe` is called for every statement routed, including writes,
+    then :meth:`Policy.choose` for each read, if there are any replicas.
+    """
+
+    def observe(self, route: Route) -> None:
+        """Record a statement as it's routed."""
+
+    def choose(self, route: Route, outstanding: Sequence[int]) -> Optional[int]:
+        """Get the index of the replica to read from, or ``None`` for the primary.
+
+        Parameters
+        ----------
+        route
+            The classification of the statement.
+        outstanding
+            The number of statements which each replica is currently running.
+        """
+        raise NotImplementedError
+
+
+class RoundRobin(Policy):
+    """Read from each replica in turn."""
+
+    def __init__(self):
+        self._counter = itertools.count()
+
+    def choose(self, route: Route, outstanding: Sequence[int]) -> Optional[int]:
+        return next(self._counter) % len(outstanding)
+
+
+class LeastOutstanding(Policy):
+    """Read from the replica running the fewest statements.
+
+    Ties are broken in turn, so idle replicas share the load evenly.
+    """
+
+    def __init__(self):
+        self._counter = itertools.count()
+
+    def choose(self, route: Route, outstanding: Sequence[int]) -> Optional[int]:
+        size = len(outstanding)
+        start = next(self._counter) % size
+        return min(
+            ((start + x) % size for x in range(size)), key=outstanding.__getitem__
+        )
+
+
+class ReadYourWrites(Policy):
+    """Read from the primary for a while after a write to the same table.
+
+    Replicas lag the primary, so a read which follows a write may not see it. For
+    ``window`` seconds after a write, reads of that table (by the same ``session``)
+    are sent to the primary. A write to an unknown table (i.e. raw SQL) sends all of
+    the session's reads to the primary. Other reads are left to ``policy``.
+
+    Parameters
+    ----------
+    policy : defaults :class:`RoundRobin`
+        The policy for reads which may go to a replica.
+    window : defaults 1.0
+        How long to read from the primary after a write, in seconds.
+    clock : defaults :func:`time.monotonic`
+        The clock, in seconds.
+    """
+
+    def __init__(
+        self,
+        policy: Policy = None,
+        *,
+        window: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.policy = RoundRobin() if policy is None else policy
+        self.window = window
+        self.clock = clock
+        self._written: Dict[Tuple[Hashable, Optional[str]], float] = {}
+
+    def observe(self, route: Route) -> None:
+        self.policy.observe(route)
+        if route.access is Access.WRITE:
+            now = self.clock()
+            self._written[(route.session, route.table)] = now + self.window
+            if len(self._written) > 1024:
+                # Don't hold on to every table and session ever written.
+                self._written = {k: v for k, v in self._written.items() if v > now}
+
+    def _recent(self, key: Tuple[Hashable, Optional[str]], now: float) -> bool:
+        deadline = self._written.get(key)
+        return deadline is not None and deadline > now
+
+    def choose(self, route: Route, outstanding: Sequence[int]) -> Optional[int]:
+        now = self.clock()
+        if self._recent((route.session, route.table), now) or self._recent(
+            (route.session, None), now
+        ):
+            return None
+        return self.policy.choose(route, outstanding)
+
+
+class Router:
+    """Send writes to a primary and spread reads over replicas.
+
+    The primary and replicas may be anything: connections, pools, or executors.
+    :meth:`Router.route` only picks one. :meth:`Router.checkout` also counts the
+    statements each replica is running, for :class:`LeastOutstanding`. The
+    ``execute``, ``fetch`` and ``executemany`` coroutines dispatch to targets with
+    the same coroutines, e.g. :class:`que.aio.ThreadedExecutor`.
+
+    Parameters
+    ----------
+    primary
+        The target for writes, and any reads the policy doesn't send to a replica.
+    replicas : optional
+        The targets for reads.
+    policy : defaults :class:`RoundRobin`
+        The policy which picks the replica for each read.
+
+    Examples
+    --------
+    >>> import que
+    >>> router = Router("primary", ["replica-1", "replica-2"])
+    >>> [router.route(que.Select("foo")) for _ in range(3)]
+    ['replica-1', 'replica-2', 'replica-1']
+    >>> router.route(que.Update("foo", fields=[que.Field("bar", 1)]))
+    'primary'
+    """
+
+    def __init__(
+        self, primary: Any, replicas: Iterable[Any] = (), policy: Policy = None
+    ):
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.policy = RoundRobin() if policy is None else policy
+        self._outstanding: List[int] = [0] * len(self.replicas)
+        self._lock = threading.Lock()
+
+    @property
+    def outstanding(self) -> Tuple[int, ...]:
+        """The number of statements each replica is running."""
+        return tuple(self._outstanding)
+
+    def _choose(self, statement: Any, session: Hashable) -> Optional[int]:
+        route = classify(statement, session)
+        self.policy.observe(route)
+        if route.access is Access.WRITE or not self.replicas:
+            return None
+        return self.policy.choose(route, self._outstanding)
+
+    def route(self, statement: Any, *, session: Hashable = None) -> Any:
+        """Get the target for a statement.
+
+        Parameters
+        ----------
+        statement
+            A que statement, or raw SQL.
+        session : optional
+            Any key for the caller, e.g. a user or request ID, for policies which
+            track callers (see :class:`ReadYourWrites`).
+        """
+        with self._lock:
+            index = self._choose(statement, session)
+        return self.primary if index is None else self.replicas[index]
+
+    @contextlib.contextmanager
+    def checkout(self, statement: Any, *, session: Hashable = None) -> Iterator[Any]:
+        """Get the target for a statement, counting it as outstanding until exit."""
+        with self._lock:
+            index = self._choose(statement, session)
+            if index is not None:
+                self._outstanding[index] += 1
+        try:
+            yield self.primary if index is None else self.replicas[index]
+        finally:
+            if index is not None:
+                with self._lock:
+                    self._outstanding[index] -= 1
+
+    async def execute(self, statement: Any, *, session: Hashable = None, **options):
+        """Run a statement on its target's ``execute``."""
+        with self.checkout(statement, session=session) as target:
+            return await target.execute(statement, **options)
+
+    async def fetch(self, statement: Any, *, session: Hashable = None, **options):
+        """Run a statement on its target's ``fetch``."""
+        with self.checkout(statement, session=session) as target:
+            return await target.fetch(statement, **options)
+
+    async def executemany(
+        self,
+        statement: Any,
+        records: Iterable[Any],
+        *,
+        session: Hashable = None,
+        **options,
+    ):
+        """Run a write statement for many records on the primary's ``executemany``."""
+        with self.checkout(statement, session=session) as target:
+            return await target.executemany(statement, records, **options)
@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+from __future__ import annotations
+
+import dataclasses
+import time
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    TYPE_CHECKING,
+    Optional,
+    Union,
+)
+
+from .query import (
+    DEFAULT_DIALECT,
+    DEFAULT_PARAM_STYLE,
+    Dialect,
+    Insert,
+    InsertMany,
+    ParamStyleType,
+    Update,
+)
+
+if TYPE_CHECKING:  # asyncio is slow to import, and only needed by abatches.
+    import asyncio
+
+
+class Batch(NamedTuple):
+    """A ready-to-execute batch of records.
+
+    If ``many`` is ``True``, ``args`` is a list of arguments for ``executemany``,
+    otherwise ``args`` are the arguments for a single (multi-row) ``execute``.
+    """
+
+    sql: str
+    args: Union[List, Dict]
+    many: bool
+    size: int
+
+
+class _Raised(NamedTuple):
+    error: BaseException
+
+
+_DONE = object()
+
+
+@dataclasses.dataclass
+class StreamWriter:
+    """Render an unbounded stream of records as batches of SQL.
+
+    The ``statement`` is a template: its shape (table, columns, filters) is used for
+    every batch, while the values come from the records, which are looked up by
+    column name. Records may be a mapping, dataclass, NamedTuple or collection of
+    2-tuples.
+
+    Records are buffered until ``batch_size`` is reached or, if given,
+    ``flush_interval`` seconds have passed since the first record in the buffer.
+    Records are only pulled from the source as batches are consumed, so memory is
+    bounded by the batch size, not the size of the input.
+
+    Examples
+    --------
+    >>> import que
+    >>> insert = que.Insert("foo", fields=[que.Field("bar")])
+    >>> writer = StreamWriter(insert, batch_size=2, multirow=True)
+    >>> for batch in writer.batches({"bar": x} for x in range(3)):
+    ...     print(batch.args)
+    ['bar', 0, 1]
+    ['bar', 2]
+    """
+
+    statement: Union[Insert, Update]
+    batch_size: int = 1000
+    flush_interval: Optional[float] = None
+    style: ParamStyleType = DEFAULT_PARAM_STYLE
+    inject_columns: bool = False
+    #: Render an :class:`Insert` as multi-row INSERTs, rather than for executemany.
+    multirow: bool = False
+    dialect: Dialect = DEFAULT_DIALECT
+    #: The number of records an async source may read ahead. Defaults to batch_size.
+    max_pending: Optional[int] = None
+
+    def __post_init__(self):
+        try:
+            assert self.batch_size > 0, f"{type(self).__name__}.batch_size must be > 0."
+            assert not (
+                self.multirow and not isinstance(self.statement, Insert)
+            ), f"{type(self).__name__}.multirow is only supported for Insert."
+        except AssertionError as err:
+            raise TypeError(err)
+        if self.max_pending is None:
+            self.max_pending = self.batch_size
+
+    @property
+    def _options(self) -> Dict[str, Any]:
+        if isinstance(self.statement, Insert):
+            return {"inject_columns": self.inject_columns}
+        return {}
+
+    def render(self, records: List[Any]) -> Iterator[Batch]:
+        """Render a single buffer of records as one or more batches."""
+        if self.multirow:
+            insert: Insert = self.statement
+            getter = insert._record_getter(inject_columns=True)
+            many = InsertMany(
+                insert.table,
+                schema=insert.schema,
+                columns=insert.fields.fields(),
+                rows=[getter(x) for x in records],
+                returns=insert.returns,
+                dialect=self.dialect,
+            )
+            size = many.chunk_size(self.style, inject_columns=self.inject_columns)
+            remaining = len(records)
+            for sql, args in many.iter_sql(self.style, self.inject_columns):
+                yield Batch(sql, args, False, min(size, remaining))
+                remaining -= size
+            return
+        sql, args = self.statement.to_sql_many(records, self.style, **self._options)
+        yield Batch(sql, list(args), True, len(records))
+
+    def batches(self, records: Iterable[Any]) -> Iterator[Batch]:
+        """Lazily render an iterable of records as batches.
+
+        The ``flush_interval`` is checked as each record arrives.
+        """
+        buffer, deadline = [], None
+        interval = self.flush_interval
+        for record in records:
+            if not buffer and interval is not None:
+                deadline = time.monotonic() + interval
+            buffer.append(record)
+            if len(buffer) >= self.batch_size or (
+                deadline is not None and time.monotonic() >= deadline
+            ):
+                yield from self.render(buffer)
+                buffer = []
+        if buffer:
+            yield from self.render(buffer)
+
+    async def abatches(
+        self, records: Union[AsyncIterable[Any], Iterable[Any]]
+    ) -> AsyncIterator[Batch]:
+        """Lazily render an iterable or async iterable of records as batches.
+
+        The source is read by a background task into a queue of ``max_pending``
+        records. When the queue is full, the source is not read until batches are
+        consumed. A partial batch is emitted once ``flush_interval`` has passed, even
+        if no more records have arrived.
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=self.max_pending)
+        producer = loop.create_task(self._produce(records, queue))
+        buffer, deadline = [], None
+        interval = self.flush_interval
+        try:
+            while True:
+                timeout = None
+                if buffer and deadline is not None:
+                    timeout = max(deadline - loop.time(), 0)
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    for batch in self.render(buffer):
+                        yield batch
+                    buffer, deadline = [], None
+                    continue
+                if item is _DONE:
+                    break
+                if isinstance(item, _Raised):
+                    raise item.error
+                if not buffer and interval is not None:
+                    deadline = loop.time() + interval
+                buffer.append(item)
+                if len(buffer) >= self.batch_size:
+                    for batch in self.render(buffer):
+                        yield batch
+                    buffer, deadline = [], None
+            if buffer:
+                for batch in self.render(buffer):
+                    yield batch
+        finally:
+            producer.cancel()
+
+    @staticmethod
+    async def _produce(
+        records: Union[AsyncIterable[Any], Iterable[Any]], queue: asyncio.Queue
+    ):
+        try:
+            if hasattr(records, "__aiter__"):
+                async for record in records:
+                    await queue.put(record)
+            else:
+                for record in records:
+                    await queue.put(record)
+        except Exception as err:
+            await queue.put(_Raised(err))
+            return
+        await queue.put(_DONE)
@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 # -*- coding: UTF-8 -*-
+import dataclasses
 from functools import partial
-from typing import Dict, Any, Sequence, Optional, Union, Tuple, Hashable
+from typing import Dict, Any, Sequence, Optional, Union, Tuple, Hashable, Type
 
 
 class Nothing:
@@ -77,3 +78,43 @@ def isnamedtuple(x: Any) -> bool:
     False
     """
     return isinstance(x, tuple) and hasattr(x, "_fields") and hasattr(x, "_asdict")
+
+
+def slotted(cls: Type) -> Type:
+    """Re-create a dataclass with ``__slots__`` for its fields.
+
+    Instances of a slotted class have no ``__dict__``, which makes them significantly
+    smaller. This is equivalent to ``dataclass(slots=True)``, which is only available
+    from Python 3.10.
+
+    Examples
+    --------
+    >>> @slotted
+    ... @dataclasses.dataclass(frozen=True)
+    ... class Foo:
+    ...     bar: str = None
+    ...
+    >>> Foo("bar").__slots__
+    ('bar',)
+    >>> hasattr(Foo("bar"), "__dict__")
+    False
+    """
+    names = tuple(x.name for x in dataclasses.fields(cls))
+    namespace = dict(cls.__dict__)
+    namespace["__slots__"] = names
+    # Defaults are already part of the generated __init__.
+    for name in (*names, "__dict__", "__weakref__"):
+        namespace.pop(name, None)
+
+    if cls.__dataclass_params__.frozen:
+        # The default pickle protocol would use setattr, which frozen classes disallow.
+        def __getstate__(self):
+            return tuple(getattr(self, x) for x in names)
+
+        def __setstate__(self, state):
+            for name, value in zip(names, state):
+                object.__setattr__(self, name, value)
+
+        namespace.update(__getstate__=__getstate__, __setstate__=__setstate__)
+
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
@@ -0,0 +1,282 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+import asyncio
+import sqlite3
+
+import pytest
+
+import que
+from que.aio import NativeExecutor, SelectLoader, ThreadedExecutor
+
+#: A query which runs until it's interrupted.
+FOREVER = (
+    "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n) "
+    "SELECT max(x) FROM n"
+)
+
+
+@pytest.fixture
+def default_connect(tmp_path):
+    path = tmp_path / "que.db"
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE foo (id INTEGER PRIMARY KEY, name TEXT)")
+    connection.close()
+    opened = []
+
+    def connect():
+        connection = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        opened.append(connection)
+        return connection
+
+    connect.opened = opened
+    return connect
+
+
+@pytest.fixture
+def default_insert() -> que.Insert:
+    return que.Insert("foo", fields=[que.Field("id", 0), que.Field("name", "")])
+
+
+def records(n: int) -> list:
+    return [{"id": x, "name": str(x)} for x in range(n)]
+
+
+def test_threaded_end_to_end(default_connect, default_insert):
+    async def main():
+        async with ThreadedExecutor(default_connect, max_concurrency=2) as executor:
+            await executor.executemany(default_insert, records(3), inject_columns=True)
+            many = que.InsertMany("foo", columns=("id", "name"), rows=[(3, "3")])
+            await executor.execute(many, inject_columns=True)
+            select = que.Select("foo", filters=[que.Filter(que.Field("id", 1))])
+            rows = await asyncio.gather(*(executor.fetch(select) for _ in range(10)))
+            return executor.style, rows, await executor.fetch(que.Select("foo"))
+
+    style, rows, everything = asyncio.run(main())
+    assert style == que.BasicParamStyle.QM
+    assert rows == [[(1, "1")]] * 10
+    assert everything == [(0, "0"), (1, "1"), (2, "2"), (3, "3")]
+    assert 1 <= len(default_connect.opened) <= 2
+
+
+def test_threaded_raw_sql(default_connect):
+    async def main():
+        async with ThreadedExecutor(default_connect) as executor:
+            await executor.execute(("INSERT INTO foo VALUES (?, ?)", (1, "a")))
+            return await executor.fetch("SELECT name FROM foo")
+
+    assert asyncio.run(main()) == [("a",)]
+
+
+def test_threaded_rollback(default_connect, default_insert):
+    async def main():
+        async with ThreadedExecutor(default_connect, max_concurrency=1) as executor:
+            with pytest.raises(sqlite3.IntegrityError):
+                await executor.executemany(
+                    default_insert, records(2) + records(1), inject_columns=True
+                )
+            return await executor.fetch(que.Select("foo"))
+
+    assert asyncio.run(main()) == []
+
+
+def test_threaded_cancel_running(default_connect):
+    async def main():
+        async with ThreadedExecutor(default_connect, max_concurrency=1) as executor:
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(executor.fetch(FOREVER), 0.1)
+            # The connection is interrupted, and may be used again.
+            return await executor.fetch("SELECT 1")
+
+    assert asyncio.run(main()) == [(1,)]
+    assert len(default_connect.opened) == 1
+
+
+def test_threaded_cancel_pending(default_connect, default_insert):
+    async def main():
+        async with ThreadedExecutor(default_connect, max_concurrency=1) as executor:
+            running = asyncio.ensure_future(executor.fetch(FOREVER))
+            pending = asyncio.ensure_future(
+                executor.executemany(default_insert, records(1), inject_columns=True)
+            )
+            await asyncio.sleep(0.1)
+            pending.cancel()
+            running.cancel()
+            await asyncio.gather(running, pending, return_exceptions=True)
+            return await executor.fetch(que.Select("foo"))
+
+    assert asyncio.run(main()) == []
+
+
+def test_threaded_invalid(default_connect):
+    with pytest.raises(TypeError):
+        ThreadedExecutor(default_connect, max_concurrency=0)
+
+    async def main():
+        async with ThreadedExecutor(default_connect) as executor:
+            await executor.executemany(que.Select("foo"), records(1))
+
+    with pytest.raises(TypeError):
+        asyncio.run(main())
+
+
+class NativeConnection:
+    """An asyncpg-like connection, backed by sqlite3."""
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+        self.running = self.peak = 0
+
+    async def _query(self, sql, args):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(0)
+        try:
+            return self.connection.execute(sql, args).fetchall()
+        finally:
+            self.running -= 1
+
+    async def execute(self, sql, *args):
+        await self._query(sql, args)
+
+    async def fetch(self, sql, *args):
+        return await self._query(sql, args)
+
+    async def executemany(self, sql, args):
+        self.connection.executemany(sql, args)
+
+
+def test_native_end_to_end(default_connect, default_insert):
+    connection = NativeConnection(default_connect())
+
+    async def main():
+        executor = NativeExecutor(connection, style=que.BasicParamStyle.QM)
+        await executor.executemany(default_insert, records(3), inject_columns=True)
+        await executor.execute(
+            que.Delete("foo", filters=[que.Filter(que.Field("id", 0))])
+        )
+        select = que.Select("foo", filters=[que.Filter(que.Field("id", 1))])
+        rows = await asyncio.gather(*(executor.fetch(select) for _ in range(5)))
+        return rows, await executor.fetch(que.Select("foo"))
+
+    rows, everything = asyncio.run(main())
+    assert rows == [[(1, "1")]] * 5
+    assert everything == [(1, "1"), (2, "2")]
+    assert connection.peak == 1
+
+
+def test_native_invalid():
+    with pytest.raises(TypeError):
+        NativeExecutor(None, style=que.NameParamStyle.NAME)
+    with pytest.raises(TypeError):
+        NativeExecutor(None, max_concurrency=0)
+
+
+class CountingExecutor(ThreadedExecutor):
+    """A ThreadedExecutor which records the statements it fetches."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fetched = []
+
+    async def fetch(self, statement, **options):
+        self.fetched.append(statement)
+        return await super().fetch(statement, **options)
+
+
+def lookup(id, fields=()) -> que.Select:
+    return que.Select("foo", fields=fields, filters=[que.Filter(que.Field("id", id))])
+
+
+@pytest.fixture
+def default_loaded(default_connect, default_insert):
+    async def load(*lookups, **kwargs):
+        async with CountingExecutor(default_connect) as executor:
+            await executor.executemany(default_insert, records(5), inject_columns=True)
+            loader = SelectLoader(executor, **kwargs)
+            rows = await asyncio.gather(*(loader.fetch(x) for x in lookups))
+            return rows, executor.fetched
+
+    return load
+
+
+def test_loader_coalesces(default_loaded):
+    rows, fetched = asyncio.run(default_loaded(*(lookup(x % 3) for x in range(10))))
+    assert rows == [[(x % 3, str(x % 3))] for x in range(10)]
+    (merged,) = fetched
+    assert merged.filters[0].opcode is que.LogOps.IN
+    assert merged.filters[0].field.value == [0, 1, 2]
+
+
+def test_loader_shapes(default_loaded):
+    lookups = [lookup(1), lookup(2, [que.Field("name")]), lookup(9), lookup(3)]
+    lookups.append(que.Select("foo", filters=[que.Filter(que.Field("name", "4"))]))
+    lookups.append(que.Select("foo"))
+    rows, fetched = asyncio.run(default_loaded(*lookups))
+    assert rows == [
+        [(1, "1")],
+        [("2",)],
+        [],
+        [(3, "3")],
+        [(4, "4")],
+        [(x, str(x)) for x in range(5)],
+    ]
+    # id, id (name), name, and the Select of everything, which is run as-is.
+    assert len(fetched) == 4
+
+
+def test_loader_max_batch(default_loaded):
+    rows, fetched = asyncio.run(
+        default_loaded(*(lookup(x) for x in range(5)), max_batch=2)
+    )
+    assert rows == [[(x, str(x))] for x in range(5)]
+    assert [len(x.filters[0].field.value) for x in fetched] == [2, 2, 1]
+
+
+def test_loader_window(default_connect):
+    async def main():
+        async with CountingExecutor(default_connect) as executor:
+            loader = SelectLoader(executor, window=0.05)
+            first = asyncio.ensure_future(loader.fetch(lookup(1)))
+            await asyncio.sleep(0.01)
+            await asyncio.gather(first, loader.fetch(lookup(2)))
+            return executor.fetched
+
+    assert len(asyncio.run(main())) == 1
+
+
+def test_loader_errors(default_connect):
+    async def main():
+        async with ThreadedExecutor(default_connect) as executor:
+            loader = SelectLoader(executor)
+            lookups = [
+                que.Select("nope", filters=[que.Filter(que.Field("id", x))])
+                for x in range(2)
+            ]
+            return await asyncio.gather(
+                *(loader.fetch(x) for x in lookups), return_exceptions=True
+            )
+
+    errors = asyncio.run(main())
+    assert [type(x) for x in errors] == [sqlite3.OperationalError] * 2
+
+
+def test_loader_cancelled_caller(default_connect, default_insert):
+    async def main():
+        async with ThreadedExecutor(default_connect) as executor:
+            await executor.executemany(default_insert, records(2), inject_columns=True)
+            loader = SelectLoader(executor, window=0.05)
+            first = asyncio.ensure_future(loader.fetch(lookup(1)))
+            second = asyncio.ensure_future(loader.fetch(lookup(1)))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second
+
+    assert asyncio.run(main()) == [(1, "1")]
+
+
+def test_loader_invalid(default_connect):
+    executor = ThreadedExecutor(default_connect)
+    with pytest.raises(TypeError):
+        SelectLoader(executor, opcode=que.LogOps.AND)
+    with pytest.raises(TypeError):
+        SelectLoader(executor, max_batch=0)
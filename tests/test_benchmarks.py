@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+from benchmarks import harness, suite
+
+
+def result(name: str, best: float) -> harness.Result:
+    return harness.Result(name, best, best, 0.0, 1, 1)
+
+
+def test_suite_registered():
+    names = set(harness.BENCHMARKS)
+    assert "insert.to_sql[wide,NumParamStyle.DOL]" in names
+    assert "data_to_fields[pairs,exclude=None]" in names
+    assert "instrument[disabled]" in names
+    assert (
+        len(names)
+        == len(suite.STATEMENTS) * len(suite.WIDTHS) * len(suite.STYLES) * 2
+        + len(suite._INPUTS) * 2
+        + 3  # decode_many
+        + 3  # DictFactory
+        + 3  # instrument
+        + 3  # ArgList
+        + 2  # Runner
+    )
+
+
+def test_compare_threshold():
+    baseline = {"a": result("a", 1.0), "b": result("b", 1.0)}
+    current = [result("a", 1.05), result("b", 1.5), result("c", 9.0)]
+    (regression,) = harness.compare(baseline, current, threshold=0.1)
+    assert regression.name == "b"
+    assert regression.change == 0.5
+    assert len(harness.compare(baseline, current, threshold=0.01)) == 2
+
+
+def test_save_load(tmp_path):
+    results = harness.run(["DictFactory[]"], repeat=1)
+    path = harness.save(results, tmp_path / "results.json")
+    assert harness.load(path) == {x.name: x for x in results}
+    assert harness.latest(tmp_path) == path
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+import pytest
+
+import que
+from que.cache import CompiledSQL
+
+STYLES = [
+    *que.BasicParamStyle,
+    *que.NumParamStyle,
+    *que.NameParamStyle,
+]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    que.STATEMENT_CACHE.clear()
+    yield
+    que.STATEMENT_CACHE.clear()
+
+
+def make_statements(value):
+    field = que.Field("foo", value)
+    fylter = que.Filter(que.Field("id", value), prefix="f")
+    return [
+        que.Select(
+            table="foo", schema="bar", fields=[que.Field("foo")], filters=[fylter]
+        ),
+        que.Update(table="foo", fields=[field], filters=[fylter]),
+        que.Insert(table="foo", fields=[field], returns=que.Field("id")),
+        que.Delete(table="foo", filters=[fylter]),
+    ]
+
+
+@pytest.mark.parametrize("style", STYLES)
+def test_cache_hit_matches_render(style):
+    for first, second in zip(make_statements("bar"), make_statements("baz")):
+        first.to_sql(style)
+        sql, args = second.to_sql(style)
+        assert (sql, args) == second._render(style)
+    info = que.STATEMENT_CACHE.info()
+    assert info.hits == 4
+    assert info.misses == 4
+
+
+@pytest.mark.parametrize("style", STYLES)
+def test_cache_hit_insert_inject_columns(style):
+    first, second = (
+        que.Insert(table="foo", fields=[que.Field("foo", x)]) for x in ("bar", "baz")
+    )
+    first.to_sql(style, inject_columns=True)
+    sql, args = second.to_sql(style, inject_columns=True)
+    expected_sql, expected_args = second.build_insert(style, inject_columns=True)
+    assert sql == expected_sql
+    assert args == expected_args.for_sql(style)
+    assert que.STATEMENT_CACHE.info().hits == 1
+
+
+def test_cache_shape_styles_distinct():
+    select = make_statements("bar")[0]
+    num, _ = select.to_sql(que.NumParamStyle.NUM)
+    name, _ = select.to_sql(que.NameParamStyle.NAME)
+    assert num != name
+    assert que.STATEMENT_CACHE.info().misses == 2
+
+
+def test_cache_shape_opcode_distinct():
+    eq = que.Select("foo", filters=[que.Filter(que.Field("id", 1))])
+    gt = que.Select("foo", filters=[que.Filter(que.Field("id", 1), que.CmpOps.GT)])
+    assert eq.to_sql()[0] != gt.to_sql()[0]
+
+
+class DistinctSelect(que.Select):
+    def build_select(self) -> str:
+        return super().build_select().replace("SELECT", "SELECT DISTINCT", 1)
+
+
+class LowPriorityInsert(que.InsertMany):
+    def _render_head(self, style, inject_columns):
+        head, names = super()._render_head(style, inject_columns)
+        return head.replace("INSERT", "INSERT LOW_PRIORITY", 1), names
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_cache_shape_subclass_distinct(reverse):
+    statements = [que.Select("foo"), DistinctSelect("foo")]
+    if reverse:
+        statements.reverse()
+    rendered = {type(x): x.to_sql()[0] for x in statements}
+    assert rendered[que.Select].startswith("SELECT\n  *")
+    assert rendered[DistinctSelect].startswith("SELECT DISTINCT\n  *")
+    assert que.STATEMENT_CACHE.info().misses == 2
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_cache_shape_subclass_distinct_many(reverse):
+    statements = [
+        que.InsertMany("foo", columns=("id",), rows=[(1,)]),
+        LowPriorityInsert("foo", columns=("id",), rows=[(1,)]),
+    ]
+    if reverse:
+        statements.reverse()
+    rendered = {type(x): x.to_sql(inject_columns=True)[0][0] for x in statements}
+    assert rendered[que.InsertMany].startswith("INSERT INTO")
+    assert rendered[LowPriorityInsert].startswith("INSERT LOW_PRIORITY INTO")
+
+
+def test_cache_unhashable_shape():
+    select = que.Select("foo", fields=[que.Field("foo", ["bar"])])
+    sql, args = select.to_sql()
+    assert sql.startswith("SELECT\n  foo AS ['bar']")
+    assert len(que.STATEMENT_CACHE) == 0
+
+
+def test_cache_eviction():
+    cache = que.StatementCache(maxsize=2)
+    for key in "abc":
+        cache.put(key, CompiledSQL(key, ()))
+    assert "a" not in cache
+    assert cache.get("b").sql == "b"
+    cache.put("d", CompiledSQL("d", ()))
+    assert "b" in cache and "c" not in cache
+    assert cache.info() == que.CacheInfo(
+        hits=1, misses=0, evictions=2, maxsize=2, currsize=2
+    )
+
+
+def test_cache_resize():
+    cache = que.StatementCache(maxsize=3)
+    for key in "abc":
+        cache.put(key, CompiledSQL(key, ()))
+    cache.resize(1)
+    assert len(cache) == 1 and "c" in cache
+    assert cache.info().evictions == 2
+
+
+def test_cache_disabled():
+    cache = que.StatementCache(maxsize=0)
+    cache.put("a", CompiledSQL("a", ()))
+    assert cache.get("a") is None
+    assert cache.info().misses == 1
+
+
+def test_cache_invalid_size():
+    with pytest.raises(TypeError):
+        que.StatementCache(maxsize=-1)
+    with pytest.raises(TypeError):
+        que.StatementCache().resize(-1)
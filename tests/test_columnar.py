@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+import array
+import sqlite3
+
+import pytest
+
+import que
+
+
+@pytest.fixture
+def default_columns() -> dict:
+    return {"id": array.array("q", range(5)), "name": [str(x) for x in range(5)]}
+
+
+@pytest.fixture
+def default_insert_columns(default_columns) -> que.InsertColumns:
+    return que.InsertColumns.from_columns("foo", default_columns, schema="bar")
+
+
+def test_to_columns(default_columns):
+    names, columns = que.to_columns(default_columns)
+    assert names == ("id", "name")
+    assert columns[0] == [0, 1, 2, 3, 4]
+    assert columns[1] is default_columns["name"]
+
+
+def test_to_columns_invalid():
+    with pytest.raises(TypeError):
+        que.to_columns([("id", 1)])
+    with pytest.raises(TypeError):
+        que.to_columns({"id": [1, 2], "name": ["a"]})
+
+
+def test_to_columns_numpy():
+    numpy = pytest.importorskip("numpy")
+    data = numpy.array([(1, 1.5), (2, 2.5)], dtype=[("id", "i8"), ("value", "f8")])
+    names, columns = que.to_columns(data)
+    assert names == ("id", "value")
+    assert columns == [[1, 2], [1.5, 2.5]]
+    assert type(columns[0][0]) is int
+
+
+def test_insert_columns_matches_insert_many(default_columns, default_insert_columns):
+    rows = [{"id": x, "name": y} for x, y in zip(*default_columns.values())]
+    insert_many = que.InsertMany.from_records("foo", rows, schema="bar", max_params=6)
+    default_insert_columns.max_params = 6
+    for style in (que.NumParamStyle.NUM, que.NameParamStyle.NAME):
+        assert default_insert_columns.to_sql(style) == insert_many.to_sql(style)
+
+
+def test_insert_columns_to_sql_many(default_insert_columns):
+    sql, args = default_insert_columns.to_sql_many(que.BasicParamStyle.QM)
+    assert sql == "INSERT INTO\n  bar.foo (?, ?)\nVALUES\n  (?, ?)\n"
+    assert next(args) == ("id", "name", 0, "0")
+
+
+def test_insert_columns_to_sql_many_name_style(default_insert_columns):
+    sql, args = default_insert_columns.to_sql_many(que.NameParamStyle.NAME, True)
+    assert (
+        sql == "INSERT INTO\n  bar.foo (id, name)\nVALUES\n  (:valid_0, :valname_0)\n"
+    )
+    assert list(args)[-1] == {"valid_0": 4, "valname_0": "4"}
+
+
+def test_insert_columns_invalid():
+    with pytest.raises(TypeError):
+        que.InsertColumns("foo", columns=("id",), data=[[1], [2]])
+    with pytest.raises(TypeError):
+        que.InsertColumns("foo", columns=("id",), data=[[1]], rows=[(1,)])
+
+
+@pytest.mark.parametrize("style", [que.BasicParamStyle.QM, que.NameParamStyle.NAME])
+def test_insert_columns_sqlite(style):
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE foo (id INTEGER, value REAL)")
+    insert = que.InsertColumns.from_columns(
+        "foo",
+        {"id": array.array("q", range(1000)), "value": array.array("d", [0.5] * 1000)},
+        dialect=que.Dialect.SQLITE_LEGACY,
+    )
+    for sql, args in insert.to_sql(style, inject_columns=True):
+        conn.execute(sql, args)
+    conn.executemany(*insert.to_sql_many(style, inject_columns=True))
+    assert conn.execute("SELECT COUNT(*), SUM(value) FROM foo").fetchone() == (
+        2000,
+        1000.0,
+    )
@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+import sqlite3
+
+import pytest
+
+import que
+from que.dbapi import Runner, paramstyle, render
+
+
+class Cursor:
+    """A sqlite3 cursor which records the calls made to it."""
+
+    def __init__(self, cursor: sqlite3.Cursor, calls: list):
+        self.cursor, self.calls = cursor, calls
+
+    def execute(self, sql, args=()):
+        self.calls.append(("execute", sql, args))
+        return self.cursor.execute(sql, args)
+
+    def executemany(self, sql, args):
+        args = list(args)
+        self.calls.append(("executemany", sql, args))
+        return self.cursor.executemany(sql, args)
+
+    def fetchall(self):
+        return self.cursor.fetchall()
+
+    def close(self):
+        self.cursor.close()
+
+
+class Connection:
+    paramstyle = "qmark"
+
+    def __init__(self):
+        self.connection = sqlite3.connect(":memory:")
+        self.connection.execute("CREATE TABLE foo (id INTEGER PRIMARY KEY, name TEXT)")
+        self.calls, self.cursors = [], 0
+
+    def cursor(self):
+        self.cursors += 1
+        return Cursor(self.connection.cursor(), self.calls)
+
+    def commit(self):
+        self.connection.commit()
+
+    def rollback(self):
+        self.connection.rollback()
+
+
+@pytest.fixture
+def default_connection() -> Connection:
+    return Connection()
+
+
+def insert(id: int, name: str = "") -> que.Insert:
+    return que.Insert("foo", fields=[que.Field("id", id), que.Field("name", name)])
+
+
+def update(id: int, name: str) -> que.Update:
+    return que.Update(
+        "foo",
+        fields=[que.Field("name", name)],
+        filters=[que.Filter(que.Field("id", id))],
+    )
+
+
+def kinds(connection: Connection) -> list:
+    return [(kind, len(args)) for kind, _, args in connection.calls]
+
+
+@pytest.mark.parametrize(
+    "obj, expected",
+    [
+        (sqlite3, que.BasicParamStyle.QM),
+        (sqlite3.connect(":memory:"), que.BasicParamStyle.QM),
+        (Connection(), que.BasicParamStyle.QM),
+    ],
+)
+def test_paramstyle(obj, expected):
+    assert paramstyle(obj) == expected
+
+
+def test_paramstyle_invalid():
+    with pytest.raises(TypeError):
+        paramstyle(object())
+
+
+def test_render():
+    many = que.InsertMany("foo", columns=("id",), rows=[(1,), (2,)], max_params=1)
+    assert len(render(many, que.BasicParamStyle.QM, inject_columns=True)) == 2
+    assert render(("SELECT ?", [1]), que.BasicParamStyle.QM) == [("SELECT ?", [1])]
+
+
+def test_runner_batches(default_connection):
+    runner = Runner(default_connection)
+    with runner:
+        for id in range(5):
+            runner.execute(insert(id), inject_columns=True)
+        assert runner.pending == 5
+        runner.execute(update(0, "a"))
+        runner.execute(update(1, "b"))
+    assert runner.pending == 0
+    assert kinds(default_connection) == [("executemany", 5), ("executemany", 2)]
+    assert runner.fetch(que.Select("foo", fields=[que.Field("name")])) == [
+        ("a",),
+        ("b",),
+        ("",),
+        ("",),
+        ("",),
+    ]
+    assert default_connection.cursors == 1
+
+
+def test_runner_batch_size(default_connection):
+    runner = Runner(default_connection, batch_size=2)
+    for id in range(5):
+        runner.execute(insert(id), inject_columns=True)
+    assert runner.pending == 1
+    runner.flush()
+    assert kinds(default_connection) == [
+        ("executemany", 2),
+        ("executemany", 2),
+        ("execute", 2),
+    ]
+
+
+def test_runner_flushes_before_other_statements(default_connection):
+    runner = Runner(default_connection)
+    runner.execute(insert(1), inject_columns=True)
+    runner.execute(insert(2), inject_columns=True)
+    assert runner.fetch(que.Select("foo", fields=[que.Field("id")])) == [(1,), (2,)]
+    runner.execute(insert(3), inject_columns=True)
+    runner.execute(que.Delete("foo", filters=[que.Filter(que.Field("id", 1))]))
+    assert runner.pending == 0
+    assert [x[0] for x in default_connection.calls] == [
+        "executemany",
+        "execute",
+        "execute",
+        "execute",
+    ]
+
+
+def test_runner_returning_is_not_batched(default_connection):
+    runner = Runner(default_connection)
+    statement = que.Insert("foo", fields=[que.Field("id", 1)], returns=que.Field("id"))
+    runner.execute(statement, inject_columns=True)
+    assert runner.pending == 0
+
+
+def test_runner_rollback(default_connection):
+    runner = Runner(default_connection)
+    runner.execute(insert(1), inject_columns=True)
+    with pytest.raises(sqlite3.IntegrityError):
+        with runner:
+            runner.execute(insert(2), inject_columns=True)
+            runner.execute(insert(2), inject_columns=True)
+    runner.execute(insert(3), inject_columns=True)
+    runner.rollback()
+    assert runner.fetch(que.Select("foo")) == []
+
+
+@pytest.mark.parametrize(
+    "style", [que.BasicParamStyle.QM, que.NumParamStyle.NUM, que.NameParamStyle.NAME]
+)
+def test_runner_styles(style):
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE foo (id INTEGER PRIMARY KEY, name TEXT)")
+    with Runner(connection, style=style) as runner:
+        for id in range(3):
+            runner.execute(insert(id, str(id)), inject_columns=True)
+        runner.executemany(insert(0), [{"id": 3, "name": "3"}], inject_columns=True)
+    select = que.Select("foo", filters=[que.Filter(que.Field("id", 2), que.CmpOps.GE)])
+    assert runner.fetch(select) == [(2, "2"), (3, "3")]
+    runner.close()
+
+
+def test_runner_invalid(default_connection):
+    with pytest.raises(TypeError):
+        Runner(default_connection, batch_size=0)
+    with pytest.raises(TypeError):
+        Runner(default_connection).executemany(que.Select("foo"), [])
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+import datetime
+import decimal
+import enum
+import io
+import sqlite3
+import uuid
+
+import pytest
+
+import que
+from que.dump import Dump, literal
+
+
+class Color(enum.IntEnum):
+    RED = 1
+
+
+@pytest.fixture
+def default_insert() -> que.InsertMany:
+    return que.InsertMany("foo", columns=("id", "name", "data"), dialect="sqlite")
+
+
+def rows(n: int) -> list:
+    return [(x, f"it's {x}\n\\", bytes([x % 256])) for x in range(n)]
+
+
+@pytest.mark.parametrize(
+    "value, dialect, expected",
+    [
+        (None, que.Dialect.POSTGRES, "NULL"),
+        (False, que.Dialect.MYSQL, "FALSE"),
+        (Color.RED, que.Dialect.POSTGRES, "1"),
+        (-1.5, que.Dialect.SQLITE, "-1.5"),
+        (float("nan"), que.Dialect.POSTGRES, "'NaN'"),
+        (float("-inf"), que.Dialect.POSTGRES, "'-Infinity'"),
+        (decimal.Decimal("1.10"), que.Dialect.POSTGRES, "1.10"),
+        ("a'b\\c", que.Dialect.POSTGRES, "'a''b\\c'"),
+        ("a'b\\c\n\x00", que.Dialect.MYSQL, "'a''b\\\\c\\n\\0'"),
+        (que.Dialect.SQLITE, que.Dialect.SQLITE, "'sqlite'"),
+        (b"\x01", que.Dialect.POSTGRES, "'\\x01'::bytea"),
+        (bytearray(b"\x01"), que.Dialect.MYSQL, "X'01'"),
+        (
+            datetime.datetime(2020, 1, 2, 3, 4, 5),
+            que.Dialect.SQLITE,
+            "'2020-01-02 03:04:05'",
+        ),
+        (datetime.date(2020, 1, 2), que.Dialect.SQLITE, "'2020-01-02'"),
+        (
+            uuid.UUID(int=1),
+            que.Dialect.SQLITE,
+            "'00000000-0000-0000-0000-000000000001'",
+        ),
+        ({"a": [1]}, que.Dialect.POSTGRES, "'{\"a\": [1]}'"),
+    ],
+)
+def test_literal(value, dialect, expected):
+    assert literal(value, dialect) == expected
+
+
+@pytest.mark.parametrize(
+    "value, dialect",
+    [
+        (float("inf"), que.Dialect.SQLITE),
+        (decimal.Decimal("NaN"), que.Dialect.MYSQL),
+        (decimal.Decimal("sNaN"), que.Dialect.POSTGRES),
+        ("\x00", que.Dialect.POSTGRES),
+        (object(), que.Dialect.POSTGRES),
+    ],
+)
+def test_literal_invalid(value, dialect):
+    with pytest.raises(TypeError):
+        literal(value, dialect)
+
+
+def test_dump_sqlite_round_trip(default_insert):
+    dump = Dump(default_insert, rows_per_statement=3, workers=0)
+    values = rows(10) + [(10, None, None), (11, "ünï'cödé", b"")]
+    script = dump.render(values)
+    assert script.count("INSERT INTO") == 4
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE foo (id INTEGER, name TEXT, data BLOB)")
+    connection.executescript(script)
+    assert connection.execute("SELECT * FROM foo ORDER BY id").fetchall() == values
+
+
+def test_dump_upsert():
+    upsert = que.Upsert(
+        "foo", columns=("id", "name"), conflict=("id",), dialect="sqlite"
+    )
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE foo (id INTEGER PRIMARY KEY, name TEXT)")
+    dump = Dump(upsert, workers=0)
+    connection.executescript(dump.render([(1, "a"), (2, "b")]))
+    connection.executescript(dump.render([(1, "c")]))
+    assert connection.execute("SELECT * FROM foo").fetchall() == [(1, "c"), (2, "b")]
+
+
+def test_dump_parallel_identical(default_insert):
+    values = rows(1000)
+    single = Dump(default_insert, rows_per_statement=7, statements_per_job=3, workers=0)
+    parallel = Dump(
+        default_insert, rows_per_statement=7, statements_per_job=3, workers=2
+    )
+    expected = single.render(values)
+    assert parallel.render(iter(values)) == expected
+    assert Dump(default_insert, rows_per_statement=7).render(values) == expected
+
+
+def test_dump_buffered_writes(default_insert):
+    class File(io.BytesIO):
+        writes = 0
+
+        def write(self, data):
+            self.writes += 1
+            return super().write(data)
+
+    dump = Dump(default_insert, rows_per_statement=10, statements_per_job=1, workers=0)
+    out = File()
+    written = dump.write_rows(rows(100), out)
+    assert written == len(out.getvalue()) == len(dump.render(rows(100)).encode())
+    assert out.writes == 1
+
+    dump.buffer_size = 1
+    out = File()
+    dump.write_rows(rows(100), out)
+    assert out.writes == 10
+
+
+def test_dump_records(default_insert):
+    dump = Dump(default_insert, workers=0)
+    buffer = bytearray(b"-- header\n")
+    records = [{"name": "a", "data": None, "id": 1}]
+    assert dump.write(records, buffer) == len(buffer) - len(b"-- header\n")
+    assert buffer.decode().endswith("(1, 'a', NULL);\n")
+    assert dump.render([]) == ""
+
+
+def test_dump_invalid(default_insert):
+    with pytest.raises(TypeError):
+        Dump(que.Insert("foo", fields=[que.Field("id", 1)]))
+    with pytest.raises(TypeError):
+        Dump(que.InsertMany("foo", columns=("id",), returns=que.Field("id")))
+    with pytest.raises(TypeError):
+        Dump(default_insert, rows_per_statement=0)
+    with pytest.raises(TypeError):
+        Dump(default_insert, workers=0).render([(1, "a")])
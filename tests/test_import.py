@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+import json
+import os
+import pathlib
+import subprocess
+import sys
+
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+#: The cumulative time ``import que`` may take, in milliseconds.
+IMPORT_BUDGET_MS = float(os.environ.get("QUE_IMPORT_BUDGET_MS", 75))
+
+#: Wall-clock checks are flaky on a loaded machine, so they only run on request.
+timing = pytest.mark.skipif(
+    not os.environ.get("QUE_TIMING_TESTS"),
+    reason="Set QUE_TIMING_TESTS=1 to run timing tests.",
+)
+
+#: The top-level modules ``import que`` may pull in. Private (``_``) modules aren't
+#: listed, since they're implementation details of these.
+ALLOWED_MODULES = {
+    "que",
+    # dataclasses
+    "dataclasses",
+    "copy",
+    "copyreg",
+    "inspect",
+    "ast",
+    "dis",
+    "opcode",
+    "importlib",
+    "linecache",
+    "tokenize",
+    "token",
+    "keyword",
+    "reprlib",
+    "re",
+    "sre_compile",
+    "sre_constants",
+    "sre_parse",
+    # enum & typing
+    "enum",
+    "typing",
+    "types",
+    "functools",
+    "collections",
+    "itertools",
+    "operator",
+    "contextlib",
+    "warnings",
+    "weakref",
+    # que.cache & que.instrument
+    "threading",
+}
+
+#: Optional features which must only be imported on first use.
+LAZY_MODULES = {
+    "que.columnar",
+    "que.stream",
+    "que.pgcopy",
+    "que.prepared",
+    "que.aio",
+    "que.dbapi",
+    "que.dump",
+    "que.routing",
+    "asyncio",
+    "concurrent",
+    "logging",
+    "json",
+    "decimal",
+    "uuid",
+    "hashlib",
+}
+
+
+def python(*args: str, cwd: pathlib.Path = ROOT) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return subprocess.run(
+        [sys.executable, *args], cwd=cwd, env=env, capture_output=True, check=True
+    )
+
+
+def imported(code: str) -> set:
+    script = (
+        "import json, sys; before = set(sys.modules); "
+        f"{code}; print(json.dumps(sorted(set(sys.modules) - before)))"
+    )
+    return set(json.loads(python("-c", script).stdout))
+
+
+def test_import_modules():
+    modules = imported("import que")
+    assert not modules & LAZY_MODULES
+    unexpected = {
+        x.split(".")[0] for x in modules if not x.startswith("_")
+    } - ALLOWED_MODULES
+    assert not unexpected, f"import que pulls in new modules: {sorted(unexpected)}"
+
+
+@pytest.mark.parametrize(
+    "name, module",
+    [
+        ("InsertColumns", "que.columnar"),
+        ("StreamWriter", "que.stream"),
+        ("Copy", "que.pgcopy"),
+        ("PreparedRegistry", "que.prepared"),
+        ("ThreadedExecutor", "que.aio"),
+        ("Dump", "que.dump"),
+        ("Router", "que.routing"),
+    ],
+)
+def test_lazy_attribute(name, module):
+    modules = imported(f"import que; que.{name}")
+    assert module in modules
+    assert module == "que.aio" or "asyncio" not in modules
+
+
+def test_lazy_attribute_missing():
+    import que
+
+    with pytest.raises(AttributeError):
+        que.Nope
+    assert "StreamWriter" in dir(que)
+
+
+@timing
+def test_import_time(tmp_path):
+    cache = f"pycache_prefix={tmp_path}"
+    python("-X", cache, "-c", "import que")  # Warm the bytecode cache.
+    timings = []
+    for _ in range(3):
+        stderr = python("-X", cache, "-X", "importtime", "-c", "import que").stderr
+        for line in stderr.decode().splitlines():
+            _, cumulative, name = line.rsplit("|", 2) if "|" in line else ("",) * 3
+            if name.strip() == "que":
+                timings.append(int(cumulative) / 1000)
+    assert min(timings) < IMPORT_BUDGET_MS
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+import logging
+
+import pytest
+
+import que
+from que import instrument
+
+
+@pytest.fixture(autouse=True)
+def disable_instrumentation():
+    instrument.disable()
+    yield
+    instrument.disable()
+
+
+@pytest.fixture
+def default_aggregator():
+    return instrument.Aggregator()
+
+
+def test_disabled_by_default():
+    assert instrument.SINKS == ()
+
+
+def test_disabled_does_not_time(monkeypatch):
+    def clock():
+        raise AssertionError("The clock was read while instrumentation was disabled.")
+
+    monkeypatch.setattr(instrument, "clock", clock)
+    que.Select("foo", filters=[que.Filter(que.Field("id", 1))]).to_sql()
+    que.InsertMany("foo", columns=("id",), rows=[(1,), (2,)]).to_sql()
+    que.data_to_fields({"id": 1})
+
+
+def test_to_sql_events(default_aggregator):
+    select = que.Select("foo", filters=[que.Filter(que.Field("id", 1))])
+    with instrument.instrumented(default_aggregator):
+        sql, args = select.to_sql()
+        select.to_sql()
+        que.Delete("foo", filters=[que.Filter(que.Field("id", 1))]).to_sql()
+    select.to_sql()
+
+    stats = default_aggregator.stats()
+    assert set(stats) == {"Select", "Delete"}
+    assert stats["Select"].count == 2
+    assert stats["Select"].nargs == 2
+    assert stats["Select"].nbytes == 2 * len(sql.encode())
+    assert stats["Select"].total >= stats["Select"].p99 >= stats["Select"].p50 > 0
+    assert stats["Delete"].count == 1
+
+
+def test_insert_many_events(default_aggregator):
+    insert = que.InsertMany(
+        "foo", columns=("id", "name"), rows=[(1, "a")] * 5, max_params=6
+    )
+    with instrument.instrumented(default_aggregator):
+        chunks = insert.to_sql(inject_columns=True)
+
+    stats = default_aggregator.stats()["InsertMany"]
+    assert stats.count == len(chunks) == 2
+    assert stats.nargs == 10
+
+
+def test_data_to_fields_events(default_aggregator):
+    with instrument.instrumented(default_aggregator):
+        que.data_to_fields({"id": 1, "name": "foo"})
+
+    stats = default_aggregator.stats()["data_to_fields"]
+    assert (stats.count, stats.nargs, stats.nbytes) == (1, 2, 0)
+
+
+def test_callback_sink():
+    events = []
+    with instrument.instrumented(events.append) as sinks:
+        assert instrument.SINKS == sinks
+        que.Select("foo").to_sql()
+    assert instrument.SINKS == ()
+    assert [x.kind for x in events] == ["Select"]
+    assert isinstance(events[0], instrument.RenderEvent)
+
+
+def test_enable_disable(default_aggregator):
+    events = []
+    instrument.enable(events.append, default_aggregator)
+    instrument.disable(events.append)
+    assert instrument.SINKS == (default_aggregator,)
+    instrument.disable()
+    assert instrument.SINKS == ()
+
+
+def test_aggregator_window():
+    aggregator = instrument.Aggregator(window=2)
+    for seconds in (3.0, 1.0, 2.0):
+        aggregator(instrument.RenderEvent("Select", seconds, 1, 10))
+    stats = aggregator.stats()["Select"]
+    assert stats.count == 3
+    assert stats.total == 6.0
+    assert stats.mean == 2.0
+    assert (stats.p50, stats.p99) == (2.0, 2.0)
+    aggregator.reset()
+    assert aggregator.stats() == {}
+
+
+def test_logging_sink(caplog):
+    sink = instrument.LoggingSink(level=logging.INFO)
+    with caplog.at_level(logging.INFO, logger="que"):
+        with instrument.instrumented(sink):
+            que.Select("foo").to_sql()
+    assert "Rendered Select" in caplog.text
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+import datetime
+import decimal
+import io
+import uuid
+from dataclasses import dataclass
+
+import pytest
+
+import que
+
+HEADER = b"PGCOPY\n\xff\r\n\x00\x00\x00\x00\x00\x00\x00\x00\x00"
+TRAILER = b"\xff\xff"
+
+
+@pytest.fixture
+def default_copy() -> que.Copy:
+    return que.Copy("foo", schema="bar", columns=("id", "name", "data"))
+
+
+def test_copy_to_sql(default_copy):
+    assert default_copy.to_sql() == (
+        "COPY bar.foo (id, name, data) FROM STDIN WITH (FORMAT text)"
+    )
+    default_copy.format = que.CopyFormat.BINARY
+    assert default_copy.to_sql().endswith("WITH (FORMAT binary)")
+
+
+def test_copy_from_insert():
+    insert = que.Insert("foo", fields=que.data_to_fields({"id": 1, "name": "a"}))
+    copy = que.Copy.from_insert(insert, format=que.CopyFormat.CSV)
+    assert copy.to_sql() == "COPY foo (id, name) FROM STDIN WITH (FORMAT csv)"
+
+
+def test_copy_text(default_copy):
+    rows = [(1, "a\tb\\c\nd", None), (2, True, b"\x01\xff")]
+    assert default_copy.encode_row(rows[0]) == b"1\ta\\tb\\\\c\\nd\t\\N\n"
+    assert default_copy.encode_row(rows[1]) == b"2\tt\t\\\\x01ff\n"
+
+
+def test_copy_csv(default_copy):
+    default_copy.format = que.CopyFormat.CSV
+    row = ("", None, 'a,"b"')
+    assert default_copy.encode_row(row) == b'"",,"a,""b"""\n'
+    row = ("x\ny", "\\.", {"a": 1})
+    assert default_copy.encode_row(row) == b'"x\ny","\\.","{""a"": 1}"\n'
+
+
+def test_copy_binary(default_copy):
+    default_copy.format = que.CopyFormat.BINARY
+    buffer = bytearray()
+    written = default_copy.write_rows([(1, "ab", None)], buffer)
+    assert bytes(buffer) == (
+        HEADER
+        + b"\x00\x03"
+        + b"\x00\x00\x00\x08\x00\x00\x00\x00\x00\x00\x00\x01"
+        + b"\x00\x00\x00\x02ab"
+        + b"\xff\xff\xff\xff"
+        + TRAILER
+    )
+    assert written == len(buffer)
+
+
+def test_copy_binary_types():
+    copy = que.Copy(
+        "foo",
+        columns=("a", "b", "c", "d", "e"),
+        format=que.CopyFormat.BINARY,
+        types={"a": "int4", "e": "float8"},
+    )
+    value = uuid.UUID(int=1)
+    row = (1, datetime.datetime(2000, 1, 2), datetime.date(1999, 12, 31), value, 1)
+    assert copy.encode_row(row) == (
+        b"\x00\x05"
+        + b"\x00\x00\x00\x04\x00\x00\x00\x01"
+        + b"\x00\x00\x00\x08\x00\x00\x00\x14\x1d\xd7\x60\x00"
+        + b"\x00\x00\x00\x04\xff\xff\xff\xff"
+        + b"\x00\x00\x00\x10"
+        + value.bytes
+        + b"\x00\x00\x00\x08?\xf0\x00\x00\x00\x00\x00\x00"
+    )
+
+
+def test_copy_binary_timestamptz():
+    copy = que.Copy("foo", columns=("a",), format=que.CopyFormat.BINARY)
+    value = datetime.datetime(2000, 1, 1, 1, tzinfo=datetime.timezone.utc)
+    assert copy.encode_row((value,)) == (
+        b"\x00\x01\x00\x00\x00\x08" + (3600 * 10**6).to_bytes(8, "big")
+    )
+
+
+def test_copy_binary_uninferrable():
+    copy = que.Copy("foo", columns=("a",), format=que.CopyFormat.BINARY)
+    with pytest.raises(TypeError):
+        copy.encode_row((decimal.Decimal("1.0"),))
+    with pytest.raises(TypeError):
+        copy.encode_row((object(),))
+
+
+def test_copy_invalid():
+    with pytest.raises(TypeError):
+        que.Copy("foo")
+    with pytest.raises(TypeError):
+        que.Copy("foo", columns=("a",), types={"a": "money"})
+
+
+def test_copy_write_records(default_copy):
+    @dataclass
+    class Foo:
+        name: str
+        data: bytes
+        id: int
+
+    out = io.BytesIO()
+    written = default_copy.write(
+        [Foo("a", b"", 1), {"id": 2, "name": "b", "data": None}], out
+    )
+    assert out.getvalue() == b"1\ta\t\\\\x\n2\tb\t\\N\n"
+    assert written == len(out.getvalue())
+
+
+@pytest.mark.parametrize("format", [*que.CopyFormat])
+def test_copy_iter_payload(default_copy, format):
+    default_copy.format = format
+    rows = [(x, str(x), None) for x in range(1000)]
+    chunks = list(default_copy.iter_payload(rows, chunk_size=1024))
+    assert len(chunks) > 1
+    assert all(len(x) < 1024 + 64 for x in chunks)
+    buffer = bytearray()
+    default_copy.write_rows(rows, buffer)
+    assert b"".join(chunks) == buffer
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+import pytest
+
+import que
+
+
+@pytest.fixture
+def default_select() -> que.Select:
+    return que.Select("foo", filters=[que.Filter(que.Field("id", 1))])
+
+
+@pytest.fixture
+def default_registry() -> que.PreparedRegistry:
+    return que.PreparedRegistry(maxsize=2)
+
+
+def select(table: str) -> que.Select:
+    return que.Select(table, filters=[que.Filter(que.Field("id", 1))])
+
+
+def test_statement_name_deterministic():
+    name = que.statement_name("SELECT * FROM foo")
+    assert name == que.statement_name(" SELECT\n  *\nFROM\n  foo\n")
+    assert name != que.statement_name("SELECT * FROM bar")
+    assert name.startswith("que_") and len(name) == 20
+
+
+def test_registry_prepare_once(default_registry, default_select):
+    plan = default_registry.plan("conn", default_select)
+    name = default_registry.name(default_select.to_sql(que.NumParamStyle.DOL)[0])
+    assert plan == [
+        (f"PREPARE {name} AS SELECT\n  *\nFROM\n  foo\nWHERE\n  id = $1", []),
+        (f"EXECUTE {name}(:1)", [1]),
+    ]
+    assert default_registry.plan("conn", select("foo")) == [
+        (f"EXECUTE {name}(:1)", [1])
+    ]
+    assert len(default_registry.plan("other", default_select)) == 2
+
+
+def test_registry_named_style(default_registry, default_select):
+    *_, (sql, args) = default_registry.plan(
+        "conn", default_select, que.NameParamStyle.NAME
+    )
+    assert sql.endswith("(:id)")
+    assert args == {"id": 1}
+
+
+def test_registry_deallocate(default_registry):
+    names = []
+    for table in ("foo", "bar", "baz"):
+        plan = default_registry.plan("conn", select(table))
+        names.append(plan[-1][0].split()[1].split("(")[0])
+    assert plan[0] == (f"DEALLOCATE {names[0]}", [])
+    assert names[0] not in default_registry.prepared("conn")
+    assert len(default_registry.prepared("conn")) == 2
+
+
+def test_registry_touch_keeps_recent(default_registry):
+    default_registry.plan("conn", select("foo"))
+    default_registry.plan("conn", select("bar"))
+    default_registry.plan("conn", select("foo"))
+    plan = default_registry.plan("conn", select("baz"))
+    assert plan[0][0].startswith("DEALLOCATE")
+    assert len(default_registry.plan("conn", select("foo"))) == 1
+
+
+def test_registry_invalidate(default_registry, default_select):
+    plan = default_registry.plan("conn", default_select)
+    name = plan[-1][0].split("(")[0].split()[1]
+    default_registry.invalidate("conn", name)
+    assert len(default_registry.plan("conn", default_select)) == 2
+    default_registry.invalidate("conn")
+    assert len(default_registry.plan("conn", default_select)) == 2
+
+
+def test_registry_mysql(default_select):
+    registry = que.PreparedRegistry(que.Dialect.MYSQL)
+    prepare, bind, execute = registry.plan(
+        "conn", default_select, que.BasicParamStyle.FM
+    )
+    name = registry.name(default_select.to_sql(que.BasicParamStyle.QM)[0])
+    assert prepare == (
+        f"PREPARE {name} FROM 'SELECT\n  *\nFROM\n  foo\nWHERE\n  id = ?'",
+        [],
+    )
+    assert bind == (f"SET @{name}_0 = %s", [1])
+    assert execute == (f"EXECUTE {name} USING @{name}_0", [])
+    assert registry.deallocate_sql(name) == f"DEALLOCATE PREPARE {name}"
+
+
+def test_registry_no_params():
+    registry = que.PreparedRegistry(que.Dialect.MYSQL)
+    *_, (sql, args) = registry.plan("conn", que.Select("foo"))
+    assert sql == f"EXECUTE {registry.name('SELECT * FROM foo')}"
+    assert args == []
+
+
+def test_registry_insert_injects_columns(default_registry):
+    insert = que.Insert("foo", fields=[que.Field("bar", 2)])
+    prepare, execute = default_registry.plan("conn", insert, inject_columns=False)
+    assert prepare[0].endswith(" AS INSERT INTO\n  foo (bar)\nVALUES\n  ($1)\n")
+    assert execute[1] == [2]
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        que.InsertMany("foo", columns=("id",), rows=[(1,)]),
+        que.Upsert("foo", columns=("id", "bar"), rows=[(1, 2)], conflict=("id",)),
+        que.BulkUpdate("foo", columns=("id", "bar"), rows=[(1, 2)], keys=("id",)),
+    ],
+)
+def test_registry_multi_statement(default_registry, statement):
+    with pytest.raises(TypeError):
+        default_registry.plan("conn", statement)
+    assert len(default_registry.prepared("conn")) == 0
+
+
+def test_registry_server_side_style(default_registry, default_select):
+    with pytest.raises(TypeError):
+        default_registry.plan("conn", default_select, que.NumParamStyle.DOL)
+    registry = que.PreparedRegistry(que.Dialect.MYSQL)
+    assert len(registry.plan("conn", default_select, que.NumParamStyle.DOL)) == 3
+
+
+def test_registry_unsupported_dialect():
+    with pytest.raises(TypeError):
+        que.PreparedRegistry(que.Dialect.SQLITE)
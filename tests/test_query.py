@@ -1,5 +1,12 @@
 #!/usr/bin/env python
 # -*- coding: UTF-8 -*-
+import copy
+import dataclasses
+import os
+import pickle
+import sqlite3
+import sys
+import timeit
 from dataclasses import dataclass
 from typing import NamedTuple
 
@@ -56,7 +63,7 @@ def test_filter_invalid():
 
 
 def test_base_write_invalid(default_field_list):
-    default_field_list[0].name = None
+    default_field_list[0] = que.Field(value="bar")
     with pytest.raises(TypeError):
         que.query._BaseWriteStatement("foo", "bar", fields=default_field_list)
 
@@ -252,3 +259,1204 @@ def test_append_filterlist():
 def test_append_filterlist_invalid():
     with pytest.raises(TypeError):
         que.FilterList().append("foo")
+
+
+@pytest.fixture
+def default_insert_many() -> que.InsertMany:
+    return que.InsertMany.from_records(
+        "foo", [{"foo": "bar", "id": x} for x in range(3)], schema="bar"
+    )
+
+
+def test_insert_many_default_style(default_insert_many):
+    [(sql, args)] = default_insert_many.to_sql()
+    assert sql == (
+        "INSERT INTO\n  bar.foo (:1, :2)\nVALUES\n  (:3, :4),\n  (:5, :6),\n  (:7, :8)\n"
+    )
+    assert args == ["foo", "id", "bar", 0, "bar", 1, "bar", 2]
+
+
+def test_insert_many_inject_columns(default_insert_many):
+    [(sql, args)] = default_insert_many.to_sql(inject_columns=True)
+    assert sql == (
+        "INSERT INTO\n  bar.foo (foo, id)\nVALUES\n  (:1, :2),\n  (:3, :4),\n  (:5, :6)\n"
+    )
+    assert args == ["bar", 0, "bar", 1, "bar", 2]
+
+
+def test_insert_many_dollar_style(default_insert_many):
+    [(sql, args)] = default_insert_many.to_sql(que.NumParamStyle.DOL, True)
+    assert sql.endswith("VALUES\n  ($1, $2),\n  ($3, $4),\n  ($5, $6)\n")
+
+
+def test_insert_many_name_style(default_insert_many):
+    [(sql, args)] = default_insert_many.to_sql(que.NameParamStyle.NAME)
+    assert sql == (
+        "INSERT INTO\n  bar.foo (:colfoo, :colid)\nVALUES\n"
+        "  (:valfoo_0, :valid_0),\n  (:valfoo_1, :valid_1),\n  (:valfoo_2, :valid_2)\n"
+    )
+    assert args["colid"] == "id"
+    assert args["valid_2"] == 2
+    assert len(args) == 8
+
+
+def test_insert_many_pyformat_style(default_insert_many):
+    [(sql, args)] = default_insert_many.to_sql(que.NameParamStyle.PYFM, True)
+    assert sql.endswith("(%(valfoo_2)s, %(valid_2)s)\n")
+    assert len(args) == 6
+
+
+@pytest.mark.parametrize("style", [*que.BasicParamStyle])
+def test_insert_many_basic_style(default_insert_many, style):
+    [(sql, args)] = default_insert_many.to_sql(style, True)
+    assert sql.endswith(
+        f"VALUES\n  ({style}, {style}),\n  ({style}, {style}),\n  ({style}, {style})\n"
+    )
+    assert len(args) == 6
+
+
+def test_insert_many_get_returning(default_insert_many):
+    default_insert_many.returns = que.Field("id")
+    for sql, args in default_insert_many.to_sql():
+        assert sql.endswith("RETURNING id")
+
+
+@pytest.mark.parametrize(
+    "dialect, size",
+    [
+        (que.Dialect.POSTGRES, 32767 // 2),
+        (que.Dialect.MYSQL, 65535 // 2),
+        (que.Dialect.SQLITE, 32766 // 2),
+        (que.Dialect.SQLITE_LEGACY, 999 // 2),
+    ],
+)
+def test_insert_many_dialect_chunk_size(default_insert_many, dialect, size):
+    default_insert_many.dialect = dialect
+    default_insert_many.max_params = None
+    default_insert_many.__post_init__()
+    assert default_insert_many.chunk_size(inject_columns=True) == size
+
+
+@pytest.mark.parametrize(
+    "style", [*que.BasicParamStyle, *que.NumParamStyle, *que.NameParamStyle]
+)
+def test_insert_many_chunks_params(style):
+    insert = que.InsertMany(
+        "foo", columns=("a", "b", "c"), rows=[(x, x, x) for x in range(5)], max_params=9
+    )
+    chunks = insert.to_sql(style)
+    assert [len(args) for _, args in chunks] == [9, 9, 6]
+    _, args = chunks[-1]
+    values = list(args.values()) if isinstance(args, dict) else args
+    assert values == ["a", "b", "c", 4, 4, 4]
+
+
+def test_insert_many_chunks_bytes():
+    insert = que.InsertMany(
+        "foo", columns=("a",), rows=[(x,) for x in range(100)], max_bytes=128
+    )
+    chunks = insert.to_sql(que.BasicParamStyle.QM, True)
+    assert all(len(sql.encode()) <= 128 for sql, _ in chunks)
+    assert sum(len(args) for _, args in chunks) == 100
+
+
+def test_insert_many_row_too_wide():
+    insert = que.InsertMany("foo", columns=("a", "b"), rows=[(1, 2)], max_params=3)
+    with pytest.raises(TypeError):
+        insert.to_sql()
+
+
+def test_insert_many_mismatched_records():
+    with pytest.raises(TypeError):
+        que.InsertMany.from_records("foo", [{"foo": 1}, {"bar": 1}])
+
+
+def test_insert_many_empty():
+    with pytest.raises(TypeError):
+        que.InsertMany.from_records("foo", [])
+
+
+def test_insert_many_mixed_records():
+    @dataclass
+    class FooBar:
+        foo: str
+
+    class BarFoo(NamedTuple):
+        foo: str
+
+    insert = que.InsertMany.from_records(
+        "foo",
+        [
+            FooBar("a"),
+            BarFoo("b"),
+            {"foo": "c"},
+            que.FieldList([que.Field("foo", "d")]),
+        ],
+    )
+    assert insert.rows == [("a",), ("b",), ("c",), ("d",)]
+
+
+@pytest.mark.parametrize("style", [que.BasicParamStyle.QM, que.NameParamStyle.NAME])
+def test_insert_many_sqlite(style):
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE foo (id INTEGER, name TEXT)")
+    insert = que.InsertMany.from_records(
+        "foo",
+        ({"id": x, "name": str(x)} for x in range(1000)),
+        dialect=que.Dialect.SQLITE_LEGACY,
+    )
+    chunks = insert.to_sql(style, inject_columns=True)
+    assert len(chunks) == 3
+    for sql, args in chunks:
+        conn.execute(sql, args)
+    assert conn.execute("SELECT COUNT(*), SUM(id) FROM foo").fetchone() == (
+        1000,
+        499500,
+    )
+
+
+def test_insert_duplicate_fields_positions():
+    insert = que.Insert(
+        "foo", fields=[que.Field("foo", "bar"), que.Field("foo", "bar")]
+    )
+    sql, args = insert.build_insert()
+    assert sql == "INSERT INTO\n  foo (:1,\n  :2)\nVALUES\n  (:3,\n  :4)\n"
+
+
+@pytest.mark.skipif(
+    not os.environ.get("QUE_TIMING_TESTS"),
+    reason="Set QUE_TIMING_TESTS=1 to run timing tests.",
+)
+def test_insert_wide_linear():
+    def best(width: int) -> float:
+        fields = [que.Field(f"column_{x}", x) for x in range(width)]
+        insert = que.Insert("foo", fields=fields)
+        return min(timeit.repeat(insert._render, number=3, repeat=5))
+
+    # Quadratic rendering would grow ~100x; allow plenty of room for noise.
+    assert best(2000) / best(200) < 30
+
+
+def test_insert_to_sql_many(default_insert):
+    records = [{"foo": "bar"}, {"foo": "baz"}]
+    sql, args = default_insert.to_sql_many(records)
+    assert sql == default_insert.to_sql()[0]
+    assert list(args) == [("foo", "bar"), ("foo", "baz")]
+
+
+def test_insert_to_sql_many_name_style(default_insert):
+    class FooBar(NamedTuple):
+        foo: str
+
+    sql, args = default_insert.to_sql_many(
+        [FooBar("bar"), [("foo", "baz")]], que.NameParamStyle.NAME, inject_columns=True
+    )
+    assert sql == "INSERT INTO\n  bar.foo (foo)\nVALUES\n  (:valfoo)\n"
+    assert list(args) == [{"valfoo": "bar"}, {"valfoo": "baz"}]
+
+
+def test_update_to_sql_many():
+    @dataclass
+    class FooBar:
+        foo: str
+        id: int
+
+    update = que.Update(
+        "foo",
+        fields=[que.Field("foo", "bar")],
+        filters=[que.Filter(que.Field("id", 1))],
+    )
+    sql, args = update.to_sql_many([FooBar("baz", 2)], que.NameParamStyle.PYFM)
+    assert sql == update.to_sql(que.NameParamStyle.PYFM)[0]
+    assert list(args) == [{"colfoo": "baz", "id": 2}]
+
+
+def test_update_to_sql_many_overlap(default_update):
+    # The SET and WHERE values of "foo" can't both come from one record.
+    with pytest.raises(TypeError, match="foo"):
+        default_update.to_sql_many([{"foo": "bar"}], que.BasicParamStyle.QM)
+
+
+def test_to_sql_many_lazy(default_insert):
+    def records():
+        yield {"foo": "bar"}
+        raise AssertionError("Records were consumed eagerly.")
+
+    sql, args = default_insert.to_sql_many(records())
+    assert next(args) == ("foo", "bar")
+
+
+@pytest.mark.parametrize("style", [que.BasicParamStyle.QM, que.NameParamStyle.NAME])
+def test_to_sql_many_sqlite(style):
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE foo (id INTEGER, name TEXT)")
+    insert = que.Insert("foo", fields=[que.Field("id", 0), que.Field("name", "")])
+    conn.executemany(
+        *insert.to_sql_many(
+            ({"id": x, "name": str(x)} for x in range(100)), style, inject_columns=True
+        )
+    )
+    update = que.Update(
+        "foo",
+        fields=[que.Field("name", "")],
+        filters=[que.Filter(que.Field("id", 0))],
+    )
+    conn.executemany(
+        *update.to_sql_many(({"id": x, "name": "updated"} for x in range(50)), style)
+    )
+    assert conn.execute(
+        "SELECT COUNT(*) FROM foo WHERE name = 'updated'"
+    ).fetchone() == (50,)
+
+
+def test_field_frozen():
+    field = que.Field("foo", "bar")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        field.name = "bar"
+    assert not hasattr(field, "__dict__")
+    assert hash(field) == hash(que.Field("foo", "bar"))
+
+
+def test_filter_frozen():
+    fylter = que.Filter(que.Field("foo", "bar"))
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        fylter.prefix = "bar"
+    assert not hasattr(fylter, "__dict__")
+    assert fylter in {que.Filter(que.Field("foo", "bar"))}
+
+
+def test_field_pickle():
+    field = que.Field("foo", "bar")
+    fylter = que.Filter(field, que.CmpOps.GT)
+    assert pickle.loads(pickle.dumps(field)) == field
+    assert pickle.loads(pickle.dumps(fylter)) == fylter
+
+
+def test_data_to_fields_interns_names():
+    name = "".join(["fo", "o"])
+    (field,) = que.data_to_fields({name: "bar"})
+    assert field.name is sys.intern("foo")
+
+
+def test_data_to_fields_extractor_cached():
+    @dataclass
+    class FooBar:
+        foo: str
+        bar: int = None
+
+    fields = que.data_to_fields(FooBar("bar"))
+    assert fields == que.FieldList([que.Field("foo", "bar"), que.Field("bar", None)])
+    assert que.query.get_extractor(FooBar) is que.query._EXTRACTORS[FooBar]
+
+
+@pytest.mark.parametrize(
+    "exclude, expected",
+    [(None, [("foo", "bar"), ("baz", 0)]), (int, [("foo", "bar"), ("bar", None)])],
+)
+def test_data_to_fields_extractor_exclude(exclude, expected):
+    @dataclass
+    class FooBar:
+        foo: str
+        bar: int = None
+        baz: int = 0
+
+    class BarFoo(NamedTuple):
+        foo: str
+        bar: int = None
+        baz: int = 0
+
+    expected = que.FieldList([que.Field(*x) for x in expected])
+    assert que.data_to_fields(FooBar("bar"), exclude=exclude) == expected
+    assert que.data_to_fields(BarFoo("bar"), exclude=exclude) == expected
+    assert que.data_to_fields(BarFoo("bar")._asdict(), exclude=exclude) == expected
+
+
+def test_data_to_fields_nested_not_copied():
+    @dataclass
+    class Bar:
+        baz: list
+
+    @dataclass
+    class Foo:
+        bar: Bar
+
+    bar = Bar([1])
+    (field,) = que.data_to_fields(Foo(bar))
+    assert field.value is bar
+
+
+def test_data_to_fields_dataclass_type():
+    @dataclass
+    class FooBar:
+        foo: str
+
+    with pytest.raises(TypeError):
+        que.data_to_fields(FooBar)
+
+
+def test_get_extractor_invalid():
+    assert que.query.get_extractor(dict) is None
+    assert que.query.get_extractor(tuple) is None
+
+
+@dataclass
+class Row:
+    id: int
+    name: str
+    kind: str = "spam"
+    tags: list = dataclasses.field(default_factory=list)
+
+
+class RowTuple(NamedTuple):
+    id: int
+    name: str
+    kind: str = "spam"
+
+
+@pytest.mark.parametrize("cls", [Row, RowTuple])
+@pytest.mark.parametrize(
+    "fields, rows, expected",
+    [
+        # The row is the constructor's arguments, as-is.
+        (["id", "name"], [(1, "a"), (2, "b")], [(1, "a", "spam"), (2, "b", "spam")]),
+        # Re-ordered, aliased and qualified columns, and columns which aren't used.
+        (
+            [que.Field("name"), que.Field("foo.extra"), que.Field("foo_id", "id")],
+            [("a", 0, 1)],
+            [(1, "a", "spam")],
+        ),
+        # A gap before the last attribute.
+        (["id", "kind", "other"], [(1, "eggs", 0)], None),
+    ],
+)
+def test_decoder(cls, fields, rows, expected):
+    if expected is None:
+        fields = ["name", "kind", "id"]
+        rows = [("a", "eggs", 1)]
+        expected = [(1, "a", "eggs")]
+    decoder = que.get_decoder(cls, fields)
+    decoded = decoder.decode_many(rows)
+    assert all(type(x) is cls for x in decoded)
+    assert [(x.id, x.name, x.kind) for x in decoded] == expected
+    assert decoder.decode(rows[0]) == decoded[0]
+    assert que.get_decoder(cls, fields) is decoder
+
+
+def test_decoder_default_factory():
+    decoder = que.get_decoder(Row, ["id", "name", "kind"])
+    first, second = decoder.decode_many([(1, "a", "spam"), (2, "b", "eggs")])
+    assert first.tags == [] and first.tags is not second.tags
+
+
+def test_decoder_gap_uses_keywords():
+    decoder = que.get_decoder(Row, ["tags", "name", "id"])
+    assert decoder.decode(([1], "a", 1)) == Row(1, "a", tags=[1])
+
+
+def test_select_decoder():
+    select = que.Select("foo", fields=[que.Field("id"), que.Field("name")])
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE foo (id INTEGER, name TEXT)")
+    connection.execute("INSERT INTO foo VALUES (1, 'a'), (2, 'b')")
+    rows = connection.execute(*select.to_sql(que.BasicParamStyle.QM)).fetchall()
+    assert select.decoder(RowTuple).decode_many(rows) == [
+        RowTuple(1, "a"),
+        RowTuple(2, "b"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "cls, fields",
+    [(dict, ["id"]), (tuple, ["id"]), (Row(1, "a"), ["id"]), (Row, []), (Row, ["id"])],
+)
+def test_decoder_invalid(cls, fields):
+    with pytest.raises(TypeError):
+        que.get_decoder(cls, fields)
+
+
+#: The SQL and args rendered for each param-style by the original, ArgList-based
+#: builders (before the single-pass compiler).
+GOLDEN_RENDER = [
+    (
+        que.BasicParamStyle.QM,
+        {
+            "select": ("SELECT\n  a\nFROM\n  bar.foo\nWHERE\n  a = ?", [3]),
+            "update": (
+                "UPDATE\n  foo\nSET\n  a = ?,\n  b = ?\nWHERE\n  a = ?\nRETURNING id",
+                [1, 2, 3],
+            ),
+            "insert": (
+                "INSERT INTO\n  foo (?,\n  ?)\nVALUES\n  (?,\n  ?)\nRETURNING id",
+                ["a", "b", 1, 2],
+            ),
+            "delete": ("DELETE FROM\n  foo\nWHERE\n  a = ?\nRETURNING id", [3]),
+            "insert-inject": (
+                "INSERT INTO\n  foo (a, b)\nVALUES\n  (?,\n  ?)\nRETURNING id",
+                [1, 2],
+            ),
+        },
+    ),
+    (
+        que.BasicParamStyle.FM,
+        {
+            "select": ("SELECT\n  a\nFROM\n  bar.foo\nWHERE\n  a = %s", [3]),
+            "update": (
+                "UPDATE\n  foo\nSET\n  a = %s,\n  b = %s\nWHERE\n  a = %s\nRETURNING id",
+                [1, 2, 3],
+            ),
+            "insert": (
+                "INSERT INTO\n  foo (%s,\n  %s)\nVALUES\n  (%s,\n  %s)\nRETURNING id",
+                ["a", "b", 1, 2],
+            ),
+            "delete": ("DELETE FROM\n  foo\nWHERE\n  a = %s\nRETURNING id", [3]),
+            "insert-inject": (
+                "INSERT INTO\n  foo (a, b)\nVALUES\n  (%s,\n  %s)\nRETURNING id",
+                [1, 2],
+            ),
+        },
+    ),
+    (
+        que.NumParamStyle.NUM,
+        {
+            "select": ("SELECT\n  a\nFROM\n  bar.foo\nWHERE\n  a = :1", [3]),
+            "update": (
+                "UPDATE\n  foo\nSET\n  a = :1,\n  b = :2\nWHERE\n  a = :3\nRETURNING id",
+                [1, 2, 3],
+            ),
+            "insert": (
+                "INSERT INTO\n  foo (:1,\n  :2)\nVALUES\n  (:3,\n  :4)\nRETURNING id",
+                ["a", "b", 1, 2],
+            ),
+            "delete": ("DELETE FROM\n  foo\nWHERE\n  a = :1\nRETURNING id", [3]),
+            "insert-inject": (
+                "INSERT INTO\n  foo (a, b)\nVALUES\n  (:1,\n  :2)\nRETURNING id",
+                [1, 2],
+            ),
+        },
+    ),
+    (
+        que.NumParamStyle.DOL,
+        {
+            "select": ("SELECT\n  a\nFROM\n  bar.foo\nWHERE\n  a = $1", [3]),
+            "update": (
+                "UPDATE\n  foo\nSET\n  a = $1,\n  b = $2\nWHERE\n  a = $3\nRETURNING id",
+                [1, 2, 3],
+            ),
+            "insert": (
+                "INSERT INTO\n  foo ($1,\n  $2)\nVALUES\n  ($3,\n  $4)\nRETURNING id",
+                ["a", "b", 1, 2],
+            ),
+            "delete": ("DELETE FROM\n  foo\nWHERE\n  a = $1\nRETURNING id", [3]),
+            "insert-inject": (
+                "INSERT INTO\n  foo (a, b)\nVALUES\n  ($1,\n  $2)\nRETURNING id",
+                [1, 2],
+            ),
+        },
+    ),
+    (
+        que.NameParamStyle.NAME,
+        {
+            "select": ("SELECT\n  a\nFROM\n  bar.foo\nWHERE\n  a = :fa", {"fa": 3}),
+            "update": (
+                "UPDATE\n  foo\nSET\n  a = :cola,\n  b = :colb\nWHERE\n  a = :fa\nRETURNING id",
+                {"cola": 1, "colb": 2, "fa": 3},
+            ),
+            "insert": (
+                "INSERT INTO\n  foo (:cola,\n  :colb)\nVALUES\n  (:vala,\n  :valb)\nRETURNING id",
+                {"cola": "a", "colb": "b", "vala": 1, "valb": 2},
+            ),
+            "delete": ("DELETE FROM\n  foo\nWHERE\n  a = :fa\nRETURNING id", {"fa": 3}),
+            "insert-inject": (
+                "INSERT INTO\n  foo (a, b)\nVALUES\n  (:vala,\n  :valb)\nRETURNING id",
+                {"vala": 1, "valb": 2},
+            ),
+        },
+    ),
+    (
+        que.NameParamStyle.PYFM,
+        {
+            "select": ("SELECT\n  a\nFROM\n  bar.foo\nWHERE\n  a = %(fa)s", {"fa": 3}),
+            "update": (
+                "UPDATE\n  foo\nSET\n  a = %(cola)s,\n  b = %(colb)s\nWHERE\n  a = %(fa)s\nRETURNING id",
+                {"cola": 1, "colb": 2, "fa": 3},
+            ),
+            "insert": (
+                "INSERT INTO\n  foo (%(cola)s,\n  %(colb)s)\nVALUES\n  (%(vala)s,\n  %(valb)s)\nRETURNING id",
+                {"cola": "a", "colb": "b", "vala": 1, "valb": 2},
+            ),
+            "delete": (
+                "DELETE FROM\n  foo\nWHERE\n  a = %(fa)s\nRETURNING id",
+                {"fa": 3},
+            ),
+            "insert-inject": (
+                "INSERT INTO\n  foo (a, b)\nVALUES\n  (%(vala)s,\n  %(valb)s)\nRETURNING id",
+                {"vala": 1, "valb": 2},
+            ),
+        },
+    ),
+]
+
+
+@pytest.mark.parametrize("style, golden", GOLDEN_RENDER)
+def test_render_golden(style, golden):
+    fields = [que.Field("a", 1), que.Field("b", 2)]
+    filters = [que.Filter(que.Field("a", 3), prefix="f")]
+    returns = que.Field("id")
+    insert = que.Insert("foo", fields=fields, returns=returns)
+    rendered = {
+        "select": que.Select(
+            "foo", schema="bar", fields=[que.Field("a")], filters=filters
+        ).to_sql(style),
+        "update": que.Update(
+            "foo", fields=fields, filters=filters, returns=returns
+        ).to_sql(style),
+        "insert": insert.to_sql(style),
+        "delete": que.Delete("foo", filters=filters, returns=returns).to_sql(style),
+        "insert-inject": insert.to_sql(style, inject_columns=True),
+    }
+    assert rendered == golden
+    # The builders are kept for compatibility, and render the same SQL.
+    sql, args = insert.build_insert(style)
+    assert (sql, args.for_sql(style)) == golden["insert"]
+
+
+def filter_render(statement, style):
+    """Render a Select or Delete with the public, ArgList-based filter builders."""
+    where, args = statement.filters.to_sql(style=style)
+    if isinstance(statement, que.Select):
+        return f"{statement.build_select()}\n{where}", args.for_sql(style)
+    sql = f"DELETE FROM\n  {statement.table_name}\n{where}\n"
+    return sql + statement.get_returning(), args.for_sql(style)
+
+
+@pytest.mark.parametrize(
+    "style", [*que.BasicParamStyle, *que.NumParamStyle, *que.NameParamStyle]
+)
+@pytest.mark.parametrize("width", [1, 3])
+def test_render_matches_filter_builders(style, width):
+    fields = [que.Field(f"col_{x}", x + 1) for x in range(width)]
+    filters = [que.Filter(x, prefix="f") for x in fields] + [
+        que.Filter(que.Field("ids", list(range(width))), opcode=que.LogOps.IN),
+        que.Filter(que.Field("tags", ["a"] * width), opcode=que.LogOps.ANY),
+    ]
+    statements = [
+        que.Select("foo", schema="bar", fields=fields[:1], filters=filters),
+        que.Select("foo"),
+        que.Delete("foo", filters=filters, returns=que.Field("id")),
+    ]
+    for statement in statements:
+        assert statement._render(style) == filter_render(statement, style)
+
+
+class OnlyUpdate(que.Update):
+    def build_update(self, style=que.DEFAULT_PARAM_STYLE):
+        update, args = super().build_update(style)
+        return update.replace("UPDATE", "UPDATE ONLY", 1), args
+
+
+class IgnoreInsert(que.Insert):
+    def build_insert(self, style=que.DEFAULT_PARAM_STYLE, *, inject_columns=False):
+        sql, args = super().build_insert(style, inject_columns=inject_columns)
+        return sql.replace("INSERT", "INSERT OR IGNORE", 1), args
+
+
+@pytest.mark.parametrize("style", [que.NumParamStyle.NUM, que.NameParamStyle.NAME])
+def test_builder_override(style):
+    fields = [que.Field("bar", 1)]
+    update = OnlyUpdate("foo", fields=fields, filters=[que.Filter(fields[0])])
+    sql, args = update.to_sql(style)
+    assert sql.startswith("UPDATE ONLY\n  foo")
+    assert (
+        args
+        == que.Update("foo", fields=fields, filters=update.filters).to_sql(style)[1]
+    )
+    insert = IgnoreInsert("foo", fields=fields)
+    assert insert.to_sql(style, inject_columns=True)[0].startswith("INSERT OR IGNORE")
+    sql, records = insert.to_sql_many([{"bar": 2}], style, inject_columns=True)
+    assert sql.startswith("INSERT OR IGNORE")
+    # Plain statements aren't affected, whichever renders first.
+    assert que.Update("foo", fields=fields).to_sql(style)[0].startswith("UPDATE\n")
+    assert que.Insert("foo", fields=fields).to_sql(style)[0].startswith("INSERT INTO")
+
+
+def test_builder_override_sqlite():
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE foo (bar INTEGER PRIMARY KEY)")
+    insert = IgnoreInsert("foo", fields=[que.Field("bar", 1)])
+    for _ in range(2):
+        connection.execute(*insert.to_sql(que.BasicParamStyle.QM, inject_columns=True))
+    assert connection.execute("SELECT bar FROM foo").fetchall() == [(1,)]
+
+
+def test_compiler_names():
+    compiler = que.query._Compiler(que.NumParamStyle.DOL)
+    assert compiler.param("foo", 1) == "$1"
+    assert compiler.param("bar", 2) == "$2"
+    compiler.write("a", " = ", "$1")
+    assert compiler.compiled() == ("a = $1", ("foo", "bar"))
+    assert compiler.args == [1, 2]
+
+
+def test_update_null_value():
+    update = que.Update("foo", fields=[que.Field("bar", None)])
+    assert update.to_sql() == ("UPDATE\n  foo\nSET\n  bar = :1\n\n", [None])
+
+
+@pytest.fixture
+def default_arg_list() -> que.ArgList:
+    return que.ArgList([que.Field("foo", 1), que.Field("bar", 2)])
+
+
+def test_arg_list_arrays(default_arg_list):
+    assert default_arg_list.fields() == ("foo", "bar")
+    assert default_arg_list.values() == (1, 2)
+    assert default_arg_list.asdict() == {"foo": 1, "bar": 2}
+    assert default_arg_list.aslist() == [1, 2]
+    assert default_arg_list == que.FieldList([que.Field("foo", 1), que.Field("bar", 2)])
+    assert que.ArgList.from_arrays(["foo", "bar"], [1, 2]) == default_arg_list
+
+
+def test_arg_list_unnamed():
+    args = que.ArgList([que.Field(value="foo"), que.Field("bar", 2)])
+    assert args.fields() == ("bar",)
+    assert args.asdict() == {"bar": 2}
+    assert args.values() == ("foo", 2)
+
+
+def test_arg_list_from_arrays_invalid():
+    with pytest.raises(TypeError):
+        que.ArgList.from_arrays(["foo"], [1, 2])
+    with pytest.raises(TypeError):
+        que.ArgList.from_arrays([None], [0])
+
+
+def test_arg_list_lookups(default_arg_list):
+    foo = que.Field("foo", 1)
+    assert foo in default_arg_list
+    assert que.Field("foo", 2) not in default_arg_list
+    assert "foo" not in default_arg_list
+    default_arg_list.append(foo)
+    assert default_arg_list.count(foo) == 2
+    assert default_arg_list.count("foo") == 0
+    assert default_arg_list.index(foo) == 0
+    assert default_arg_list.index(foo, 1) == 2
+    assert default_arg_list.index(foo, -1) == 2
+    with pytest.raises(ValueError):
+        default_arg_list.index(foo, 1, 2)
+    with pytest.raises(ValueError):
+        default_arg_list.index(que.Field("baz", 3))
+    assert default_arg_list == [foo, que.Field("bar", 2), foo]
+    assert default_arg_list != [foo, que.Field("bar", 2)]
+    assert default_arg_list != (foo, que.Field("bar", 2), foo)
+    assert default_arg_list == que.ArgList(default_arg_list)
+
+
+def test_arg_list_view(default_arg_list):
+    view = default_arg_list.view()
+    assert view == (1, 2)
+    assert default_arg_list.view(que.BasicParamStyle.QM) is view
+    mapping = default_arg_list.view(que.NameParamStyle.NAME)
+    assert mapping == {"foo": 1, "bar": 2}
+    with pytest.raises(TypeError):
+        mapping["foo"] = 3
+    default_arg_list.append(que.Field("baz", 3))
+    assert default_arg_list.view() == (1, 2, 3)
+    assert default_arg_list.view(que.NameParamStyle.PYFM)["baz"] == 3
+
+
+def test_arg_list_mutations(default_arg_list):
+    default_arg_list[-1] = que.Field("baz", 3)
+    assert default_arg_list[-1] == que.Field("baz", 3)
+    default_arg_list.insert(0, que.Field("first", 0))
+    default_arg_list += [que.Field("last", 4)]
+    assert default_arg_list.fields() == ("first", "foo", "baz", "last")
+    assert default_arg_list.pop() == que.Field("last", 4)
+    del default_arg_list[0]
+    default_arg_list.remove(que.Field("foo", 1))
+    assert default_arg_list.asdict() == {"baz": 3}
+    default_arg_list.extend(que.ArgList([que.Field("foo", 1)]))
+    default_arg_list.reverse()
+    assert default_arg_list.values() == (1, 3)
+    default_arg_list.sort(key=lambda x: x.value)
+    assert default_arg_list.values() == (1, 3)
+    assert isinstance(default_arg_list[:1], que.ArgList)
+    assert default_arg_list[:1].values() == (1,)
+    with pytest.raises(TypeError):
+        default_arg_list[0] = "foo"
+    with pytest.raises(TypeError):
+        que.ArgList(["foo"])
+
+
+def test_arg_list_data_read_only(default_arg_list):
+    assert default_arg_list.data == [que.Field("foo", 1), que.Field("bar", 2)]
+    with pytest.raises(TypeError):
+        default_arg_list.data.append(que.Field("baz", 3))
+    with pytest.raises(TypeError):
+        default_arg_list.data[0] = que.Field("baz", 3)
+    assert len(default_arg_list) == 2
+    default_arg_list.data = [que.Field("baz", 3)]
+    assert default_arg_list.asdict() == {"baz": 3}
+
+
+def test_arg_list_copy(default_arg_list):
+    # The cached, read-only views aren't copied.
+    default_arg_list.view(que.NameParamStyle.NAME)
+    for duplicate in (
+        copy.copy(default_arg_list),
+        default_arg_list.copy(),
+        pickle.loads(pickle.dumps(default_arg_list)),
+        copy.deepcopy(default_arg_list),
+    ):
+        assert duplicate == default_arg_list
+        duplicate.clear()
+        assert len(default_arg_list) == 2
+
+
+@pytest.mark.parametrize(
+    "style, expected",
+    [
+        (que.NumParamStyle.NUM, "id IN (:1, :2, :3, :4)"),
+        (que.NumParamStyle.DOL, "id IN ($1, $2, $3, $4)"),
+        (que.BasicParamStyle.QM, "id IN (?, ?, ?, ?)"),
+        (que.NameParamStyle.NAME, "id IN (:fid_0, :fid_1, :fid_2, :fid_3)"),
+        (que.NameParamStyle.PYFM, "id IN (%(fid_0)s, %(fid_1)s, %(fid_2)s, %(fid_3)s)"),
+    ],
+)
+def test_filter_in(style, expected):
+    fylter = que.Filter(que.Field("id", (1, 2, 3)), opcode=que.LogOps.IN, prefix="f")
+    sql, args = que.Select("foo", filters=[fylter]).to_sql(style)
+    assert sql == f"SELECT\n  *\nFROM\n  foo\nWHERE\n  {expected}"
+    if style in que.NameParamStyle:
+        assert args == {"fid_0": 1, "fid_1": 2, "fid_2": 3, "fid_3": 3}
+    else:
+        assert args == [1, 2, 3, 3]
+
+
+def test_filter_in_buckets():
+    que.STATEMENT_CACHE.clear()
+    statements = set()
+    for size in range(1, 33):
+        fylter = que.Filter(que.Field("id", range(size)), opcode=que.LogOps.IN)
+        sql, args = que.Delete("foo", filters=[fylter]).to_sql()
+        assert len(args) == fylter.bucket >= size
+        assert set(args) == set(range(size))
+        statements.add(sql)
+    # Sizes 1, 2, 4, 8, 16 and 32.
+    assert len(statements) == 6
+    assert que.STATEMENT_CACHE.info().misses == 6
+
+
+def test_filter_any():
+    fylter = que.Filter(que.Field("id", {1}), opcode=que.LogOps.ANY)
+    update = que.Update("foo", fields=[que.Field("bar", 1)], filters=[fylter])
+    sql, args = update.to_sql(que.NumParamStyle.DOL)
+    assert sql == "UPDATE\n  foo\nSET\n  bar = $1\nWHERE\n  id = ANY($2)\n"
+    assert args == [1, [1]]
+    assert fylter.bucket is None
+
+
+def test_filter_opcode_string():
+    fylter = que.Filter(que.Field("id", [1, 2]), opcode="IN")
+    assert fylter.opcode is que.LogOps.IN
+    assert que.Select("foo", filters=[fylter]).to_sql() == (
+        "SELECT\n  *\nFROM\n  foo\nWHERE\n  id IN (:1, :2)",
+        [1, 2],
+    )
+    assert que.Filter(que.Field("id", 1), opcode=">=").opcode is que.CmpOps.GE
+    with pytest.raises(TypeError):
+        que.Filter(que.Field("id", 1), opcode="IN")
+
+
+@pytest.mark.parametrize(
+    "value, opcode",
+    [([], que.LogOps.IN), ("foo", que.LogOps.IN), ({"a": 1}, que.LogOps.ANY)],
+)
+def test_filter_collection_invalid(value, opcode):
+    with pytest.raises(TypeError):
+        que.Filter(que.Field("id", value), opcode=opcode)
+
+
+def test_filter_in_to_sql_many_invalid():
+    fylter = que.Filter(que.Field("id", [1]), opcode=que.LogOps.IN)
+    update = que.Update("foo", fields=[que.Field("bar", 1)], filters=[fylter])
+    with pytest.raises(TypeError):
+        update.to_sql_many([{"bar": 1, "id": 1}])
+
+
+@pytest.mark.parametrize("style", [que.BasicParamStyle.QM, que.NameParamStyle.NAME])
+def test_filter_in_sqlite(style):
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE foo (id INTEGER)")
+    conn.executemany("INSERT INTO foo VALUES (?)", [(x,) for x in range(10)])
+    fylter = que.Filter(que.Field("id", [2, 3, 5]), opcode=que.LogOps.IN)
+    select = que.Select("foo", fields=[que.Field("id")], filters=[fylter])
+    assert conn.execute(*select.to_sql(style)).fetchall() == [(2,), (3,), (5,)]
+
+
+@pytest.mark.parametrize("style", [que.NumParamStyle.NUM, que.NameParamStyle.NAME])
+def test_select_many_filters_sqlite(style):
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE foo (a INTEGER, b INTEGER)")
+    conn.executemany("INSERT INTO foo VALUES (?, ?)", [(1, 2), (1, 3)])
+    filters = [que.Filter(que.Field("a", 1)), que.Filter(que.Field("b", 2))]
+    sql, args = que.Select("foo", filters=filters).to_sql(style)
+    assert "a = :" in sql and " AND\n  b = :" in sql
+    assert conn.execute(sql, args).fetchall() == [(1, 2)]
+
+
+@pytest.fixture
+def default_keyset() -> que.Keyset:
+    select = que.Select(
+        "foo",
+        fields=[que.Field("kind"), que.Field("created"), que.Field("id")],
+        filters=[que.Filter(que.Field("kind", "bar"), prefix="f")],
+    )
+    return select.keyset(["created", "id"], size=2)
+
+
+@pytest.mark.parametrize(
+    "style, row_values, expected, args",
+    [
+        (que.NumParamStyle.DOL, True, "(created, id) > ($2, $3)", ["bar", 5, 1]),
+        (
+            que.NumParamStyle.DOL,
+            False,
+            "(created > $2 OR (created = $3 AND id > $4))",
+            ["bar", 5, 5, 1],
+        ),
+        (
+            que.BasicParamStyle.QM,
+            False,
+            "(created > ? OR (created = ? AND id > ?))",
+            None,
+        ),
+        (
+            que.NameParamStyle.NAME,
+            True,
+            "(created, id) > (:after_created, :after_id)",
+            {"fkind": "bar", "after_created": 5, "after_id": 1},
+        ),
+        (
+            que.NameParamStyle.PYFM,
+            False,
+            "(created > %(after_created)s OR "
+            "(created = %(after_created)s AND id > %(after_id)s))",
+            {"fkind": "bar", "after_created": 5, "after_id": 1},
+        ),
+    ],
+)
+def test_keyset_next_page(default_keyset, style, row_values, expected, args):
+    keyset = dataclasses.replace(default_keyset, row_values=row_values)
+    sql, actual = keyset.next_page({"created": 5, "id": 1}).to_sql(style)
+    assert f"AND\n  {expected}\nORDER BY\n  created, id\nLIMIT 2" in sql
+    assert args is None or actual == args
+
+
+def test_keyset_first_page(default_keyset):
+    page = default_keyset.next_page({"created": 5, "id": 1}).first_page()
+    assert page.seek is None
+    assert page.to_sql() == (
+        "SELECT\n  kind,\n  created,\n  id\nFROM\n  foo\nWHERE\n  kind = :1\n"
+        "ORDER BY\n  created, id\nLIMIT 2",
+        ["bar"],
+    )
+
+
+def test_keyset_descending_no_filters():
+    keyset = que.Select("foo").keyset(["id"], size=10, descending=True)
+    sql, args = keyset.next_page({"id": 7}).to_sql()
+    assert sql == (
+        "SELECT\n  *\nFROM\n  foo\nWHERE\n  (id) < (:1)\nORDER BY\n  id DESC\nLIMIT 10"
+    )
+    assert args == [7]
+
+
+def test_keyset_key(default_keyset):
+    class Row(NamedTuple):
+        kind: str
+        created: int
+        id: int
+
+    assert default_keyset.key(("bar", 5, 1)) == (5, 1)
+    assert default_keyset.key(Row("bar", 5, 1)) == (5, 1)
+    assert default_keyset.key({"id": 1, "created": 5}) == (5, 1)
+    with pytest.raises(TypeError):
+        que.Select("foo").keyset(["id"]).key((1,))
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"keys": ()}, {"keys": ("id",), "size": 0}, {"keys": ("id",), "seek": (1, 2)}],
+)
+def test_keyset_invalid(kwargs):
+    with pytest.raises(TypeError):
+        que.Keyset(que.Select("foo"), **kwargs)
+
+
+@pytest.mark.parametrize("row_values", [True, False])
+@pytest.mark.parametrize(
+    "style", [que.BasicParamStyle.QM, que.NumParamStyle.NUM, que.NameParamStyle.NAME]
+)
+def test_keyset_pages_sqlite(style, row_values):
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("CREATE TABLE foo (kind TEXT, created INTEGER, id INTEGER)")
+    rows = [("bar" if x % 3 else "baz", x // 4, x) for x in range(50)]
+    conn.executemany("INSERT INTO foo VALUES (?, ?, ?)", rows)
+    fylter = que.Filter(que.Field("kind", "bar"))
+    keyset = que.Select("foo", filters=[fylter]).keyset(
+        ["created", "id"], size=4, row_values=row_values
+    )
+    statements = set()
+
+    def fetch(sql, args):
+        statements.add(sql)
+        return conn.execute(sql, args).fetchall()
+
+    pages = list(keyset.pages(fetch, style))
+    assert all(len(x) == 4 for x in pages[:-1])
+    assert [tuple(x) for page in pages for x in page] == [
+        x for x in rows if x[0] == "bar"
+    ]
+    # The first page, and the same statement for every page after it.
+    assert len(statements) == 2
+
+
+@pytest.fixture
+def default_upsert() -> que.Upsert:
+    return que.Upsert(
+        "foo",
+        columns=("id", "name", "kind"),
+        rows=[(1, "a", "x"), (2, "b", "y")],
+        conflict=("id",),
+    )
+
+
+@pytest.mark.parametrize(
+    "kwargs, expected",
+    [
+        (
+            {},
+            "ON CONFLICT (id) DO UPDATE SET\n  name = EXCLUDED.name,\n"
+            "  kind = EXCLUDED.kind\n",
+        ),
+        (
+            {"update": ["kind"]},
+            "ON CONFLICT (id) DO UPDATE SET\n  kind = EXCLUDED.kind\n",
+        ),
+        (
+            {"update": "kind"},
+            "ON CONFLICT (id) DO UPDATE SET\n  kind = EXCLUDED.kind\n",
+        ),
+        ({"update": que.UpdatePolicy.NOTHING}, "ON CONFLICT (id) DO NOTHING\n"),
+        (
+            {"update": que.UpdatePolicy.NOTHING, "conflict": ()},
+            "ON CONFLICT DO NOTHING\n",
+        ),
+        (
+            {"dialect": que.Dialect.MYSQL},
+            "ON DUPLICATE KEY UPDATE\n  name = VALUES(name),\n  kind = VALUES(kind)\n",
+        ),
+        (
+            {"dialect": que.Dialect.MYSQL, "update": que.UpdatePolicy.NOTHING},
+            "ON DUPLICATE KEY UPDATE\n  id = id\n",
+        ),
+        (
+            {"returns": que.Field("id")},
+            "ON CONFLICT (id) DO UPDATE SET\n  name = EXCLUDED.name,\n"
+            "  kind = EXCLUDED.kind\nRETURNING id",
+        ),
+    ],
+)
+def test_upsert_tail(default_upsert, kwargs, expected):
+    upsert = dataclasses.replace(default_upsert, **kwargs)
+    [(sql, args)] = upsert.to_sql(que.BasicParamStyle.QM, inject_columns=True)
+    assert sql == (
+        "INSERT INTO\n  foo (id, name, kind)\nVALUES\n  (?, ?, ?),\n  (?, ?, ?)\n"
+        + expected
+    )
+    assert args == [1, "a", "x", 2, "b", "y"]
+
+
+def test_upsert_name_style(default_upsert):
+    [(sql, args)] = default_upsert.to_sql(que.NameParamStyle.NAME)
+    assert sql.startswith(
+        "INSERT INTO\n  foo (:colid, :colname, :colkind)\n"
+        "VALUES\n  (:valid_0, :valname_0, :valkind_0),"
+    )
+    assert args["valname_1"] == "b"
+
+
+def test_upsert_chunks(default_upsert):
+    upsert = dataclasses.replace(default_upsert, max_params=3)
+    statements = upsert.to_sql(inject_columns=True)
+    assert len(statements) == 2
+    assert all("ON CONFLICT (id) DO UPDATE" in sql for sql, _ in statements)
+
+
+def test_upsert_shape(default_upsert):
+    postgres = default_upsert.to_sql(inject_columns=True)
+    mysql = dataclasses.replace(default_upsert, dialect=que.Dialect.MYSQL)
+    assert mysql.to_sql(inject_columns=True) != postgres
+    insert = que.InsertMany("foo", columns=default_upsert.columns, rows=[(1, 2, 3)])
+    assert "ON CONFLICT" not in insert.to_sql(inject_columns=True)[0][0]
+
+
+def test_upsert_from_insert():
+    insert = que.Insert(
+        "foo",
+        fields=[que.Field("id", 1), que.Field("name", "a")],
+        returns=que.Field("id"),
+    )
+    upsert = que.Upsert.from_insert(insert, conflict=["id"])
+    assert upsert.columns == ("id", "name")
+    assert upsert.rows == [(1, "a")]
+    assert upsert.returns == que.Field("id")
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"conflict": ("nope",)},
+        {"conflict": ()},
+        {"update": ("nope",)},
+        {"update": ()},
+        {"conflict": ("id", "name", "kind")},
+        {"dialect": que.Dialect.MYSQL, "returns": que.Field("id")},
+    ],
+)
+def test_upsert_invalid(default_upsert, kwargs):
+    with pytest.raises(TypeError):
+        dataclasses.replace(default_upsert, **kwargs)
+
+
+@pytest.mark.parametrize("style", [que.BasicParamStyle.QM, que.NumParamStyle.NUM])
+def test_upsert_sqlite(style):
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE foo (id INTEGER PRIMARY KEY, name TEXT, kind TEXT)")
+    conn.execute("INSERT INTO foo VALUES (1, 'old', 'x')")
+    upsert = que.Upsert.from_records(
+        "foo",
+        [{"id": 1, "name": "new", "kind": "y"}, {"id": 2, "name": "b", "kind": "z"}],
+        conflict=["id"],
+        update=["name"],
+        returns=que.Field("id"),
+        dialect=que.Dialect.SQLITE,
+    )
+    returned = []
+    for sql, args in upsert.to_sql(style, inject_columns=True):
+        returned.extend(conn.execute(sql, args).fetchall())
+    assert sorted(returned) == [(1,), (2,)]
+    assert conn.execute("SELECT * FROM foo ORDER BY id").fetchall() == [
+        (1, "new", "x"),
+        (2, "b", "z"),
+    ]
+    nothing = dataclasses.replace(upsert, update=que.UpdatePolicy.NOTHING, returns=None)
+    for sql, args in nothing.to_sql(style, inject_columns=True):
+        conn.execute(sql, args)
+    assert conn.execute("SELECT COUNT(*) FROM foo").fetchone() == (2,)
+
+
+@pytest.fixture
+def default_bulk_update() -> que.BulkUpdate:
+    return que.BulkUpdate.from_records(
+        "foo",
+        [
+            {"id": 1, "kind": "a", "name": "one"},
+            {"id": 2, "kind": "a", "name": "two"},
+            {"id": 1, "kind": "b", "name": "three"},
+        ],
+        keys=["id", "kind"],
+    )
+
+
+@pytest.mark.parametrize("dialect", [que.Dialect.SQLITE, que.Dialect.SQLITE_LEGACY])
+@pytest.mark.parametrize(
+    "style",
+    [
+        que.BasicParamStyle.QM,
+        que.NumParamStyle.NUM,
+        que.NumParamStyle.DOL,
+        que.NameParamStyle.NAME,
+    ],
+)
+@pytest.mark.parametrize("max_params", [None, 6])
+def test_bulk_update_sqlite(default_bulk_update, dialect, style, max_params):
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE foo (id INTEGER, kind TEXT, name TEXT)")
+    conn.executemany(
+        "INSERT INTO foo VALUES (?, ?, '')", [(1, "a"), (2, "a"), (1, "b"), (2, "b")]
+    )
+    update = dataclasses.replace(
+        default_bulk_update, dialect=dialect, max_params=max_params
+    )
+    statements = update.to_sql(style)
+    # With 6 params, a chunk has 2 rows, or 1 if the CASE form repeats its keys.
+    repeats = dialect is que.Dialect.SQLITE_LEGACY and style is que.BasicParamStyle.QM
+    assert len(statements) == (1 if max_params is None else 3 if repeats else 2)
+    for sql, args in statements:
+        conn.execute(sql, args)
+    assert conn.execute("SELECT * FROM foo ORDER BY id, kind").fetchall() == [
+        (1, "a", "one"),
+        (1, "b", "three"),
+        (2, "a", "two"),
+        (2, "b", ""),
+    ]
+
+
+def test_bulk_update_case_params(default_bulk_update):
+    update = dataclasses.replace(
+        default_bulk_update, dialect=que.Dialect.MYSQL, max_params=None
+    )
+    assert update.chunk_size(que.BasicParamStyle.QM) == 65535 // 5
+    assert update.chunk_size(que.NameParamStyle.PYFM) == 65535 // 3
+    [(sql, args)] = update.to_sql(que.NameParamStyle.PYFM)
+    assert "WHEN id = %(id_0)s AND kind = %(kind_0)s THEN %(name_0)s" in sql
+    assert "(id = %(id_2)s AND kind = %(kind_2)s)" in sql
+    assert args == {
+        "id_0": 1,
+        "kind_0": "a",
+        "name_0": "one",
+        "id_1": 2,
+        "kind_1": "a",
+        "name_1": "two",
+        "id_2": 1,
+        "kind_2": "b",
+        "name_2": "three",
+    }
+
+
+def test_bulk_update_postgres_types(default_bulk_update):
+    update = dataclasses.replace(
+        default_bulk_update, types={"id": "int"}, returns=que.Field("foo.id")
+    )
+    [(sql, args)] = update.to_sql(que.NumParamStyle.DOL)
+    assert "(CAST($1 AS int), $2, $3),\n  ($4, $5, $6)" in sql
+    assert ") AS v (id, kind, name)" in sql
+    assert "foo.id = v.id AND\n  foo.kind = v.kind" in sql
+    assert sql.endswith("\nRETURNING foo.id")
+    assert args == [1, "a", "one", 2, "a", "two", 1, "b", "three"]
+    assert update.to_sql(que.NumParamStyle.DOL)[0][0] is sql
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        dict(columns=()),
+        dict(keys=()),
+        dict(keys=("nope",)),
+        dict(keys=("id", "kind", "name")),
+        dict(rows=[(1,)]),
+        dict(types={"nope": "int"}),
+        dict(returns=que.Field("id"), dialect=que.Dialect.MYSQL),
+    ],
+)
+def test_bulk_update_invalid(default_bulk_update, kwargs):
+    with pytest.raises(TypeError):
+        dataclasses.replace(default_bulk_update, **kwargs)
+
+
+def test_bulk_update_max_params(default_bulk_update):
+    update = dataclasses.replace(default_bulk_update, max_params=2)
+    with pytest.raises(TypeError):
+        update.to_sql()
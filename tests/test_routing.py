@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+import asyncio
+import sqlite3
+
+import pytest
+
+import que
+from que.aio import ThreadedExecutor
+from que.routing import (
+    Access,
+    LeastOutstanding,
+    ReadYourWrites,
+    RoundRobin,
+    Router,
+    classify,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def default_clock() -> Clock:
+    return Clock()
+
+
+def select(table: str = "foo") -> que.Select:
+    return que.Select(table, filters=[que.Filter(que.Field("id", 1))])
+
+
+def update(table: str = "foo") -> que.Update:
+    return que.Update(table, fields=[que.Field("bar", 1)])
+
+
+@pytest.mark.parametrize(
+    "statement, access, table, returns",
+    [
+        (select(), Access.READ, "foo", True),
+        (select().keyset(["id"]), Access.READ, "foo", True),
+        (update(), Access.WRITE, "foo", False),
+        (que.Insert("foo", fields=[que.Field("id", 1)]), Access.WRITE, "foo", False),
+        (que.InsertMany("foo", columns=("id",)), Access.WRITE, "foo", False),
+        (
+            que.Delete("foo", schema="s", returns=que.Field("id")),
+            Access.WRITE,
+            "s.foo",
+            True,
+        ),
+        ("SELECT 1", Access.WRITE, None, False),
+    ],
+)
+def test_classify(statement, access, table, returns):
+    route = classify(statement, session="user")
+    assert (route.access, route.table, route.returns, route.session) == (
+        access,
+        table,
+        returns,
+        "user",
+    )
+
+
+def test_router_round_robin():
+    router = Router("primary", ["a", "b", "c"], RoundRobin())
+    assert [router.route(select()) for _ in range(4)] == ["a", "b", "c", "a"]
+    assert router.route(update()) == "primary"
+    assert Router("primary").route(select()) == "primary"
+
+
+def test_router_least_outstanding():
+    router = Router("primary", ["a", "b"], LeastOutstanding())
+    with router.checkout(select()) as first:
+        with router.checkout(select()) as second:
+            assert {first, second} == {"a", "b"}
+            assert router.outstanding == (1, 1)
+        # The first is still running, so the second is idle.
+        assert router.route(select()) == second
+        assert router.route(select()) == second
+        with router.checkout(update()) as target:
+            assert target == "primary"
+            assert sum(router.outstanding) == 1
+    assert router.outstanding == (0, 0)
+
+
+def test_router_read_your_writes(default_clock):
+    policy = ReadYourWrites(window=1.0, clock=default_clock)
+    router = Router("primary", ["a"], policy)
+    assert router.route(select()) == "a"
+    router.route(update())
+    assert router.route(select()) == "primary"
+    assert router.route(select("bar")) == "a"
+    default_clock.now = 1.5
+    assert router.route(select()) == "a"
+
+
+def test_router_read_your_writes_sessions(default_clock):
+    router = Router("primary", ["a"], ReadYourWrites(clock=default_clock))
+    router.route(update(), session=1)
+    assert router.route(select(), session=1) == "primary"
+    assert router.route(select(), session=2) == "a"
+    # A raw write could be to any table.
+    router.route("DELETE FROM bar", session=2)
+    assert router.route(select("baz"), session=2) == "primary"
+    assert router.route(select("baz"), session=1) == "a"
+
+
+def test_router_read_your_writes_expires(default_clock):
+    policy = ReadYourWrites(window=1.0, clock=default_clock)
+    for x in range(1100):
+        default_clock.now = x * 0.001
+        policy.observe(classify(update(f"table_{x}")))
+    assert len(policy._written) <= 1024
+
+
+def test_router_executors(tmp_path):
+    path = tmp_path / "que.db"
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE foo (id INTEGER PRIMARY KEY, bar INTEGER)")
+    connection.close()
+
+    def connect():
+        return sqlite3.connect(path, check_same_thread=False)
+
+    class Replica(ThreadedExecutor):
+        fetched = 0
+
+        async def fetch(self, statement, **options):
+            self.fetched += 1
+            return await super().fetch(statement, **options)
+
+    async def main():
+        primary, replica = ThreadedExecutor(connect), Replica(connect)
+        router = Router(primary, [replica], ReadYourWrites(window=0))
+        insert = que.Insert("foo", fields=[que.Field("id", 0), que.Field("bar", 0)])
+        await router.executemany(insert, [{"id": 1, "bar": 2}], inject_columns=True)
+        rows = await router.fetch(select())
+        await router.execute(update())
+        await primary.close()
+        await replica.close()
+        return rows, replica.fetched
+
+    assert asyncio.run(main()) == ([(1, 2)], 1)
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+import asyncio
+import sqlite3
+
+import pytest
+
+import que
+
+
+@pytest.fixture
+def default_insert() -> que.Insert:
+    return que.Insert("foo", fields=[que.Field("id"), que.Field("name")])
+
+
+@pytest.fixture
+def default_update() -> que.Update:
+    return que.Update(
+        "foo", fields=[que.Field("name", "")], filters=[que.Filter(que.Field("id", 0))]
+    )
+
+
+def records(n: int, consumed: list = None):
+    for x in range(n):
+        if consumed is not None:
+            consumed.append(x)
+        yield {"id": x, "name": str(x)}
+
+
+async def arecords(n: int, delay: float = 0):
+    for x in range(n):
+        await asyncio.sleep(delay)
+        yield {"id": x, "name": str(x)}
+
+
+async def collect(aiterator) -> list:
+    return [x async for x in aiterator]
+
+
+def test_stream_batches_executemany(default_insert):
+    writer = que.StreamWriter(default_insert, batch_size=4, inject_columns=True)
+    batches = list(writer.batches(records(10)))
+    assert [x.size for x in batches] == [4, 4, 2]
+    assert all(x.many for x in batches)
+    assert batches[-1].args == [(8, "8"), (9, "9")]
+
+
+def test_stream_batches_multirow(default_insert):
+    writer = que.StreamWriter(
+        default_insert, batch_size=4, multirow=True, style=que.BasicParamStyle.QM
+    )
+    batches = list(writer.batches(records(10)))
+    assert [x.size for x in batches] == [4, 4, 2]
+    assert not any(x.many for x in batches)
+    assert batches[-1].args == ["id", "name", 8, "8", 9, "9"]
+
+
+def test_stream_batches_multirow_chunked(default_insert):
+    writer = que.StreamWriter(
+        default_insert, batch_size=10, multirow=True, dialect=que.Dialect.SQLITE_LEGACY
+    )
+    writer.batch_size = 1000
+    batches = list(writer.batches(records(1000)))
+    assert [x.size for x in batches] == [498, 498, 4]
+
+
+def test_stream_batches_bounded(default_insert):
+    consumed = []
+    writer = que.StreamWriter(default_insert, batch_size=10)
+    for batch in writer.batches(records(100, consumed)):
+        assert len(consumed) - batch.args[-1][2] <= 10
+
+
+def test_stream_batches_flush_interval(default_insert):
+    writer = que.StreamWriter(default_insert, batch_size=100, flush_interval=0)
+    assert [x.size for x in writer.batches(records(3))] == [1, 1, 1]
+
+
+def test_stream_update(default_update):
+    writer = que.StreamWriter(default_update, batch_size=5)
+    (batch,) = writer.batches(records(5))
+    assert batch.args[0] == ("0", 0)
+
+
+def test_stream_invalid(default_update):
+    with pytest.raises(TypeError):
+        que.StreamWriter(default_update, multirow=True)
+    with pytest.raises(TypeError):
+        que.StreamWriter(default_update, batch_size=0)
+
+
+def test_stream_abatches(default_insert):
+    writer = que.StreamWriter(default_insert, batch_size=4, inject_columns=True)
+    for source in (records(10), arecords(10)):
+        batches = asyncio.run(collect(writer.abatches(source)))
+        assert [x.size for x in batches] == [4, 4, 2]
+
+
+def test_stream_abatches_flush_interval(default_insert):
+    async def source():
+        yield {"id": 1, "name": "1"}
+        yield {"id": 2, "name": "2"}
+        await asyncio.sleep(0.5)
+        yield {"id": 3, "name": "3"}
+
+    async def first_batch():
+        writer = que.StreamWriter(default_insert, batch_size=100, flush_interval=0.01)
+        async for batch in writer.abatches(source()):
+            return batch
+
+    batch = asyncio.run(asyncio.wait_for(first_batch(), 0.4))
+    assert batch.size == 2
+
+
+def test_stream_abatches_backpressure(default_insert):
+    consumed = []
+
+    async def main():
+        writer = que.StreamWriter(default_insert, batch_size=10)
+        async for batch in writer.abatches(records(1000, consumed)):
+            await asyncio.sleep(0)
+            # The batch, plus at most a queue and a buffer of read-ahead.
+            assert len(consumed) <= batch.args[-1][2] + 1 + 10 + 10
+
+    asyncio.run(main())
+
+
+def test_stream_abatches_error(default_insert):
+    async def source():
+        yield {"id": 1, "name": "1"}
+        raise ValueError("boom")
+
+    writer = que.StreamWriter(default_insert)
+    with pytest.raises(ValueError):
+        asyncio.run(collect(writer.abatches(source())))
+
+
+def test_stream_sqlite(default_insert):
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE foo (id INTEGER, name TEXT)")
+    writer = que.StreamWriter(
+        default_insert,
+        batch_size=100,
+        style=que.BasicParamStyle.QM,
+        inject_columns=True,
+        multirow=True,
+    )
+    for batch in writer.batches(records(1000)):
+        conn.execute(batch.sql, batch.args)
+    assert conn.execute("SELECT COUNT(*) FROM foo").fetchone() == (1000,)